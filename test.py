@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import base64
+import bisect
 import copy
 import hashlib
+import heapq
+import inspect
 import json
+import math
+import mmap
 import os
+import queue
+import struct
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
-from typing import Any
+from typing import Any, Iterable, Iterator
 import uuid
-from functools import wraps
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from functools import partial, wraps
 
 import jwt
 from django.conf import settings
@@ -59,7 +73,7 @@ try:
     from collectium_intelligence.ux_taxonomy import default_ux_interventions
     from collectium_intelligence.wellbeing import normalize_wellbeing_proxies
     from collectium_intelligence.context_blocks import context_block_from_event, context_block_info_from_event
-    from collectium_intelligence.dag import compute_levels, iter_level_groups, topological_sort, would_create_cycle
+    from collectium_intelligence.dag import iter_level_groups, would_create_cycle
     from collectium_intelligence.drift import drift_report_user
     from collectium_intelligence.online_block_matrix import update_online_block_matrix_record
     from collectium_intelligence.psychodynamics import animal_name, classify_animal_event, frobenius_diff
@@ -86,6 +100,19 @@ except ModuleNotFoundError as e:
         "collectium_intelligence is not installed; from `intelligence/` run: `pip install -e '.[backend]'`"
     ) from e
 
+try:
+    # Newer classifier builds can label several events in one model request.
+    from collectium_intelligence.classifier import classify_events
+except ImportError:
+    classify_events = None
+
+try:
+    # Newer report builds split the work into per-window partials that merge into one report.
+    from collectium_intelligence.paper_report import build_paper_report_partial, merge_paper_report_partials
+except ImportError:
+    build_paper_report_partial = None
+    merge_paper_report_partials = None
+
 
 from backend.models import (
     IngestEventResponse,
@@ -103,6 +130,55 @@ from backend.models import (
 )
 from backend.models import Memcube
 from backend.storage import InMemoryStore
+from pydantic import BaseModel, Field
+
+
+class RankFeedPageRequest(RankFeedRequest):
+    """`RankFeedRequest` plus an opaque `cursor` that pages a pinned ranking snapshot."""
+
+    cursor: Optional[str] = None
+
+
+class RankFeedPageResponse(RankFeedResponse):
+    next_cursor: Optional[str] = None
+
+
+class RankFeedBatchUser(BaseModel):
+    user_id: str
+    team_id: Optional[str] = None
+
+
+class RankFeedBatchRequest(BaseModel):
+    """One candidate item set ranked for several users; `team_id` is the default for `user_ids`."""
+
+    feed_type: str
+    items: list[dict[str, Any]] = Field(default_factory=list)
+    context: dict[str, Any] = Field(default_factory=dict)
+    org_id: Optional[str] = None
+    team_id: Optional[str] = None
+    project_id: Optional[str] = None
+    users: list[RankFeedBatchUser] = Field(default_factory=list)
+    user_ids: list[str] = Field(default_factory=list)
+    limit: int = Field(20, ge=1)
+
+
+class DidTreatment(BaseModel):
+    intervention_key: str
+    treatment_scope_id: str
+
+
+class DidBatchRequest(BaseModel):
+    """Several (intervention, treated scope) pairs analysed against one shared control panel."""
+
+    org_id: str
+    interventions: list[DidTreatment]
+    control_scope_ids: list[str]
+    scope_type: str = "team"
+    # Two pre periods are the fewest that admit a parallel-trends test.
+    pre_periods: int = Field(7, ge=2)
+    post_periods: int = Field(7, ge=1)
+    since: Optional[str] = None
+    until: Optional[str] = None
 
 
 PIPELINE_VERSION = os.getenv("INTELLIGENCE_PIPELINE_VERSION", "beta-v1")
@@ -112,6 +188,47 @@ STEINER_MODEL_PATH = os.getenv("TRACKA_STEINER_MODEL_PATH", "")
 HYPERGRAPH_REFINE_MODE = os.getenv("TRACKA_HYPERGRAPH_REFINE", "off")
 HYPERGRAPH_REFINE_DIMS = os.getenv("TRACKA_HYPERGRAPH_REFINE_DIMS", "64")
 HYPERGRAPH_REFINE_RETAIN = os.getenv("TRACKA_HYPERGRAPH_REFINE_RETAIN", "0.7")
+PAGE_SCAN_LIMIT = int(os.getenv("INTELLIGENCE_PAGE_SCAN_LIMIT", "10000"))
+EVENT_LOG_DIR = os.getenv("INTELLIGENCE_EVENT_LOG_DIR", "")
+EVENT_LOG_SEGMENT_ROWS = int(os.getenv("INTELLIGENCE_EVENT_LOG_SEGMENT_ROWS", str(1 << 18)))
+STORE_THREAD_LIMIT = int(os.getenv("INTELLIGENCE_STORE_THREADS", "64"))
+PROFILE_INDEX_DIMS = int(os.getenv("INTELLIGENCE_PROFILE_INDEX_DIMS", "64"))
+PROFILE_INDEX_TTL_S = float(os.getenv("INTELLIGENCE_PROFILE_INDEX_TTL_S", "300"))
+PROFILE_NEIGHBORS = int(os.getenv("INTELLIGENCE_PROFILE_NEIGHBORS", "50"))
+MEMCUBE_INDEX_TTL_S = float(os.getenv("INTELLIGENCE_MEMCUBE_INDEX_TTL_S", "300"))
+BANDIT_POLICY_DIR = os.getenv("INTELLIGENCE_BANDIT_POLICY_DIR", "/tmp")
+BANDIT_CHECKPOINT_EVERY = int(os.getenv("INTELLIGENCE_BANDIT_CHECKPOINT_EVERY", "25"))
+BANDIT_ONLINE_ALPHA = float(os.getenv("INTELLIGENCE_BANDIT_ONLINE_ALPHA", "1.0"))
+ATTRIBUTION_BOOTSTRAP = int(os.getenv("INTELLIGENCE_ATTRIBUTION_BOOTSTRAP", "500"))
+ATTRIBUTION_CACHE_TTL_S = float(os.getenv("INTELLIGENCE_ATTRIBUTION_CACHE_TTL_S", "300"))
+ATTRIBUTION_CACHE_LIMIT = int(os.getenv("INTELLIGENCE_ATTRIBUTION_CACHE_LIMIT", "128"))
+UX_TAXONOMY_TTL_S = float(os.getenv("INTELLIGENCE_UX_TAXONOMY_TTL_S", "300"))
+MEMCUBE_IMPORT_CHUNK = int(os.getenv("INTELLIGENCE_MEMCUBE_IMPORT_CHUNK", "500"))
+MEMCUBE_IMPORT_ERROR_SAMPLES = int(os.getenv("INTELLIGENCE_MEMCUBE_IMPORT_ERROR_SAMPLES", "20"))
+MEMCUBE_IMPORT_LINE_BYTES = int(os.getenv("INTELLIGENCE_MEMCUBE_IMPORT_LINE_BYTES", str(8 << 20)))
+FEED_SNAPSHOT_TTL_S = float(os.getenv("INTELLIGENCE_FEED_SNAPSHOT_TTL_S", "300"))
+FEED_SNAPSHOT_LIMIT = int(os.getenv("INTELLIGENCE_FEED_SNAPSHOT_LIMIT", "256"))
+FEED_CACHE_TTL_S = float(os.getenv("INTELLIGENCE_FEED_CACHE_TTL_S", "30"))
+FEED_CACHE_TTLS = os.getenv("INTELLIGENCE_FEED_CACHE_TTLS", "")
+FEED_LRU_MAX_BYTES = int(os.getenv("INTELLIGENCE_FEED_LRU_MAX_BYTES", str(64 << 20)))
+PROJECT_ACTIVITY_HALF_LIFE_S = float(os.getenv("INTELLIGENCE_PROJECT_ACTIVITY_HALF_LIFE_S", str(7 * 24 * 3600)))
+PROJECT_ACTIVITY_TTL_S = float(os.getenv("INTELLIGENCE_PROJECT_ACTIVITY_TTL_S", "300"))
+PLAN_CACHE_LIMIT = int(os.getenv("INTELLIGENCE_PLAN_CACHE_LIMIT", "256"))
+REPLAY_CHECKPOINT_EVERY = int(os.getenv("INTELLIGENCE_REPLAY_CHECKPOINT_EVERY", "100"))
+REPLAY_ENGINE_LIMIT = int(os.getenv("INTELLIGENCE_REPLAY_ENGINE_LIMIT", "8"))
+DISCOURSE_CACHE_LIMIT = int(os.getenv("INTELLIGENCE_DISCOURSE_CACHE_LIMIT", "32"))
+PAPER_REPORT_CACHE_TTL_S = float(os.getenv("INTELLIGENCE_PAPER_REPORT_CACHE_TTL_S", "600"))
+PAPER_REPORT_CACHE_MAX_BYTES = int(os.getenv("INTELLIGENCE_PAPER_REPORT_CACHE_MAX_BYTES", str(32 << 20)))
+PAPER_REPORT_WINDOW_S = max(60.0, float(os.getenv("INTELLIGENCE_PAPER_REPORT_WINDOW_S", "3600")))
+CLASSIFY_CACHE_SIZE = int(os.getenv("INTELLIGENCE_CLASSIFY_CACHE_SIZE", "50000"))
+CLASSIFY_CACHE_PATH = os.getenv("INTELLIGENCE_CLASSIFY_CACHE_PATH", "")
+LLM_WORKERS = int(os.getenv("INTELLIGENCE_LLM_WORKERS", "8"))
+LLM_BATCH_SIZE = int(os.getenv("INTELLIGENCE_LLM_BATCH_SIZE", "16"))
+LLM_BATCH_WAIT_MS = float(os.getenv("INTELLIGENCE_LLM_BATCH_WAIT_MS", "20"))
+LLM_RATE_PER_S = float(os.getenv("INTELLIGENCE_LLM_RATE_PER_S", "10"))
+LLM_RATE_BURST = int(os.getenv("INTELLIGENCE_LLM_RATE_BURST", "20"))
+LLM_TIMEOUT_S = float(os.getenv("INTELLIGENCE_LLM_TIMEOUT_S", "15"))
+LLM_STUB_LATENCY_MS = os.getenv("INTELLIGENCE_LLM_STUB_LATENCY_MS", "")
 _STEINER_MODEL: SteinerPrototypeModel | None = None
 _STEINER_MODEL_ERROR: str | None = None
 
@@ -376,142 +493,3204 @@ def _psychodynamics_config() -> dict[str, Any]:
     mte_max_team = os.getenv("TRACKA_MTE_MAX_TEAM")
     if mte_max_team:
         try:
-            cfg["mte_max_team"] = int(mte_max_team)
+            cfg["mte_max_team"] = int(mte_max_team)
+        except Exception:
+            pass
+    primary_state_space = os.getenv("TRACKA_PRIMARY_STATE_SPACE")
+    if primary_state_space:
+        cfg["primary_state_space"] = str(primary_state_space)
+    secondary_state_spaces = os.getenv("TRACKA_SECONDARY_STATE_SPACES")
+    if secondary_state_spaces:
+        cfg["secondary_state_spaces"] = str(secondary_state_spaces)
+    return cfg
+
+
+def _hypergraph_refine_enabled() -> bool:
+    return str(HYPERGRAPH_REFINE_MODE or "off").strip().lower() in {"1", "true", "on", "yes"}
+
+
+def _maybe_refine_hypergraph(hg: Any) -> Any:
+    if not _hypergraph_refine_enabled():
+        return hg
+    try:
+        dims = max(4, int(HYPERGRAPH_REFINE_DIMS))
+    except Exception:
+        dims = 64
+    try:
+        retain = float(HYPERGRAPH_REFINE_RETAIN)
+    except Exception:
+        retain = 0.7
+    try:
+        return refine_hypergraph_weights(hg, dims=dims, retain_weight=retain)
+    except Exception:
+        return hg
+
+
+def build_user_profile(
+    user_id: str,
+    org_id: str,
+    events: list[dict[str, Any]],
+    existing_profile: dict[str, Any] | None = None,
+    *,
+    psychodynamics_config: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    cfg = _psychodynamics_config()
+    if isinstance(psychodynamics_config, dict):
+        cfg.update(psychodynamics_config)
+    return _build_user_profile_base(
+        user_id,
+        org_id,
+        events,
+        existing_profile,
+        psychodynamics_config=cfg,
+    )
+
+
+def build_team_profile(
+    team_id: str,
+    org_id: str,
+    member_profiles: list[dict[str, Any]],
+    team_events: list[dict[str, Any]],
+    existing_profile: dict[str, Any] | None = None,
+    *,
+    psychodynamics_config: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    cfg = _psychodynamics_config()
+    if isinstance(psychodynamics_config, dict):
+        cfg.update(psychodynamics_config)
+    return _build_team_profile_base(
+        team_id,
+        org_id,
+        member_profiles,
+        team_events,
+        existing_profile,
+        psychodynamics_config=cfg,
+    )
+
+
+def _classify_block_states(events: list[dict[str, Any]]) -> Iterator[tuple[str, int]]:
+    mode = str(ANIMAL_CLASSIFIER_MODE or "heuristic")
+    steiner_model = _load_steiner_model()
+    for event in events:
+        try:
+            ctx_block = str(context_block_from_event(event)).strip().lower()
+        except Exception:
+            continue
+
+        try:
+            animal_state = int(
+                classify_animal_event(
+                    event,
+                    mode=mode,
+                    steiner_model=steiner_model,
+                )
+            )
+        except Exception:
+            continue
+        yield ctx_block, animal_state
+
+
+def _recompute_block_matrices_for_scope(
+    *,
+    store: Any,
+    events: list[dict[str, Any]],
+    org_id: str,
+    scope_type: str,
+    scope_id: str,
+    pipeline_version: str,
+    states: Iterable[tuple[str, int]] | None = None,
+) -> list[dict[str, Any]]:
+    """Rebuild block-matrix records for a scope.
+
+    `states` may supply precomputed `(context_block, animal_state)` pairs (e.g. from the columnar
+    event log) to skip per-event classification.
+    """
+    records_by_ctx: dict[str, dict[str, Any]] = {}
+    if states is None:
+        states = _classify_block_states(events)
+
+    for ctx_block, animal_state in states:
+        prev = records_by_ctx.get(ctx_block)
+        updated = update_online_block_matrix_record(
+            prev,
+            org_id=org_id,
+            scope_type=scope_type,
+            scope_id=scope_id,
+            context_block=ctx_block,
+            pipeline_version=pipeline_version,
+            updated_at=utc_now_iso8601(),
+            new_state=int(animal_state),
+        )
+        records_by_ctx[ctx_block] = updated
+
+    for record in records_by_ctx.values():
+        try:
+            store.upsert_psychodynamic_block_matrix(record)
+        except Exception:
+            pass
+
+    return list(records_by_ctx.values())
+
+
+def _model_dump(obj: Any) -> dict[str, Any]:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()  # type: ignore[no-any-return]
+    return obj.dict()  # type: ignore[no-any-return,attr-defined]
+
+
+def _parse_ttl_map(raw: str, *, default: float) -> dict[str, float]:
+    """Parse `feed_type=seconds,...`; malformed entries are ignored."""
+    out: dict[str, float] = {}
+    for part in str(raw or "").split(","):
+        key, sep, value = part.partition("=")
+        if not sep or not key.strip():
+            continue
+        try:
+            out[key.strip().lower()] = max(0.0, float(value))
+        except ValueError:
+            continue
+    out.setdefault("*", float(default))
+    return out
+
+
+def _fingerprint_request(payload: dict[str, Any]) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_cursor(ts: str, row_id: str, scan_depth: int | None = None) -> str:
+    parts: list[Any] = [ts, row_id] if scan_depth is None else [ts, row_id, int(scan_depth)]
+    data = json.dumps(parts, separators=(",", ":"), ensure_ascii=True)
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor_parts(cursor: str) -> tuple[tuple[str, str], int | None]:
+    """Decode a cursor into its `(timestamp, id)` key and the optional scan depth it carries."""
+    padded = str(cursor) + "=" * (-len(str(cursor)) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception as e:  # noqa: BLE001
+        raise ValueError("invalid cursor") from e
+    if not isinstance(data, list) or len(data) not in (2, 3) or not all(isinstance(x, str) for x in data[:2]):
+        raise ValueError("invalid cursor")
+    depth = data[2] if len(data) == 3 else None
+    if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool) or depth < 1):
+        raise ValueError("invalid cursor")
+    return (data[0], data[1]), depth
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    return _decode_cursor_parts(cursor)[0]
+
+
+def _row_page_key(row: dict[str, Any], *, ts_keys: tuple[str, ...], id_keys: tuple[str, ...]) -> tuple[str, str]:
+    """`(timestamp, id)` ordering key: the first non-empty `ts_keys` value and the joined `id_keys`."""
+    ts = ""
+    for key in ts_keys:
+        value = row.get(key)
+        if isinstance(value, str) and value:
+            ts = value
+            break
+    return ts, "|".join(str(row.get(key) or "") for key in id_keys)
+
+
+def _keyset_page(
+    rows: Iterable[dict[str, Any]],
+    *,
+    ts_keys: tuple[str, ...],
+    id_keys: tuple[str, ...],
+    before: tuple[str, str] | None,
+    limit: int,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return the newest-first page of `rows` strictly older than `before`, plus the next cursor.
+
+    Ordering is by `(timestamp, id)` descending so ties on timestamp stay stable across pages.
+    """
+    keyed = (
+        (_row_page_key(r, ts_keys=ts_keys, id_keys=id_keys), r)
+        for r in rows
+        if isinstance(r, dict)
+    )
+    if before is not None:
+        keyed = (kr for kr in keyed if kr[0] < before)
+    top = heapq.nlargest(int(limit) + 1, keyed, key=lambda kr: kr[0])
+    page = top[: int(limit)]
+    next_cursor = _encode_cursor(*page[-1][0]) if len(top) > int(limit) and page else None
+    return [r for _, r in page], next_cursor
+
+
+def _accepts_kwarg(fn: Any, name: str) -> bool:
+    try:
+        return name in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class _SortedKeys:
+    """Sorted `(timestamp, id)` keys split into bounded buckets.
+
+    Inserts and deletes binary-search the bucket maxima and then touch one bucket of at most
+    `2 * load` keys, so they cost O(log n + load) rather than the O(n) shift of a flat sorted list.
+    """
+
+    __slots__ = ("_buckets", "_maxes", "_load", "_len")
+
+    def __init__(self, keys: Any = (), *, load: int = 512) -> None:
+        self._load = max(8, int(load))
+        ordered = sorted(keys)
+        self._buckets: list[list[tuple[str, str]]] = [
+            ordered[i : i + self._load] for i in range(0, len(ordered), self._load)
+        ]
+        self._maxes: list[tuple[str, str]] = [b[-1] for b in self._buckets]
+        self._len = len(ordered)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: tuple[str, str]) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+        i = min(bisect.bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        bisect.insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        self._len += 1
+        if len(bucket) > 2 * self._load:
+            half = len(bucket) // 2
+            self._buckets[i : i + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[i : i + 1] = [bucket[half - 1], bucket[-1]]
+
+    def discard(self, key: tuple[str, str]) -> None:
+        i = bisect.bisect_left(self._maxes, key)
+        if i >= len(self._buckets):
+            return
+        bucket = self._buckets[i]
+        j = bisect.bisect_left(bucket, key)
+        if j >= len(bucket) or bucket[j] != key:
+            return
+        del bucket[j]
+        self._len -= 1
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def newest(self, *, before: tuple[str, str] | None, limit: int) -> list[tuple[str, str]]:
+        """Up to `limit` keys strictly older than `before`, newest first."""
+        out: list[tuple[str, str]] = []
+        if limit <= 0 or not self._buckets:
+            return out
+        if before is None:
+            i, j = len(self._buckets) - 1, len(self._buckets[-1])
+        else:
+            i = bisect.bisect_left(self._maxes, before)
+            if i >= len(self._buckets):
+                i, j = len(self._buckets) - 1, len(self._buckets[-1])
+            else:
+                j = bisect.bisect_left(self._buckets[i], before)
+        while i >= 0 and len(out) < limit:
+            bucket = self._buckets[i]
+            take = bucket[max(0, j - (limit - len(out))) : j]
+            out.extend(reversed(take))
+            i -= 1
+            if i >= 0:
+                j = len(self._buckets[i])
+        return out
+
+
+class ClassifiedEventIndex:
+    """Secondary indexes over classified events (org/user/team → time-ordered event ids).
+
+    Each scope keeps its `(timestamp, event_id)` keys in a bucketed sorted list, so inserts cost
+    O(log n + bucket) and newest-first range reads are O(log n + k). A user scope covers events
+    whose `user_id` or `subject_id` is that user, matching the store's user listing.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: dict[tuple[str, ...], _SortedKeys] = {}
+        self._entries: dict[str, tuple[tuple[str, str], list[tuple[str, ...]]]] = {}
+        self._events: dict[str, dict[str, Any]] = {}
+
+    @staticmethod
+    def _scopes(event: dict[str, Any]) -> list[tuple[str, ...]]:
+        org_id = event.get("org_id")
+        if not isinstance(org_id, str) or not org_id:
+            return []
+        scopes: list[tuple[str, ...]] = [("org", org_id)]
+        for kind, field in (("user", "user_id"), ("user", "subject_id"), ("team", "team_id")):
+            value = event.get(field)
+            if isinstance(value, str) and value and (kind, org_id, value) not in scopes:
+                scopes.append((kind, org_id, value))
+        return scopes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove_locked(self, event_id: str) -> None:
+        prev = self._entries.pop(event_id, None)
+        self._events.pop(event_id, None)
+        if prev is None:
+            return
+        key, scopes = prev
+        for scope in scopes:
+            keys = self._keys.get(scope)
+            if keys is not None:
+                keys.discard(key)
+
+    def _add_locked(self, event_id: str, event: dict[str, Any]) -> None:
+        self._remove_locked(event_id)
+        key = (str(event.get("timestamp") or ""), event_id)
+        scopes = self._scopes(event)
+        for scope in scopes:
+            keys = self._keys.get(scope)
+            if keys is None:
+                keys = self._keys[scope] = _SortedKeys()
+            keys.add(key)
+        self._entries[event_id] = (key, scopes)
+        self._events[event_id] = event
+
+    def add(self, event: dict[str, Any]) -> None:
+        event_id = event.get("event_id")
+        if not isinstance(event_id, str) or not event_id:
+            return
+        with self._lock:
+            self._add_locked(event_id, event)
+
+    def discard(self, event_id: str) -> None:
+        with self._lock:
+            self._remove_locked(event_id)
+
+    def reconcile(self, rows: dict[str, Any]) -> int:
+        """Align the index with `rows` (event_id → stored row); return how many ids changed.
+
+        Compares row identity, not just counts: an id missing from `rows` is dropped, and a row
+        that is new or was replaced in place (same id, different object) is re-indexed.
+        """
+        changed = 0
+        with self._lock:
+            for event_id in [eid for eid in self._events if eid not in rows]:
+                self._remove_locked(event_id)
+                changed += 1
+            for event_id, row in rows.items():
+                if self._events.get(event_id) is row:
+                    continue
+                if isinstance(event_id, str) and event_id and isinstance(row, dict):
+                    self._add_locked(event_id, row)
+                else:
+                    self._remove_locked(event_id)
+                changed += 1
+        return changed
+
+    def rebuild(self, events: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._events.clear()
+            grouped: dict[tuple[str, ...], list[tuple[str, str]]] = {}
+            for event in events:
+                if not isinstance(event, dict):
+                    continue
+                event_id = event.get("event_id")
+                if not isinstance(event_id, str) or not event_id:
+                    continue
+                key = (str(event.get("timestamp") or ""), event_id)
+                scopes = self._scopes(event)
+                for scope in scopes:
+                    grouped.setdefault(scope, []).append(key)
+                self._entries[event_id] = (key, scopes)
+                self._events[event_id] = event
+            self._keys = {scope: _SortedKeys(keys) for scope, keys in grouped.items()}
+
+    def clear(self) -> None:
+        self.rebuild([])
+
+    def range(
+        self,
+        scope: tuple[str, ...],
+        *,
+        before: tuple[str, str] | None = None,
+        limit: int = 200,
+    ) -> list[dict[str, Any]]:
+        """Return up to `limit` events for `scope`, newest first, strictly older than `before`."""
+        with self._lock:
+            keys = self._keys.get(scope)
+            if keys is None:
+                return []
+            return [
+                self._events[eid]
+                for _, eid in keys.newest(before=before, limit=max(0, int(limit)))
+                if eid in self._events
+            ]
+
+
+_PROFILE_VECTOR_SKIP = {"org_id", "user_id", "team_id", "pipeline_version", "created_at", "updated_at"}
+
+
+def _profile_vector(profile: Any, *, dims: int = PROFILE_INDEX_DIMS) -> list[float]:
+    """Feature-hashed, L2-normalised embedding of a profile's numeric and categorical leaves."""
+    vec = [0.0] * dims
+    stack: list[tuple[str, Any]] = [("", profile)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if not path and key in _PROFILE_VECTOR_SKIP:
+                    continue
+                stack.append((f"{path}.{key}" if path else str(key), value))
+            continue
+        if isinstance(node, (list, tuple)):
+            stack.extend((f"{path}[{i}]", value) for i, value in enumerate(node[:64]))
+            continue
+        if isinstance(node, bool):
+            feature, value = path, 1.0 if node else 0.0
+        elif isinstance(node, (int, float)):
+            if not math.isfinite(node):
+                continue
+            feature, value = path, float(node)
+        elif isinstance(node, str) and 0 < len(node) <= 64:
+            feature, value = f"{path}={node}", 1.0
+        else:
+            continue
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        vec[h % dims] += value if (h >> 63) & 1 else -value
+    norm = math.sqrt(sum(v * v for v in vec))
+    return [v / norm for v in vec] if norm > 0 else vec
+
+
+class ProfileVectorIndex:
+    """Exact per-org profile embedding matrix for nearest-neighbour CF lookups.
+
+    Each (org, kind) slot is loaded once from the store, then kept current by `upsert`; slots older
+    than `ttl_s` are reported as unloaded so other workers' writes are picked up eventually.
+    """
+
+    def __init__(self, *, dims: int = PROFILE_INDEX_DIMS, ttl_s: float = PROFILE_INDEX_TTL_S) -> None:
+        self.dims = int(dims)
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._slots: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def loaded(self, org_id: str, kind: str) -> bool:
+        slot = self._slots.get((org_id, kind))
+        return slot is not None and (self.ttl_s <= 0 or time.monotonic() - slot["loaded_at"] < self.ttl_s)
+
+    def load(self, org_id: str, kind: str, profiles: Iterable[dict[str, Any]], *, id_key: str) -> None:
+        import numpy as np
+
+        ids: list[str] = []
+        rows: list[list[float]] = []
+        kept: list[dict[str, Any]] = []
+        for profile in profiles:
+            pid = profile.get(id_key) if isinstance(profile, dict) else None
+            if not isinstance(pid, str) or not pid:
+                continue
+            ids.append(pid)
+            rows.append(_profile_vector(profile, dims=self.dims))
+            kept.append(profile)
+        matrix = np.zeros((max(16, len(rows)), self.dims), dtype=np.float32)
+        if rows:
+            matrix[: len(rows)] = np.asarray(rows, dtype=np.float32)
+        with self._lock:
+            self._slots[(org_id, kind)] = {
+                "ids": ids,
+                "rows": {pid: i for i, pid in enumerate(ids)},
+                "profiles": kept,
+                "matrix": matrix,
+                "loaded_at": time.monotonic(),
+            }
+
+    def upsert(self, org_id: str, kind: str, profile_id: str, profile: dict[str, Any]) -> None:
+        """Insert or refresh one profile row; no-op until the slot has been loaded."""
+        import numpy as np
+
+        vector = np.asarray(_profile_vector(profile, dims=self.dims), dtype=np.float32)
+        with self._lock:
+            slot = self._slots.get((org_id, kind))
+            if slot is None:
+                return
+            row = slot["rows"].get(profile_id)
+            if row is None:
+                row = len(slot["ids"])
+                if row >= slot["matrix"].shape[0]:
+                    grown = np.zeros((row * 2, self.dims), dtype=np.float32)
+                    grown[:row] = slot["matrix"][:row]
+                    slot["matrix"] = grown
+                slot["ids"].append(profile_id)
+                slot["profiles"].append(profile)
+                slot["rows"][profile_id] = row
+            else:
+                slot["profiles"][row] = profile
+            slot["matrix"][row] = vector
+
+    def get(self, org_id: str, kind: str, profile_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            slot = self._slots.get((org_id, kind))
+            row = slot["rows"].get(profile_id) if slot is not None else None
+            return slot["profiles"][row] if row is not None else None
+
+    def neighbors(self, org_id: str, kind: str, profile: Any, *, k: int) -> list[dict[str, Any]]:
+        """Return the `k` most cosine-similar profiles (best first); all of them when k <= 0."""
+        return self.neighbors_many(org_id, kind, [profile], k=k)[0]
+
+    def neighbors_many(
+        self,
+        org_id: str,
+        kind: str,
+        profiles: list[Any],
+        *,
+        k: int,
+        chunk: int = 256,
+    ) -> list[list[dict[str, Any]]]:
+        """Batched `neighbors`: one matrix product per chunk of queries."""
+        import numpy as np
+
+        with self._lock:
+            slot = self._slots.get((org_id, kind))
+            if slot is None:
+                return [[] for _ in profiles]
+            n = len(slot["ids"])
+            if k <= 0 or n <= k:
+                return [list(slot["profiles"]) for _ in profiles]
+            matrix = slot["matrix"][:n]
+            pool = list(slot["profiles"])
+        out: list[list[dict[str, Any]]] = []
+        for start in range(0, len(profiles), max(1, int(chunk))):
+            queries = np.asarray(
+                [_profile_vector(p, dims=self.dims) for p in profiles[start : start + chunk]],
+                dtype=np.float32,
+            )
+            scores = queries @ matrix.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, cand in zip(scores, top):
+                ordered = cand[np.argsort(-row[cand], kind="stable")]
+                out.append([pool[int(i)] for i in ordered])
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+
+
+class MemcubeVectorIndex:
+    """Exact cosine top-k over memcube embeddings, one normalized matrix per (org, context_type).
+
+    Slots are loaded lazily from the store and then kept current by `upsert`/`remove`. A slot's
+    width is fixed by its first embedding; memcubes whose embedding has another width are skipped.
+    """
+
+    def __init__(self, *, ttl_s: float = MEMCUBE_INDEX_TTL_S) -> None:
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._slots: dict[tuple[str, str], dict[str, Any]] = {}
+
+    @staticmethod
+    def _normalized(embedding: Any) -> Any | None:
+        import numpy as np
+
+        if not isinstance(embedding, list) or not embedding:
+            return None
+        try:
+            vec = np.asarray(embedding, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None
+        if vec.ndim != 1:
+            return None
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else None
+
+    def loaded(self, org_id: str, context_type: str) -> bool:
+        slot = self._slots.get((org_id, context_type))
+        return slot is not None and (self.ttl_s <= 0 or time.monotonic() - slot["loaded_at"] < self.ttl_s)
+
+    @staticmethod
+    def _key(memcube: Any) -> tuple[str, str, str] | None:
+        if not isinstance(memcube, dict):
+            return None
+        org_id = str(memcube.get("org_id") or "")
+        memcube_id = memcube.get("memcube_id") or memcube.get("id")
+        if not org_id or not isinstance(memcube_id, str) or not memcube_id:
+            return None
+        return org_id, str(memcube.get("context_type") or ""), memcube_id
+
+    def load(self, org_id: str, context_type: str, memcubes: Iterable[dict[str, Any]]) -> None:
+        """Build the slot off to the side and swap it in, so searches never see a partial slot."""
+        slot: dict[str, Any] = {"ids": [], "rows": {}, "memcubes": [], "matrix": None, "loaded_at": time.monotonic()}
+        for memcube in memcubes:
+            key = self._key(memcube)
+            if key is not None and key[:2] == (org_id, context_type):
+                self._upsert_into(slot, key[2], self._normalized(memcube.get("embedding")), memcube)
+        with self._lock:
+            self._slots[(org_id, context_type)] = slot
+
+    def upsert(self, memcube: dict[str, Any]) -> None:
+        """Insert, refresh or drop (when it lost its embedding) one memcube; no-op for unloaded slots."""
+        key = self._key(memcube)
+        if key is None:
+            return
+        vector = self._normalized(memcube.get("embedding"))
+        with self._lock:
+            slot = self._slots.get(key[:2])
+            if slot is not None:
+                self._upsert_into(slot, key[2], vector, memcube)
+
+    @classmethod
+    def _upsert_into(cls, slot: dict[str, Any], memcube_id: str, vector: Any, memcube: dict[str, Any]) -> None:
+        import numpy as np
+
+        if vector is None or (slot["matrix"] is not None and vector.shape[0] != slot["matrix"].shape[1]):
+            cls._remove_locked(slot, memcube_id)
+            return
+        if slot["matrix"] is None:
+            slot["matrix"] = np.zeros((16, vector.shape[0]), dtype=np.float32)
+        row = slot["rows"].get(memcube_id)
+        if row is None:
+            row = len(slot["ids"])
+            if row >= slot["matrix"].shape[0]:
+                grown = np.zeros((row * 2, slot["matrix"].shape[1]), dtype=np.float32)
+                grown[:row] = slot["matrix"][:row]
+                slot["matrix"] = grown
+            slot["ids"].append(memcube_id)
+            slot["memcubes"].append(memcube)
+            slot["rows"][memcube_id] = row
+        else:
+            slot["memcubes"][row] = memcube
+        slot["matrix"][row] = vector
+
+    @staticmethod
+    def _remove_locked(slot: dict[str, Any], memcube_id: str) -> None:
+        row = slot["rows"].pop(memcube_id, None)
+        if row is None:
+            return
+        last = len(slot["ids"]) - 1
+        if row != last:
+            # Swap the last row into the hole so the live rows stay contiguous.
+            moved = slot["ids"][last]
+            slot["ids"][row] = moved
+            slot["memcubes"][row] = slot["memcubes"][last]
+            slot["matrix"][row] = slot["matrix"][last]
+            slot["rows"][moved] = row
+        slot["ids"].pop()
+        slot["memcubes"].pop()
+
+    def remove(self, org_id: str, memcube_id: str) -> None:
+        with self._lock:
+            for (slot_org, _), slot in self._slots.items():
+                if slot_org == org_id:
+                    self._remove_locked(slot, memcube_id)
+
+    def search(self, org_id: str, context_type: str, vector: Any, *, k: int) -> list[tuple[float, dict[str, Any]]]:
+        """Top-`k` (cosine score, memcube) pairs, best first."""
+        import numpy as np
+
+        query = self._normalized(vector)
+        with self._lock:
+            slot = self._slots.get((org_id, context_type))
+            if query is None or slot is None or slot["matrix"] is None or not slot["ids"]:
+                return []
+            if query.shape[0] != slot["matrix"].shape[1]:
+                return []
+            n = len(slot["ids"])
+            scores = slot["matrix"][:n] @ query
+            pool = list(slot["memcubes"])
+        k = max(1, min(int(k), n))
+        top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        ordered = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), pool[int(i)]) for i in ordered]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+
+
+class InterventionTaxonomy:
+    """Per-org UX intervention taxonomy keyed by `intervention_key`.
+
+    An org is loaded once from the store (re-read after `ttl_s` to pick up other workers' writes)
+    and then kept current by `upsert`; every change bumps the org's `version`. `marker` records
+    which default-taxonomy fingerprint has been bootstrapped for the org.
+    """
+
+    def __init__(self, *, ttl_s: float = UX_TAXONOMY_TTL_S) -> None:
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._orgs: dict[str, dict[str, Any]] = {}
+
+    def loaded(self, org_id: str) -> bool:
+        entry = self._orgs.get(org_id)
+        return entry is not None and (self.ttl_s <= 0 or time.monotonic() - entry["loaded_at"] < self.ttl_s)
+
+    def load(self, org_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        by_key: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            key = row.get("intervention_key") if isinstance(row, dict) else None
+            if isinstance(key, str) and key and key not in by_key:
+                by_key[key] = row
+        with self._lock:
+            prev = self._orgs.get(org_id) or {}
+            self._orgs[org_id] = {
+                "by_key": by_key,
+                "version": int(prev.get("version", 0)) + 1,
+                "marker": prev.get("marker"),
+                "loaded_at": time.monotonic(),
+            }
+
+    def upsert(self, org_id: str, record: dict[str, Any]) -> None:
+        key = record.get("intervention_key") if isinstance(record, dict) else None
+        if not isinstance(key, str) or not key:
+            return
+        with self._lock:
+            entry = self._orgs.get(org_id)
+            if entry is None:
+                return
+            entry["by_key"][key] = record
+            entry["version"] += 1
+
+    def invalidate(self, org_id: str) -> None:
+        with self._lock:
+            self._orgs.pop(org_id, None)
+
+    def get(self, org_id: str, intervention_key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._orgs.get(org_id)
+            return entry["by_key"].get(str(intervention_key or "")) if entry is not None else None
+
+    def rows(self, org_id: str, *, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            entry = self._orgs.get(org_id)
+            return list(entry["by_key"].values())[: max(0, int(limit))] if entry is not None else []
+
+    def version(self, org_id: str) -> int:
+        entry = self._orgs.get(org_id)
+        return int(entry["version"]) if entry is not None else 0
+
+    def marker(self, org_id: str) -> str | None:
+        entry = self._orgs.get(org_id)
+        return entry.get("marker") if entry is not None else None
+
+    def set_marker(self, org_id: str, marker: str) -> None:
+        with self._lock:
+            entry = self._orgs.get(org_id)
+            if entry is not None:
+                entry["marker"] = marker
+
+    def clear(self) -> None:
+        with self._lock:
+            self._orgs.clear()
+
+
+def _bandit_log_from_run(run: dict[str, Any]) -> dict[str, Any] | None:
+    """(intervention_key, group_metrics, reward) training record for a measured run, if it has one."""
+    if not isinstance(run, dict) or not run.get("measured_at"):
+        return None
+    delta = run.get("delta") if isinstance(run.get("delta"), dict) else {}
+    wb_delta = delta.get("wellbeing_proxies") if isinstance(delta.get("wellbeing_proxies"), dict) else {}
+
+    # Compute reward from wellbeing improvement
+    improvements = [v for v in wb_delta.values() if isinstance(v, (int, float)) and v > 0]
+    reward = sum(improvements) / max(len(improvements), 1) if improvements else 0.0
+
+    # Get pre-state group metrics
+    pre_state = run.get("pre_state") if isinstance(run.get("pre_state"), dict) else {}
+    psych = pre_state.get("team_profile_psychodynamics") or pre_state.get("user_profile_psychodynamics")
+    if not isinstance(psych, dict):
+        return None
+
+    group_metrics = {
+        "avg_animals": psych.get("animals", {}),
+        "avg_kernel_drift": psych.get("kernel_drift", 0.0),
+        "te_reciprocity": psych.get("te_reciprocity"),
+        "dominance_ratio": psych.get("dominance_ratio", 0.0),
+        "avg_mean_certainty": psych.get("mean_certainty", 0.0),
+    }
+    return {
+        "intervention_key": run.get("intervention_key"),
+        "group_metrics": group_metrics,
+        "reward": float(reward),
+    }
+
+
+def _run_wellbeing(state: Any) -> dict[str, Any]:
+    if not isinstance(state, dict):
+        return {}
+    psych = state.get("team_profile_psychodynamics") or state.get("user_profile_psychodynamics")
+    wb = psych.get("wellbeing_proxies") if isinstance(psych, dict) else None
+    return wb if isinstance(wb, dict) else {}
+
+
+def _run_effect_columns(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Measured runs as columns: one row per run, one column per wellbeing proxy (NaN = absent).
+
+    Returns run ids/keys, `measured_at` epochs and `pre`, `post`, `delta` float matrices.
+    """
+    import numpy as np
+
+    rows: list[tuple[dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Any]]] = []
+    proxies: dict[str, int] = {}
+    for run in runs:
+        if not isinstance(run, dict) or not run.get("measured_at"):
+            continue
+        delta = run.get("delta") if isinstance(run.get("delta"), dict) else {}
+        wb_delta = delta.get("wellbeing_proxies") if isinstance(delta.get("wellbeing_proxies"), dict) else {}
+        pre = _run_wellbeing(run.get("pre_state"))
+        post = _run_wellbeing(run.get("post_state"))
+        for d in (pre, post, wb_delta):
+            for k, v in d.items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    proxies.setdefault(str(k), len(proxies))
+        rows.append((run, pre, post, wb_delta))
+
+    n, m = len(rows), len(proxies)
+    pre_m = np.full((n, m), np.nan)
+    post_m = np.full((n, m), np.nan)
+    delta_m = np.full((n, m), np.nan)
+    measured = np.full(n, np.nan)
+    for i, (run, pre, post, wb_delta) in enumerate(rows):
+        for matrix, d in ((pre_m, pre), (post_m, post), (delta_m, wb_delta)):
+            for k, v in d.items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    matrix[i, proxies[str(k)]] = float(v)
+        try:
+            measured[i] = parse_iso8601(str(run.get("measured_at"))).timestamp()
+        except (TypeError, ValueError, AttributeError):
+            pass
+    return {
+        "runs": [r[0] for r in rows],
+        "run_ids": [str(r[0].get("run_id")) for r in rows],
+        "keys": [str(r[0].get("intervention_key")) for r in rows],
+        "proxies": list(proxies),
+        "measured_at": measured,
+        "pre": pre_m,
+        "post": post_m,
+        "delta": delta_m,
+    }
+
+
+def _pooled_effect(pre: Any, post: Any) -> Any:
+    """Standardized mean difference along the last axis (pooled std; 1.0 when there is no spread)."""
+    import numpy as np
+
+    c = pre.shape[-1]
+    pre_mean = pre.mean(axis=-1)
+    post_mean = post.mean(axis=-1)
+    ss = ((pre - pre_mean[..., None]) ** 2).sum(axis=-1) + ((post - post_mean[..., None]) ** 2).sum(axis=-1)
+    pooled = np.where(ss > 0, np.sqrt(ss / max(2 * c - 2, 1)), 1.0)
+    return (post_mean - pre_mean) / np.maximum(pooled, 1e-10)
+
+
+def _row_stats(columns: list[Any], mask: Any, stat: Any) -> tuple[Any, Any]:
+    """Per-row statistic over each row's usable cells, plus the number of cells it used.
+
+    `columns` are (n, m) matrices sharing `mask` (cells to use). Rows with the same number of
+    usable cells are compacted and evaluated together, so the work is a handful of array operations.
+    A row's cells are one run's proxies, not iid samples, so no per-row interval is derived from them;
+    uncertainty comes from resampling runs (`_bootstrap_group_means`).
+    """
+    import numpy as np
+
+    counts = mask.sum(axis=1)
+    value = np.full(mask.shape[0], np.nan)
+    for c in np.unique(counts):
+        c = int(c)
+        if c == 0:
+            continue
+        rows = np.flatnonzero(counts == c)
+        value[rows] = stat(*[col[rows][mask[rows]].reshape(len(rows), c) for col in columns])
+    return value, counts
+
+
+def _bootstrap_group_means(
+    values: Any,
+    groups: list[str],
+    *,
+    n_boot: int = ATTRIBUTION_BOOTSTRAP,
+    seed: int = 0,
+) -> dict[str, dict[str, Any]]:
+    """Mean per group with a bootstrap 95% CI and two-sided p-value, resampling the group's rows.
+
+    Groups with a single row get a degenerate CI and p = 1 and are never significant.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(groups)
+    out: dict[str, dict[str, Any]] = {}
+    for key in sorted(set(groups)):
+        xs = values[(labels == key) & np.isfinite(values)]
+        if xs.size == 0:
+            continue
+        ci = [float(xs.mean()), float(xs.mean())]
+        p = 1.0
+        if xs.size > 1 and n_boot > 0:
+            means = xs[rng.integers(0, xs.size, size=(n_boot, xs.size))].mean(axis=1)
+            ci = [float(v) for v in np.percentile(means, [2.5, 97.5])]
+            tail = min(float((means <= 0).mean()), float((means >= 0).mean()))
+            p = float(min(1.0, max(2.0 * tail, 1.0 / (n_boot + 1))))
+        out[key] = {
+            "n_runs": int(xs.size),
+            "mean_effect": float(xs.mean()),
+            "ci95": ci,
+            "p_value": p,
+            "significant": bool(xs.size > 1 and (ci[0] > 0 or ci[1] < 0)),
+        }
+    return out
+
+
+def _with_group_significance(summary: Any, effect_cis: dict[str, dict[str, Any]]) -> Any:
+    """Attach each intervention's run-level CI, p-value and significance to its aggregate entry."""
+    if not isinstance(summary, dict) or not isinstance(summary.get("effects_by_intervention"), dict):
+        return summary
+    by_key = {
+        key: {**stats, **{k: v for k, v in effect_cis[key].items() if k in ("ci95", "p_value", "significant")}}
+        if isinstance(stats, dict) and key in effect_cis
+        else stats
+        for key, stats in summary["effects_by_intervention"].items()
+    }
+    return {**summary, "effects_by_intervention": by_key}
+
+
+def _t_two_sided_p(t: float, df: int) -> float:
+    """Two-sided Student-t p-value for integer `df` (closed-form series, A&S 26.7.3–26.7.4)."""
+    if not math.isfinite(t):
+        return 0.0 if not math.isnan(t) else 1.0
+    df = max(1, int(df))
+    theta = math.atan(abs(t) / math.sqrt(df))
+    c2 = math.cos(theta) ** 2
+    if df % 2 == 1:
+        series, term = 0.0, 1.0
+        if df > 1:
+            series = 1.0
+            for k in range(3, df - 1, 2):
+                term *= c2 * (k - 1) / k
+                series += term
+        a = (2.0 / math.pi) * (theta + math.sin(theta) * math.cos(theta) * series)
+    else:
+        series, term = 1.0, 1.0
+        for k in range(2, df - 1, 2):
+            term *= c2 * (k - 1) / k
+            series += term
+        a = math.sin(theta) * series
+    return float(min(1.0, max(0.0, 1.0 - a)))
+
+
+def _wellbeing_outcomes(windows: list[dict[str, Any]], *, fetch_limit: int, periods: int) -> list[float] | None:
+    """Mean proxy value per window, oldest first, over a scope's newest `fetch_limit` windows."""
+    if len(windows) < periods:
+        return None
+    recent = sorted(windows, key=lambda w: str(w.get("window_end") or ""), reverse=True)[: max(1, fetch_limit)]
+    outcomes: list[float] = []
+    for w in reversed(recent):
+        proxies = w.get("proxies") if isinstance(w.get("proxies"), dict) else {}
+        if proxies:
+            outcomes.append(sum(proxies.values()) / len(proxies))
+    return outcomes[:periods] if len(outcomes) >= periods else None
+
+
+def _did_panel(
+    outcomes: dict[str, list[float] | None],
+    unit_ids: list[str],
+) -> tuple[list[str], Any]:
+    """units × periods outcome matrix over the units that have a full series (input order kept)."""
+    import numpy as np
+
+    units = [u for u in dict.fromkeys(unit_ids) if outcomes.get(u) is not None]
+    if not units:
+        return [], np.zeros((0, 0))
+    return units, np.asarray([outcomes[u] for u in units], dtype=np.float64)
+
+
+def _did_estimate(panel: Any, treated: Any, pre_periods: int) -> dict[str, Any]:
+    """2×2 difference-in-differences and a pre-period parallel-trends test on a units × periods panel.
+
+    Each unit contributes its post-minus-pre mean change; the DiD is the treated-minus-control
+    difference of those changes, tested with a two-sample t statistic (control variance stands in
+    for a single treated unit). Parallel trends compares per-unit OLS pre-period slopes the same way;
+    a slope needs two pre periods, so with one the test is not possible and its p-value is None.
+    """
+    import numpy as np
+
+    pre = max(1, int(pre_periods))
+    treated = np.asarray(treated, dtype=bool)
+
+    def _two_sample(values: Any) -> tuple[float, float, float, float]:
+        t_vals, c_vals = values[treated], values[~treated]
+        n_t, n_c = int(t_vals.size), int(c_vals.size)
+        estimate = float(t_vals.mean() - c_vals.mean())
+        if n_t > 1 and n_c > 1:
+            var = (((t_vals - t_vals.mean()) ** 2).sum() + ((c_vals - c_vals.mean()) ** 2).sum()) / (n_t + n_c - 2)
+        elif n_c > 1:
+            var = float(c_vals.var(ddof=1))
+        else:
+            var = float("nan")
+        se = math.sqrt(var * (1.0 / n_t + 1.0 / n_c)) if var == var and var > 0 else float("nan")
+        t_stat = estimate / se if se == se and se > 0 else float("nan")
+        p_value = _t_two_sided_p(t_stat, n_t + n_c - 2) if t_stat == t_stat else 1.0
+        return estimate, se, t_stat, p_value
+
+    changes = panel[:, pre:].mean(axis=1) - panel[:, :pre].mean(axis=1)
+    estimate, se, t_stat, p_value = _two_sample(changes)
+
+    pt_p: float | None = None
+    if pre >= 2:
+        x = np.arange(pre, dtype=np.float64)
+        x -= x.mean()
+        slopes = (panel[:, :pre] - panel[:, :pre].mean(axis=1, keepdims=True)) @ x / float(x @ x)
+        _, _, _, pt_p = _two_sample(slopes)
+
+    return {
+        "estimate": estimate,
+        "std_error": se,
+        "t_stat": t_stat,
+        "p_value": p_value,
+        "significant": bool(p_value < 0.05),
+        "parallel_trends_p_value": pt_p,
+    }
+
+
+def _policy_to_npz(policy: Any, path: str) -> bool:
+    """Snapshot a bandit policy's state (arrays, per-arm arrays and scalars) into one `.npz` file.
+
+    Returns False, writing nothing, when the policy holds state this format cannot represent.
+    """
+    import numpy as np
+
+    state = getattr(policy, "__dict__", None)
+    if not isinstance(state, dict):
+        return False
+    arrays: dict[str, Any] = {}
+    meta: dict[str, Any] = {"__class__": type(policy).__name__}
+    for name, value in state.items():
+        if isinstance(value, np.ndarray):
+            arrays[f"attr:{name}"] = value
+        elif isinstance(value, dict) and value and all(isinstance(v, np.ndarray) for v in value.values()):
+            keys = [str(k) for k in value]
+            arrays[f"arms:{name}"] = np.asarray(keys)
+            for i, k in enumerate(value):
+                arrays[f"arm:{name}:{i}"] = value[k]
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            meta[name] = value
+        elif isinstance(value, (list, tuple)) and all(isinstance(v, (bool, int, float, str)) for v in value):
+            meta[name] = list(value)
+        else:
+            return False
+    arrays["meta"] = np.asarray(json.dumps(meta))
+    tmp = f"{path}.tmp.npz"
+    with open(tmp, "wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp, path)
+    return True
+
+
+def _policy_from_npz(path: str, classes: dict[str, Any]) -> Any | None:
+    """Rebuild a policy written by `_policy_to_npz`; None for unknown classes or unreadable files."""
+    import numpy as np
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            cls = classes.get(str(meta.pop("__class__", "")))
+            if cls is None:
+                return None
+            state: dict[str, Any] = dict(meta)
+            for name in data.files:
+                if name.startswith("attr:"):
+                    state[name[5:]] = data[name]
+                elif name.startswith("arms:"):
+                    attr = name[5:]
+                    keys = [str(k) for k in data[name]]
+                    state[attr] = {k: data[f"arm:{attr}:{i}"] for i, k in enumerate(keys)}
+    except Exception:
+        return None
+    policy = cls.__new__(cls)
+    policy.__dict__.update(state)
+    return policy
+
+
+class OnlineLinUCB:
+    """LinUCB kept current one observation at a time, mergeable across workers.
+
+    Each arm holds A (ridge- or policy-seeded), its inverse and b; an observation (x, r) adds xxᵀ
+    to A and applies the Sherman–Morrison rank-one update A⁻¹ ← A⁻¹ − (A⁻¹x)(A⁻¹x)ᵀ / (1 + xᵀA⁻¹x),
+    which is O(d²) instead of re-inverting or retraining from the run log. This process's own
+    sufficient statistics since the seed (Σxxᵀ, Σrx, n per arm) are tracked separately: they are
+    what a checkpoint stores, so every worker's checkpoint can be `absorb`ed into one policy
+    without counting any observation twice.
+
+    `base` is the snapshot stamp of the trained policy it started from and `seeded` whether it
+    carries that policy's state (always true when there was no trained policy to start from).
+    """
+
+    def __init__(self, dims: int, *, alpha: float = BANDIT_ONLINE_ALPHA, ridge: float = 1.0) -> None:
+        self.dims = int(dims)
+        self.alpha = float(alpha)
+        self.ridge = float(ridge)
+        self.arms: dict[str, dict[str, Any]] = {}
+        self.updates = 0
+        self.own_updates = 0
+        self.base: tuple[int | None, int | None] = (None, None)
+        self.seeded = True
+
+    def _arm(self, key: str) -> dict[str, Any]:
+        import numpy as np
+
+        arm = self.arms.get(key)
+        if arm is None:
+            arm = {
+                "A": np.eye(self.dims) * self.ridge,
+                "A_inv": np.eye(self.dims) / self.ridge,
+                "b": np.zeros(self.dims),
+                "dA": np.zeros((self.dims, self.dims)),
+                "db": np.zeros(self.dims),
+                "n": 0,
+            }
+            self.arms[key] = arm
+        return arm
+
+    def seed_from(self, policy: Any) -> bool:
+        """Start from a trained policy's per-arm A and b when it exposes them (LinUCB layout)."""
+        import numpy as np
+
+        A = getattr(policy, "A", None)
+        b = getattr(policy, "b", None)
+        if not isinstance(A, dict) or not isinstance(b, dict):
+            return False
+        arms: dict[str, dict[str, Any]] = {}
+        for key, a_mat in A.items():
+            a_mat = np.asarray(a_mat, dtype=np.float64)
+            b_vec = np.asarray(b.get(key), dtype=np.float64)
+            if a_mat.shape != (self.dims, self.dims) or b_vec.shape != (self.dims,):
+                return False
+            arms[str(key)] = {
+                "A": a_mat.copy(),
+                "A_inv": np.linalg.inv(a_mat),
+                "b": b_vec.copy(),
+                "dA": np.zeros((self.dims, self.dims)),
+                "db": np.zeros(self.dims),
+                "n": 0,
+            }
+        self.arms.update(arms)
+        return bool(arms)
+
+    def update(self, key: str, x: Any, reward: float) -> None:
+        import numpy as np
+
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        arm = self._arm(str(key))
+        xx = np.outer(x, x)
+        ax = arm["A_inv"] @ x
+        arm["A"] += xx
+        arm["A_inv"] -= np.outer(ax, ax) / (1.0 + float(x @ ax))
+        arm["b"] += float(reward) * x
+        arm["dA"] += xx
+        arm["db"] += float(reward) * x
+        arm["n"] += 1
+        self.updates += 1
+        self.own_updates += 1
+
+    def absorb(self, stats: dict[str, tuple[Any, Any, int]], *, own: bool) -> None:
+        """Add a checkpoint's per-arm `(Σxxᵀ, Σrx, n)`; `own` stats also become this process's."""
+        import numpy as np
+
+        for key, (d_a, d_b, n) in stats.items():
+            arm = self._arm(str(key))
+            arm["A"] += d_a
+            arm["b"] += d_b
+            arm["A_inv"] = np.linalg.inv(arm["A"])
+            self.updates += int(n)
+            if own:
+                arm["dA"] += d_a
+                arm["db"] += d_b
+                arm["n"] += int(n)
+                self.own_updates += int(n)
+
+    def get_theta(self, key: str) -> Any | None:
+        arm = self.arms.get(str(key))
+        return arm["A_inv"] @ arm["b"] if arm is not None else None
+
+    def select(self, x: Any, arm_keys: list[str]) -> tuple[str | None, float | None]:
+        """Arm with the highest upper confidence bound θᵀx + α·sqrt(xᵀA⁻¹x)."""
+        import numpy as np
+
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        best: tuple[str | None, float | None] = (None, None)
+        for key in arm_keys:
+            arm = self.arms.get(str(key))
+            if arm is None:
+                # Unseen arm: prior θ = 0 and A⁻¹ = I / ridge.
+                ucb = self.alpha * math.sqrt(max(0.0, float(x @ x) / self.ridge))
+            else:
+                ax = arm["A_inv"] @ x
+                ucb = float(ax @ arm["b"]) + self.alpha * math.sqrt(max(0.0, float(x @ ax)))
+            if best[1] is None or ucb > best[1]:
+                best = (str(key), ucb)
+        return best
+
+    def save(self, path: str) -> None:
+        """Checkpoint this process's own sufficient statistics (not the seed or absorbed peers)."""
+        import numpy as np
+
+        keys = sorted(k for k, arm in self.arms.items() if arm["n"])
+        tmp = f"{path}.tmp.npz"
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                keys=np.asarray(keys),
+                dA=np.stack([self.arms[k]["dA"] for k in keys]) if keys else np.zeros((0, self.dims, self.dims)),
+                db=np.stack([self.arms[k]["db"] for k in keys]) if keys else np.zeros((0, self.dims)),
+                n=np.asarray([self.arms[k]["n"] for k in keys], dtype=np.int64),
+                meta=np.asarray([self.dims, self.alpha, self.ridge, self.own_updates, self.seeded], dtype=np.float64),
+                base=np.asarray([-1 if v is None else v for v in self.base], dtype=np.int64),
+            )
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load_stats(path: str) -> dict[str, Any] | None:
+        """A checkpoint's `dims`, `base` and per-arm `stats` (None if unreadable)."""
+        import numpy as np
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                dims = int(data["meta"].tolist()[0])
+                npz_stamp, json_stamp = (int(v) for v in data["base"])
+                return {
+                    "dims": dims,
+                    "base": (None if npz_stamp < 0 else npz_stamp, None if json_stamp < 0 else json_stamp),
+                    "stats": {
+                        str(key): (data["dA"][i].copy(), data["db"][i].copy(), int(data["n"][i]))
+                        for i, key in enumerate(data["keys"])
+                    },
+                }
+        except Exception:
+            return None
+
+
+class BanditPolicyRegistry:
+    """Trained bandit policies kept in memory per org, reloaded when the on-disk snapshot changes.
+
+    Each org has a JSON policy (`load_policy`/`save_policy` format) and, when the policy's state
+    is plain arrays, a compact `.npz` sidecar that is preferred on load. A cached policy is reused
+    for as long as the mtime of the file it came from is unchanged.
+    """
+
+    def __init__(self, directory: str = BANDIT_POLICY_DIR) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._online: dict[str, OnlineLinUCB] = {}
+
+    def paths(self, org_id: str) -> tuple[str, str]:
+        base = os.path.join(self.directory, f"bandit_policy_{org_id}")
+        return f"{base}.json", f"{base}.npz"
+
+    def online_path(self, org_id: str) -> str:
+        """This process's checkpoint; workers keep separate files so they never overwrite each other."""
+        return os.path.join(self.directory, f"bandit_online_{org_id}.{os.getpid()}.npz")
+
+    def _online_paths(self, org_id: str) -> list[str]:
+        prefix = f"bandit_online_{org_id}."
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [
+            os.path.join(self.directory, n)
+            for n in names
+            if n.startswith(prefix) and n.endswith(".npz") and n[len(prefix) : -len(".npz")].isdigit()
+        ]
+
+    def _seeded(self, org_id: str, dims: int, base: tuple[int | None, int | None]) -> OnlineLinUCB:
+        policy = OnlineLinUCB(dims)
+        policy.base = base
+        trained = self.get(org_id)
+        # A trained policy without a LinUCB layout (e.g. Thompson) cannot seed this one; the
+        # online state then still accrues, but recommendations keep using the trained policy.
+        policy.seeded = trained is None or policy.seed_from(trained)
+        return policy
+
+    def _load_online(self, org_id: str, base: tuple[int | None, int | None]) -> OnlineLinUCB | None:
+        """The trained seed plus every worker's checkpointed statistics for `base`, merged.
+
+        Checkpoints built on an older snapshot are covered by the retrain that replaced it and are
+        deleted here, so files left by exited workers do not accumulate.
+        """
+        own_path = self.online_path(org_id)
+        checkpoints: list[tuple[bool, dict[str, Any]]] = []
+        for path in self._online_paths(org_id):
+            data = OnlineLinUCB.load_stats(path)
+            if data is None:
+                continue
+            if data["base"] != base:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            checkpoints.append((path == own_path, data))
+        if not checkpoints:
+            return None
+        dims = next((d["dims"] for own, d in checkpoints if own), checkpoints[0][1]["dims"])
+        policy = self._seeded(org_id, dims, base)
+        for own, data in checkpoints:
+            if data["dims"] == dims:
+                policy.absorb(data["stats"], own=own)
+        return policy
+
+    def online(self, org_id: str) -> OnlineLinUCB | None:
+        """The org's online policy, provided it still builds on the current trained snapshot.
+
+        A retrain (here via `put` or by another worker) changes the snapshot stamp; online state
+        seeded from the previous policy is then dropped and restarts from the new one.
+        """
+        self.get(org_id)
+        with self._lock:
+            entry = self._entries.get(org_id)
+            base = entry["stamp"] if entry is not None else (None, None)
+            policy = self._online.get(org_id)
+            if policy is not None and policy.base != base:
+                self._online.pop(org_id, None)
+                policy = None
+        if policy is None:
+            policy = self._load_online(org_id, base)
+            if policy is not None:
+                with self._lock:
+                    policy = self._online.setdefault(org_id, policy)
+        return policy
+
+    def observe(self, org_id: str, arm: str, x: Any, reward: float) -> dict[str, Any]:
+        """Apply one measured reward to the org's online policy.
+
+        Every N own updates the process checkpoints its statistics and re-merges the other
+        workers' latest checkpoints, so each worker's policy reflects all of them.
+        """
+        import numpy as np
+
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        policy = self.online(org_id)
+        if policy is None or policy.dims != x.shape[0]:
+            with self._lock:
+                entry = self._entries.get(org_id)
+                base = entry["stamp"] if entry is not None else (None, None)
+            policy = self._seeded(org_id, x.shape[0], base)
+            with self._lock:
+                self._online[org_id] = policy
+        with self._lock:
+            policy.update(arm, x, reward)
+            checkpoint = BANDIT_CHECKPOINT_EVERY > 0 and policy.own_updates % BANDIT_CHECKPOINT_EVERY == 0
+            if checkpoint:
+                try:
+                    policy.save(self.online_path(org_id))
+                except OSError:
+                    checkpoint = False
+        if checkpoint:
+            merged = self._load_online(org_id, policy.base)
+            if merged is not None and merged.dims == policy.dims:
+                with self._lock:
+                    if self._online.get(org_id) is policy and merged.own_updates == policy.own_updates:
+                        self._online[org_id] = merged
+                        policy = merged
+        return {"arm": str(arm), "reward": float(reward), "updates": policy.updates, "checkpointed": checkpoint}
+
+    @staticmethod
+    def _mtime(path: str) -> int | None:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, org_id: str) -> Any | None:
+        from collectium_intelligence import bandit
+
+        json_path, npz_path = self.paths(org_id)
+        npz_mtime, json_mtime = self._mtime(npz_path), self._mtime(json_path)
+        stamp = (npz_mtime, json_mtime)
+        with self._lock:
+            entry = self._entries.get(org_id)
+            if entry is not None and entry["stamp"] == stamp:
+                return entry["policy"]
+
+        policy = None
+        if npz_mtime is not None and (json_mtime is None or npz_mtime >= json_mtime):
+            classes = {
+                name: getattr(bandit, name)
+                for name in ("LinUCBPolicy", "ThompsonSamplingPolicy")
+                if hasattr(bandit, name)
+            }
+            policy = _policy_from_npz(npz_path, classes)
+        if policy is None and json_mtime is not None:
+            policy = bandit.load_policy(json_path)
+        with self._lock:
+            entry = self._entries.get(org_id)
+            self._entries[org_id] = {
+                "policy": policy,
+                "stamp": stamp,
+                "version": (entry["version"] + 1) if entry is not None else 1,
+            }
+        return policy
+
+    def put(self, org_id: str, policy: Any) -> dict[str, Any]:
+        """Persist `policy` (JSON plus `.npz` when representable) and make it the cached version."""
+        from collectium_intelligence.bandit import save_policy
+
+        json_path, npz_path = self.paths(org_id)
+        save_policy(policy, json_path)
+        try:
+            npz_written = _policy_to_npz(policy, npz_path)
+        except Exception:
+            npz_written = False
+        if not npz_written:
+            try:
+                os.remove(npz_path)
+            except OSError:
+                pass
+        with self._lock:
+            entry = self._entries.get(org_id)
+            version = (entry["version"] + 1) if entry is not None else 1
+            self._entries[org_id] = {
+                "policy": policy,
+                "stamp": (self._mtime(npz_path), self._mtime(json_path)),
+                "version": version,
+            }
+            # The retrain already covers every measured run; the next observation reseeds from it.
+            self._online.pop(org_id, None)
+        for path in self._online_paths(org_id):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return {"policy_path": json_path, "snapshot_path": npz_path if npz_written else None, "version": version}
+
+    def version(self, org_id: str) -> int:
+        entry = self._entries.get(org_id)
+        return int(entry["version"]) if entry is not None else 0
+
+
+class ProjectActivityIndex:
+    """Per-org project membership and activity, maintained at ingest.
+
+    For every project: the member set, the latest event timestamp and exponentially decayed
+    per-member event counts (half-life `half_life_s`). An org is bootstrapped from its raw events
+    via `rebuild` and reloaded once older than `ttl_s`, so other workers' ingests are picked up.
+    Events observed while a rebuild is listing the store are replayed into it. Each org keeps a
+    `(timestamp, event_id)` high-water mark instead of a set of seen ids: an event at or below the
+    mark is already counted (or arrived late and is picked up by the next reload), so memory stays
+    constant per org however many events it ingests.
+    """
+
+    def __init__(
+        self,
+        *,
+        half_life_s: float = PROJECT_ACTIVITY_HALF_LIFE_S,
+        ttl_s: float = PROJECT_ACTIVITY_TTL_S,
+    ) -> None:
+        self.half_life_s = float(half_life_s)
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._orgs: dict[str, dict[str, dict[str, Any]]] = {}
+        self._watermark: dict[str, tuple[str, str]] = {}
+        self._loaded_at: dict[str, float] = {}
+        self._pending: dict[str, list[list[dict[str, Any]]]] = {}
+
+    @staticmethod
+    def _event_fields(event: dict[str, Any]) -> tuple[str, str, str, str] | None:
+        org_id = event.get("org_id")
+        ev_pid = event.get("project_id")
+        ev_data = event.get("event_data") if isinstance(event.get("event_data"), dict) else {}
+        pid = ev_pid if isinstance(ev_pid, str) and ev_pid else ev_data.get("project_id")
+        if not isinstance(pid, str) or not pid:
+            return None
+        uid = event.get("user_id")
+        ts = event.get("timestamp")
+        return (
+            org_id if isinstance(org_id, str) else "",
+            pid,
+            uid if isinstance(uid, str) else "",
+            ts if isinstance(ts, str) else "",
+        )
+
+    def _apply(self, projects: dict[str, dict[str, Any]], pid: str, uid: str, ts: str) -> None:
+        entry = projects.setdefault(pid, {"members": set(), "last_ts": "", "activity": {}})
+        if uid:
+            entry["members"].add(uid)
+        if ts and ts > entry["last_ts"]:
+            entry["last_ts"] = ts
+        if not uid:
+            return
+        try:
+            at = parse_iso8601(ts).timestamp() if ts else time.time()
+        except Exception:
+            at = time.time()
+        count, prev_at = entry["activity"].get(uid, (0.0, at))
+        if at >= prev_at:
+            count = count * self._decay(at - prev_at) + 1.0
+            prev_at = at
+        else:
+            count += self._decay(prev_at - at)
+        entry["activity"][uid] = (count, prev_at)
+
+    def _decay(self, dt_s: float) -> float:
+        if self.half_life_s <= 0:
+            return 1.0
+        return math.pow(0.5, max(0.0, dt_s) / self.half_life_s)
+
+    def loaded(self, org_id: str) -> bool:
+        loaded_at = self._loaded_at.get(org_id)
+        return loaded_at is not None and (self.ttl_s <= 0 or time.monotonic() - loaded_at < self.ttl_s)
+
+    @staticmethod
+    def _event_mark(event: dict[str, Any]) -> tuple[str, str]:
+        ts = event.get("timestamp")
+        event_id = event.get("event_id")
+        return (ts if isinstance(ts, str) else "", event_id if isinstance(event_id, str) else "")
+
+    def _apply_event(self, projects: dict[str, dict[str, Any]], mark: tuple[str, str], event: Any) -> tuple[str, str]:
+        """Apply `event` if it lies above the high-water `mark`; return the (possibly advanced) mark."""
+        fields = self._event_fields(event) if isinstance(event, dict) else None
+        if fields is None:
+            return mark
+        event_mark = self._event_mark(event)
+        if event_mark <= mark:
+            return mark
+        self._apply(projects, fields[1], fields[2], fields[3])
+        return event_mark
+
+    def rebuild(self, org_id: str, list_events: Any) -> None:
+        """Reload an org from `list_events()`, replaying events observed while it was listing.
+
+        Each call registers its own pending buffer, so concurrent rebuilds of one org neither
+        steal nor drop each other's replayed events.
+        """
+        buffer: list[dict[str, Any]] = []
+        with self._lock:
+            self._pending.setdefault(org_id, []).append(buffer)
+        try:
+            events = list_events()
+            events = sorted((ev for ev in events if isinstance(ev, dict)), key=self._event_mark)
+            projects: dict[str, dict[str, Any]] = {}
+            mark = ("", "")
+            for ev in events:
+                mark = self._apply_event(projects, mark, ev)
+            with self._lock:
+                for ev in sorted(buffer, key=self._event_mark):
+                    mark = self._apply_event(projects, mark, ev)
+                self._orgs[org_id] = projects
+                self._watermark[org_id] = mark
+                self._loaded_at[org_id] = time.monotonic()
+        finally:
+            with self._lock:
+                buffers = [buf for buf in self._pending.get(org_id, ()) if buf is not buffer]
+                if buffers:
+                    self._pending[org_id] = buffers
+                else:
+                    self._pending.pop(org_id, None)
+
+    def observe(self, event: dict[str, Any]) -> None:
+        fields = self._event_fields(event) if isinstance(event, dict) else None
+        if fields is None or not fields[0]:
+            return
+        org_id = fields[0]
+        with self._lock:
+            for buffer in self._pending.get(org_id, ()):
+                buffer.append(event)
+            projects = self._orgs.get(org_id)
+            if projects is not None:
+                self._watermark[org_id] = self._apply_event(projects, self._watermark.get(org_id, ("", "")), event)
+
+    def project(self, org_id: str, project_id: str, *, now: float | None = None) -> dict[str, Any]:
+        """Members, last activity timestamp and decayed per-member activity for one project."""
+        at = time.time() if now is None else float(now)
+        with self._lock:
+            entry = (self._orgs.get(org_id) or {}).get(project_id)
+            if entry is None:
+                return {"members": [], "last_ts": None, "activity": {}}
+            return {
+                "members": sorted(entry["members"]),
+                "last_ts": entry["last_ts"] or None,
+                "activity": {
+                    uid: count * self._decay(at - prev_at) for uid, (count, prev_at) in sorted(entry["activity"].items())
+                },
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._orgs.clear()
+            self._watermark.clear()
+            self._loaded_at.clear()
+            self._pending.clear()
+
+
+def _graph_edge_pairs(graph: dict[str, Any], *, any_type: bool = False) -> tuple[set[str], list[tuple[str, str]]]:
+    """Node ids and `depends_on` (from, to) pairs of an FSA dependency graph (every edge with `any_type`)."""
+    nodes_raw = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
+    edges_raw = graph.get("edges") if isinstance(graph.get("edges"), list) else []
+    node_ids: set[str] = {str(k) for k in nodes_raw.keys() if isinstance(k, str) and k}
+    edge_pairs: list[tuple[str, str]] = []
+    for e in edges_raw:
+        if not isinstance(e, dict):
+            continue
+        if not any_type and str(e.get("type") or "depends_on") != "depends_on":
+            continue
+        src = e.get("from")
+        dst = e.get("to")
+        if not isinstance(src, str) or not src:
+            continue
+        if not isinstance(dst, str) or not dst:
+            continue
+        node_ids.add(src)
+        node_ids.add(dst)
+        edge_pairs.append((src, dst))
+    return node_ids, edge_pairs
+
+
+_DIGEST_MASK = (1 << 64) - 1
+
+
+def _graph_digest(node_ids: Iterable[str], edge_pairs: Iterable[tuple[str, str]]) -> int:
+    """Order-independent hash of a node set plus an edge multiset (a sum of per-item hashes).
+
+    Any different edge set, including a one-for-one edge swap that keeps the counts, changes it,
+    and `IncrementalDag` keeps the same sum up to date under single-edge changes. Built on `hash()`,
+    so values are only comparable within one process.
+    """
+    total = 0
+    for nid in node_ids:
+        total += hash(("n", nid))
+    for pair in edge_pairs:
+        total += hash(("e",) + tuple(pair))
+    return total & _DIGEST_MASK
+
+
+def _graph_version(graph: Any, *, any_type: bool = False) -> str:
+    """Structural version of an FSA dependency graph: the digest of its nodes and depends_on edges
+    (every edge with `any_type`)."""
+    node_ids, edge_pairs = _graph_edge_pairs(graph if isinstance(graph, dict) else {}, any_type=any_type)
+    return f"{_graph_digest(node_ids, edge_pairs):016x}"
+
+
+class IncrementalDag:
+    """Materialised dependency DAG with incrementally maintained levels.
+
+    Levels are longest-path depths from the sources; the topological order is level-major, so both
+    stay valid under single-edge adds/removes without re-sorting the whole graph. A cyclic input
+    graph is kept as-is with `levels = None` and recomputed on every change; `add_edge` detects an
+    edge that closes a cycle during level propagation and drops to that mode instead of looping.
+    `digest` is the `_graph_digest` of the current nodes and edges, kept current on every change.
+    """
+
+    def __init__(self, *, node_ids: Iterable[str], edge_pairs: Iterable[tuple[str, str]]) -> None:
+        self.nodes: set[str] = set(node_ids)
+        self.digest = _graph_digest(self.nodes, ())
+        self.edge_pairs: list[tuple[str, str]] = []
+        self.preds: dict[str, dict[str, int]] = {n: {} for n in self.nodes}
+        self.succs: dict[str, dict[str, int]] = {n: {} for n in self.nodes}
+        self.levels: dict[str, int] | None = {n: 0 for n in self.nodes}
+        for src, dst in edge_pairs:
+            self._link(src, dst)
+        self.levels = self._compute_levels()
+        self._view: dict[str, Any] | None = None
+
+    @classmethod
+    def from_graph(cls, graph: dict[str, Any]) -> "IncrementalDag":
+        node_ids, edge_pairs = _graph_edge_pairs(graph)
+        return cls(node_ids=node_ids, edge_pairs=edge_pairs)
+
+    @property
+    def version(self) -> str:
+        return f"{self.digest:016x}"
+
+    def _ensure(self, nid: str) -> None:
+        if nid not in self.nodes:
+            self.nodes.add(nid)
+            self.digest = (self.digest + hash(("n", nid))) & _DIGEST_MASK
+            self.preds[nid] = {}
+            self.succs[nid] = {}
+            if self.levels is not None:
+                self.levels[nid] = 0
+
+    def _link(self, src: str, dst: str) -> None:
+        self._ensure(src)
+        self._ensure(dst)
+        self.digest = (self.digest + hash(("e", src, dst))) & _DIGEST_MASK
+        self.edge_pairs.append((src, dst))
+        self.preds[dst][src] = self.preds[dst].get(src, 0) + 1
+        self.succs[src][dst] = self.succs[src].get(dst, 0) + 1
+
+    def _compute_levels(self) -> dict[str, int] | None:
+        indegree = {n: len(self.preds[n]) for n in self.nodes}
+        levels = {n: 0 for n in self.nodes}
+        frontier = [n for n, d in indegree.items() if d == 0]
+        seen = 0
+        while frontier:
+            node = frontier.pop()
+            seen += 1
+            for nxt in self.succs[node]:
+                levels[nxt] = max(levels[nxt], levels[node] + 1)
+                indegree[nxt] -= 1
+                if indegree[nxt] == 0:
+                    frontier.append(nxt)
+        return levels if seen == len(self.nodes) else None
+
+    def would_create_cycle(self, src: str, dst: str) -> bool:
+        if src == dst:
+            return True
+        if src not in self.nodes or dst not in self.nodes:
+            return False
+        if self.levels is None:
+            return would_create_cycle(nodes=sorted(self.nodes), edges=list(self.edge_pairs), new_edge=(src, dst))
+        # Levels strictly increase along edges, so only nodes below `src` can lead back to it.
+        bound = self.levels[src]
+        stack = [dst]
+        seen = {dst}
+        while stack:
+            node = stack.pop()
+            if node == src:
+                return True
+            for nxt in self.succs[node]:
+                if nxt not in seen and (nxt == src or self.levels[nxt] < bound):
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return False
+
+    def add_edge(self, src: str, dst: str) -> bool:
+        """Add `src -> dst`; returns False (and leaves the DAG in cyclic mode) if it closed a cycle."""
+        self._view = None
+        self._link(src, dst)
+        if self.levels is None:
+            self.levels = self._compute_levels()
+            return self.levels is not None
+        if self.levels[dst] > self.levels[src]:
+            return True
+        # In a DAG no level exceeds n - 1, so propagation reaching `src` or passing that bound
+        # means the new edge closed a cycle.
+        bound = len(self.nodes) - 1
+        self.levels[dst] = self.levels[src] + 1
+        stack = [dst]
+        while stack:
+            node = stack.pop()
+            if node == src or self.levels[node] > bound:
+                self.levels = None
+                return False
+            for nxt in self.succs[node]:
+                if self.levels[nxt] <= self.levels[node]:
+                    self.levels[nxt] = self.levels[node] + 1
+                    stack.append(nxt)
+        return True
+
+    def remove_edge(self, src: str, dst: str) -> None:
+        if self.preds.get(dst, {}).get(src, 0) <= 0:
+            return
+        self._view = None
+        self.edge_pairs.remove((src, dst))
+        self.digest = (self.digest - hash(("e", src, dst))) & _DIGEST_MASK
+        for table, a, b in ((self.preds, dst, src), (self.succs, src, dst)):
+            table[a][b] -= 1
+            if table[a][b] <= 0:
+                del table[a][b]
+        if self.levels is None:
+            self.levels = self._compute_levels()
+            return
+        # Re-derive levels downstream of `dst` in order of their old level (predecessors first).
+        heap = [(self.levels[dst], dst)]
+        queued = {dst}
+        while heap:
+            _, node = heapq.heappop(heap)
+            queued.discard(node)
+            level = 1 + max((self.levels[p] for p in self.preds[node]), default=-1)
+            if level == self.levels[node]:
+                continue
+            self.levels[node] = level
+            for nxt in self.succs[node]:
+                if nxt not in queued:
+                    queued.add(nxt)
+                    heapq.heappush(heap, (self.levels[nxt], nxt))
+
+    def view(self) -> dict[str, Any]:
+        """Plan-endpoint view (same shape as a from-scratch DAG view); memoised until the next change.
+
+        Callers get a copy, so mutating a response never corrupts the memoised view.
+        """
+        if self._view is None:
+            levels = dict(self.levels or {})
+            level_groups = [{"level": lvl, "node_ids": ids} for (lvl, ids) in iter_level_groups(levels)]
+            self._view = {
+                "is_dag": self.levels is not None,
+                "topo_order": [nid for group in level_groups for nid in group["node_ids"]],
+                "levels": levels,
+                "level_groups": level_groups,
+                "blocked_by": {nid: sorted(self.preds[nid]) for nid in self.nodes},
+                "edge_pairs": list(self.edge_pairs),
+                "node_ids": sorted(self.nodes),
+                "graph_version": self.version,
+            }
+        view = self._view
+        return {
+            **view,
+            "topo_order": list(view["topo_order"]),
+            "levels": dict(view["levels"]),
+            "level_groups": [{"level": g["level"], "node_ids": list(g["node_ids"])} for g in view["level_groups"]],
+            "blocked_by": {nid: list(preds) for nid, preds in view["blocked_by"].items()},
+            "edge_pairs": list(view["edge_pairs"]),
+            "node_ids": list(view["node_ids"]),
+        }
+
+
+def _block_spec(meta: Any, *, wait_key: str) -> dict[str, Any] | None:
+    """Pre-parsed time/memory block of a plan node, so timestamps are parsed once per change."""
+    if not isinstance(meta, dict):
+        return None
+    block_type = str(meta.get("block_type") or "").strip().lower()
+    blocked_until = meta.get("blocked_until")
+    reason = meta.get("block_reason") or meta.get("reason")
+    note = meta.get("block_note")
+
+    if block_type == "time" or (isinstance(blocked_until, str) and blocked_until.strip()):
+        until_str = blocked_until if isinstance(blocked_until, str) and blocked_until.strip() else None
+        until: float | None = None
+        if until_str is not None:
+            try:
+                until = parse_iso8601(until_str).timestamp()
+            except Exception:
+                until = None
+        info = {"block_type": "time", "blocked_until": until_str, "reason": reason, "note": note}
+        return {"kind": "time", "until": until, "info": info}
+
+    waiting_for = meta.get(wait_key)
+    waiting_for = waiting_for if isinstance(waiting_for, str) and waiting_for.strip() else None
+    waiting_for_external = bool(meta.get("waiting_for_external"))
+    if block_type == "memory" or waiting_for is not None or waiting_for_external:
+        info = {
+            "block_type": "memory",
+            "waiting_for": waiting_for,
+            "waiting_for_external": waiting_for_external,
+            "reason": reason,
+            "note": note,
+        }
+        return {"kind": "memory", "waiting_for": waiting_for, "external": waiting_for_external, "info": info}
+    return None
+
+
+def _block_eval(
+    spec: dict[str, Any] | None,
+    *,
+    now: float,
+    state_by_id: dict[str, str],
+    done_states: Iterable[str],
+) -> tuple[bool, dict[str, Any]]:
+    """(is_blocked, info) for a `_block_spec` at epoch `now`; unparseable or open-ended time blocks stay blocked."""
+    if spec is None:
+        return False, {}
+    if spec["kind"] == "time":
+        until = spec["until"]
+        return (True if until is None else until > now), dict(spec["info"])
+    waiting_for = spec["waiting_for"]
+    if waiting_for is not None and state_by_id.get(waiting_for) in done_states and not spec["external"]:
+        return False, {}
+    return True, dict(spec["info"])
+
+
+def _block_signature(meta: Any, *, wait_key: str) -> tuple[Any, ...] | None:
+    if not isinstance(meta, dict):
+        return None
+    return tuple(
+        meta.get(k)
+        for k in ("block_type", "blocked_until", "block_reason", "reason", "block_note", wait_key, "waiting_for_external")
+    )
+
+
+class ReadinessTracker:
+    """Event-driven ready/blocked sets for one plan graph.
+
+    Gating follows every edge of the graph, whatever its type (the same edges task recommendations
+    treat as blockers); `IncrementalDag` keeps modelling only `depends_on` for levels and cycles.
+    Keeps the number of unfinished predecessors per node, memory-block waiters per target and a
+    min-heap of time-block expiries. `sync` with `changed` touches only those nodes and their
+    successors/waiters (O(degree) per change; a full diff without it); `add_edge`/`remove_edge`
+    apply single edge changes; `advance` releases expired time blocks in O(log n). Readiness
+    changes are appended to a bounded sequence-numbered log for streaming.
+    """
+
+    def __init__(self, graph: dict[str, Any], *, done_states: Iterable[str], wait_key: str, log_size: int = 1024) -> None:
+        node_ids, edge_pairs = _graph_edge_pairs(graph, any_type=True)
+        edges_raw = graph.get("edges") if isinstance(graph.get("edges"), list) else []
+        self.digest = _graph_digest(node_ids, edge_pairs)
+        self.edge_count = len(edges_raw)
+        self.done_states = frozenset(done_states)
+        self.wait_key = wait_key
+        self._preds: dict[str, dict[str, int]] = {n: {} for n in node_ids}
+        self._succs: dict[str, dict[str, int]] = {n: {} for n in node_ids}
+        for src, dst in edge_pairs:
+            self._preds[dst][src] = self._preds[dst].get(src, 0) + 1
+            self._succs[src][dst] = self._succs[src].get(dst, 0) + 1
+        self.state: dict[str, str] = {}
+        self.pending = {n: len(p) for n, p in self._preds.items()}
+        self.ready: dict[str, bool] = {}
+        self.blocked: dict[str, bool] = {}
+        self.blocks: dict[str, dict[str, Any]] = {}
+        self._signatures: dict[str, Any] = {}
+        self._specs: dict[str, dict[str, Any] | None] = {}
+        self._waiters: dict[str, set[str]] = {}
+        self._expiries: list[tuple[float, str]] = []
+        self._primed = False
+        self.stamp: Any = None
+        self.seq = 0
+        self.log: deque[tuple[int, dict[str, Any]]] = deque(maxlen=max(1, int(log_size)))
+
+    @property
+    def version(self) -> str:
+        return f"{self.digest:016x}"
+
+    def sync(
+        self,
+        nodes_meta: dict[str, Any],
+        state_by_id: dict[str, str],
+        *,
+        now: float,
+        changed: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Apply node states and block metadata. With `changed`, only those ids are read from the
+        two dicts (which may then hold just those ids); without it every node is diffed."""
+        dirty: set[str] = set() if self._primed else set(self._preds)
+        if changed is None:
+            ids: Iterable[str] = self._preds.keys() | state_by_id.keys() | self.state.keys()
+        else:
+            ids = set(changed)
+        for nid in ids:
+            new_state = state_by_id.get(nid)
+            old_state = self.state.get(nid)
+            if new_state != old_state:
+                if new_state is None:
+                    self.state.pop(nid, None)
+                else:
+                    self.state[nid] = new_state
+                was_done = old_state in self.done_states
+                if was_done != (new_state in self.done_states):
+                    delta = 1 if was_done else -1
+                    for nxt in self._succs.get(nid, ()):
+                        self.pending[nxt] += delta
+                        dirty.add(nxt)
+                dirty.update(self._waiters.get(nid, ()))
+            if nid not in self._preds:
+                continue
+            meta = nodes_meta.get(nid)
+            signature = _block_signature(meta, wait_key=self.wait_key)
+            if nid in self._signatures and signature == self._signatures[nid]:
+                continue
+            self._signatures[nid] = signature
+            old = self._specs.get(nid)
+            if old is not None and old["kind"] == "memory" and old["waiting_for"]:
+                self._waiters.get(old["waiting_for"], set()).discard(nid)
+            spec = _block_spec(meta, wait_key=self.wait_key)
+            self._specs[nid] = spec
+            if spec is not None and spec["kind"] == "memory" and spec["waiting_for"]:
+                self._waiters.setdefault(spec["waiting_for"], set()).add(nid)
+            if spec is not None and spec["kind"] == "time" and spec["until"] is not None:
+                heapq.heappush(self._expiries, (spec["until"], nid))
+            dirty.add(nid)
+        changes = self._evaluate(dirty, now=now)
+        changes.extend(self.advance(now))
+        self._primed = True
+        return changes
+
+    def _ensure(self, nid: str) -> None:
+        if nid not in self._preds:
+            self.digest = (self.digest + hash(("n", nid))) & _DIGEST_MASK
+            self._preds[nid] = {}
+            self._succs[nid] = {}
+            self.pending[nid] = 0
+
+    def add_edge(self, src: str, dst: str, *, now: float) -> list[dict[str, Any]]:
+        self._ensure(src)
+        self._ensure(dst)
+        self.digest = (self.digest + hash(("e", src, dst))) & _DIGEST_MASK
+        self.edge_count += 1
+        if src not in self._preds[dst] and self.state.get(src) not in self.done_states:
+            self.pending[dst] += 1
+        self._preds[dst][src] = self._preds[dst].get(src, 0) + 1
+        self._succs[src][dst] = self._succs[src].get(dst, 0) + 1
+        return self._evaluate({dst}, now=now)
+
+    def remove_edge(self, src: str, dst: str, *, now: float) -> list[dict[str, Any]]:
+        if self._preds.get(dst, {}).get(src, 0) <= 0:
+            return []
+        self.digest = (self.digest - hash(("e", src, dst))) & _DIGEST_MASK
+        self.edge_count -= 1
+        for table, a, b in ((self._preds, dst, src), (self._succs, src, dst)):
+            table[a][b] -= 1
+            if table[a][b] <= 0:
+                del table[a][b]
+        if src not in self._preds[dst] and self.state.get(src) not in self.done_states:
+            self.pending[dst] -= 1
+        return self._evaluate({dst}, now=now)
+
+    def advance(self, now: float) -> list[dict[str, Any]]:
+        """Re-evaluate nodes whose time block expired at or before `now`."""
+        dirty: set[str] = set()
+        while self._expiries and self._expiries[0][0] <= now:
+            until, nid = heapq.heappop(self._expiries)
+            spec = self._specs.get(nid)
+            if spec is not None and spec["kind"] == "time" and spec["until"] == until:
+                dirty.add(nid)
+        return self._evaluate(dirty, now=now)
+
+    def _evaluate(self, dirty: set[str], *, now: float) -> list[dict[str, Any]]:
+        changes: list[dict[str, Any]] = []
+        for nid in sorted(dirty):
+            if nid not in self._preds:
+                continue
+            deps_ready = self.pending[nid] <= 0
+            blocked, info = _block_eval(
+                self._specs.get(nid),
+                now=now,
+                state_by_id=self.state,
+                done_states=self.done_states,
+            )
+            if info:
+                self.blocks[nid] = info
+            else:
+                self.blocks.pop(nid, None)
+            ready = deps_ready and not blocked
+            if ready != self.ready.get(nid) or blocked != self.blocked.get(nid):
+                changes.append(
+                    {"node_id": nid, "ready": ready, "deps_ready": deps_ready, "blocked": blocked, "block": info or None}
+                )
+            self.ready[nid] = ready
+            self.blocked[nid] = blocked
+        if changes and self._primed:
+            self.seq += 1
+            self.log.extend((self.seq, change) for change in changes)
+        return changes if self._primed else []
+
+    def since(self, seq: int) -> list[tuple[int, dict[str, Any]]]:
+        return [(s, change) for s, change in self.log if s > seq]
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            "ready": dict(self.ready),
+            "deps_ready": {nid: count <= 0 for nid, count in self.pending.items()},
+            "blocked": dict(self.blocked),
+            "blocks": {nid: dict(info) for nid, info in self.blocks.items()},
+        }
+
+
+class ReplayEngine:
+    """Prefix-checkpointed replay state for one ordered raw-event sequence.
+
+    Classified events are computed once and reused for every prefix; org/project FSA state is
+    checkpointed every `checkpoint_every` events, so scrubbing to position m replays only the events
+    after the nearest checkpoint. Non-incremental artifacts (profiles, discourse) are derived at the
+    same stride (`derived_at`) and kept in a small LRU, so scrubbing within a stride reuses them.
+    Every accessor returns copies; checkpointed and memoised state is never handed out.
+    """
+
+    def __init__(
+        self,
+        *,
+        org_id: str,
+        raw_events: list[dict[str, Any]],
+        version: str,
+        checkpoint_every: int = REPLAY_CHECKPOINT_EVERY,
+        memo_size: int = 32,
+    ) -> None:
+        self.org_id = org_id
+        self.raw_events = raw_events
+        self.version = version
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.classified: list[dict[str, Any]] = []
+        self.timeline: list[dict[str, Any]] | None = None
+        self._lock = threading.RLock()
+        self._checkpoints: dict[int, tuple[Any, dict[str, Any]]] = {0: (None, {})}
+        self._checkpoint_keys: list[int] = [0]
+        self._memo: OrderedDict[Any, Any] = OrderedDict()
+        self._memo_size = max(1, int(memo_size))
+
+    def _classify_upto(self, m: int, enrich: Any) -> list[dict[str, Any]]:
+        while len(self.classified) < m:
+            self.classified.append(enrich(self.raw_events[len(self.classified)]))
+        return self.classified
+
+    def classified_prefix(self, m: int, enrich: Any) -> list[dict[str, Any]]:
+        with self._lock:
+            return copy.deepcopy(self._classify_upto(m, enrich)[:m])
+
+    def derived_at(self, m: int) -> int:
+        """Prefix length that non-incremental artifacts for position `m` are built from: the FSA
+        checkpoint at or below `m`, except inside the first stride and at the end of the sequence."""
+        m = max(0, min(int(m), len(self.raw_events)))
+        if m < self.checkpoint_every or m == len(self.raw_events):
+            return m
+        return m - m % self.checkpoint_every
+
+    def _apply(self, org_state: Any, project_states: dict[str, Any], raw: dict[str, Any], classified: dict[str, Any]) -> Any:
+        action = str(classified.get("action") or raw.get("event_type") or "")
+        if not action:
+            return org_state
+        ts = str(raw.get("timestamp") or "") or None
+        eid = str(raw.get("event_id") or "") or None
+        uid = str(raw.get("user_id") or "") or None
+        org_state = apply_org_fsa_event(
+            org_state,
+            org_id=self.org_id,
+            action=action,
+            context={"event_data": raw.get("event_data") or {}},
+            event_id=eid,
+            user_id=uid,
+            timestamp=ts,
+        )
+        project_id = raw.get("project_id")
+        if isinstance(project_id, str) and project_id:
+            project_states[project_id] = apply_project_fsa_event(
+                project_states.get(project_id),
+                org_id=self.org_id,
+                project_id=project_id,
+                action=action,
+                context={"event_data": raw.get("event_data") or {}},
+                event_id=eid,
+                user_id=uid,
+                timestamp=ts,
+            )
+        return org_state
+
+    def fsa_at(self, m: int, enrich: Any) -> tuple[Any, dict[str, Any]]:
+        """Org FSA state and per-project FSA states after the first `m` events."""
+        with self._lock:
+            classified = self._classify_upto(m, enrich)
+            start = self._checkpoint_keys[bisect.bisect_right(self._checkpoint_keys, m) - 1]
+            org_state, project_states = copy.deepcopy(self._checkpoints[start])
+            for i in range(start, m):
+                org_state = self._apply(org_state, project_states, self.raw_events[i], classified[i])
+                if (i + 1) % self.checkpoint_every == 0 and (i + 1) not in self._checkpoints:
+                    self._checkpoints[i + 1] = copy.deepcopy((org_state, project_states))
+                    bisect.insort(self._checkpoint_keys, i + 1)
+            return org_state, project_states
+
+    def memo(self, key: Any, build: Any) -> Any:
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return copy.deepcopy(self._memo[key])
+        value = build()
+        with self._lock:
+            self._memo[key] = value
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return copy.deepcopy(value)
+
+
+class _EventLogSegment:
+    """One segment: a memory-mapped file per column plus a JSON-lines payload file.
+
+    `header.u64` holds `[rows, capacity]`, so a segment reopens at the size it was written with
+    whatever `segment_rows` the log is opened with later; `capacity` only sizes new segments.
+    """
+
+    def __init__(self, path: Path, *, capacity: int, columns: dict[str, str]) -> None:
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        self._files: list[Any] = []
+        self._maps: list[mmap.mmap] = []
+        header_path = path / "header.u64"
+        rows = 0
+        if header_path.exists():
+            stored = struct.unpack("QQ", header_path.read_bytes()[:16].ljust(16, b"\0"))
+            rows, capacity = stored[0], stored[1] or capacity
+        elif (path / "ts.col").exists():
+            # Written before the header existed: the column files are sized to the capacity.
+            capacity = (path / "ts.col").stat().st_size // struct.calcsize(columns["ts"])
+            if (path / "rows.u64").exists():
+                rows = struct.unpack("Q", (path / "rows.u64").read_bytes()[:8].ljust(8, b"\0"))[0]
+        self.capacity = max(1, int(capacity))
+        self._header = self._map(header_path, 16).cast("Q")
+        self._header[1] = self.capacity
+        self._header[0] = min(int(rows), self.capacity)
+        self.columns: dict[str, memoryview] = {}
+        for name, fmt in columns.items():
+            self.columns[name] = self._map(path / f"{name}.col", self.capacity * struct.calcsize(fmt)).cast(fmt)
+        self._payload_path = path / "payload.jsonl"
+        self._payload_out = open(self._payload_path, "ab")
+        self._payload_in = open(self._payload_path, "rb")
+
+    def _map(self, file_path: Path, size: int) -> memoryview:
+        if not file_path.exists() or file_path.stat().st_size < size:
+            with open(file_path, "ab") as fh:
+                fh.truncate(size)
+        fh = open(file_path, "r+b")
+        mm = mmap.mmap(fh.fileno(), size)
+        self._files.append(fh)
+        self._maps.append(mm)
+        return memoryview(mm)
+
+    @property
+    def rows(self) -> int:
+        return int(self._header[0])
+
+    @property
+    def full(self) -> bool:
+        return self.rows >= self.capacity
+
+    def append(self, values: dict[str, Any], payload: bytes) -> int:
+        row = self.rows
+        offset = self._payload_out.tell()
+        self._payload_out.write(payload)
+        self._payload_out.write(b"\n")
+        self._payload_out.flush()
+        for name, value in values.items():
+            self.columns[name][row] = value
+        self.columns["payload_off"][row] = offset
+        self.columns["payload_len"][row] = len(payload)
+        # Publish the row only after every column is written.
+        self._header[0] = row + 1
+        return row
+
+    def payload(self, row: int) -> dict[str, Any]:
+        self._payload_in.seek(int(self.columns["payload_off"][row]))
+        return json.loads(self._payload_in.read(int(self.columns["payload_len"][row])))
+
+    def close(self) -> None:
+        for name in list(self.columns):
+            self.columns[name].release()
+        self.columns.clear()
+        self._header.release()
+        for mm in self._maps:
+            mm.close()
+        for fh in self._files:
+            fh.close()
+        self._payload_out.close()
+        self._payload_in.close()
+
+
+class ColumnarEventLog:
+    """Append-only, segmented, memory-mapped columnar event log.
+
+    Fixed-width columns hold timestamps (epoch seconds), interned scope ids, context blocks and
+    animal states; full event payloads go to a per-segment JSON-lines side file. `column()` returns
+    memoryviews over the maps (zero-copy), and reopening a directory just maps existing segments.
+
+    Event ids are not interned: the `event` column holds a 64-bit digest, and the live row of each
+    digest sits in sorted numpy arrays (16 bytes per event) plus a small dict of recent appends, so
+    the resident cost of the log does not grow with payload size. Re-appending an event_id
+    tombstones the earlier row (`dead` column), so every id has at most one live row.
+    """
+
+    COLUMNS: dict[str, str] = {
+        "ts": "d",
+        "event": "Q",
+        "org": "I",
+        "user": "I",
+        "team": "I",
+        "project": "I",
+        "context_block": "I",
+        "animal": "b",
+        "payload_off": "Q",
+        "payload_len": "I",
+        "dead": "b",
+    }
+    ID_FIELDS: dict[str, str] = {
+        "org": "org_id",
+        "user": "user_id",
+        "team": "team_id",
+        "project": "project_id",
+    }
+    LIVE_MERGE_EVERY = 4096
+
+    def __init__(self, root: str | Path, *, segment_rows: int = EVENT_LOG_SEGMENT_ROWS) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_rows = max(1, int(segment_rows))
+        self._lock = threading.RLock()
+        self._open()
+
+    @staticmethod
+    def _event_key(value: Any) -> int:
+        """Stable nonzero 64-bit digest of an event id (0 means "no id")."""
+        if not isinstance(value, str) or not value:
+            return 0
+        return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little") or 1
+
+    def _open(self) -> None:
+        import numpy as np
+
+        self._strings: list[str] = [""]
+        self._string_ids: dict[str, int] = {"": 0}
+        strings_path = self.root / "strings.jsonl"
+        if strings_path.exists():
+            with open(strings_path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        value = str(json.loads(line))
+                        self._string_ids.setdefault(value, len(self._strings))
+                        self._strings.append(value)
+        self._strings_out = open(strings_path, "a", encoding="utf-8")
+
+        self._segments: list[_EventLogSegment] = []
+        self._bases: list[int] = []
+        for seg_path in sorted(p for p in self.root.glob("seg-*") if p.is_dir()):
+            self._add_segment(_EventLogSegment(seg_path, capacity=self.segment_rows, columns=self.COLUMNS))
+        if not self._segments:
+            self._new_segment()
+
+        # Live row of each event digest, packed as `segment << 40 | row`.
+        keys: list[Any] = []
+        locs: list[Any] = []
+        for i, seg in enumerate(self._segments):
+            n = seg.rows
+            events = np.asarray(seg.columns["event"][:n])
+            rows = np.flatnonzero((events != 0) & (np.asarray(seg.columns["dead"][:n]) == 0))
+            keys.append(events[rows])
+            locs.append((np.int64(i) << 40) | rows.astype(np.int64))
+        self._live_keys = np.zeros(0, dtype=np.uint64)
+        self._live_locs = np.zeros(0, dtype=np.int64)
+        self._live_recent: dict[int, int] = {}
+        self._merge_live(np.concatenate(keys).astype(np.uint64), np.concatenate(locs).astype(np.int64))
+
+    def _merge_live(self, keys: Any, locs: Any) -> None:
+        """Fold `keys -> locs` into the sorted live arrays; later entries win on duplicate keys."""
+        import numpy as np
+
+        keys = np.concatenate([self._live_keys, keys])
+        locs = np.concatenate([self._live_locs, locs])
+        order = np.argsort(keys, kind="stable")
+        keys, locs = keys[order], locs[order]
+        keep = np.append(keys[1:] != keys[:-1], True) if keys.size else np.zeros(0, dtype=bool)
+        self._live_keys, self._live_locs = keys[keep], locs[keep]
+
+    def _live_get(self, key: int) -> int | None:
+        loc = self._live_recent.get(key)
+        if loc is not None:
+            return loc
+        import numpy as np
+
+        i = int(np.searchsorted(self._live_keys, np.uint64(key)))
+        if i < self._live_keys.size and int(self._live_keys[i]) == key:
+            return int(self._live_locs[i])
+        return None
+
+    def _live_put(self, key: int, loc: int) -> None:
+        self._live_recent[key] = loc
+        if len(self._live_recent) >= self.LIVE_MERGE_EVERY:
+            import numpy as np
+
+            recent, self._live_recent = self._live_recent, {}
+            self._merge_live(
+                np.fromiter(recent.keys(), dtype=np.uint64, count=len(recent)),
+                np.fromiter(recent.values(), dtype=np.int64, count=len(recent)),
+            )
+
+    def _add_segment(self, seg: _EventLogSegment) -> _EventLogSegment:
+        self._bases.append(self._bases[-1] + self._segments[-1].capacity if self._segments else 0)
+        self._segments.append(seg)
+        return seg
+
+    def _new_segment(self) -> _EventLogSegment:
+        return self._add_segment(
+            _EventLogSegment(
+                self.root / f"seg-{len(self._segments):06d}",
+                capacity=self.segment_rows,
+                columns=self.COLUMNS,
+            )
+        )
+
+    def _intern(self, value: Any) -> int:
+        if not isinstance(value, str) or not value:
+            return 0
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = sid
+            self._strings_out.write(json.dumps(value, ensure_ascii=True) + "\n")
+            self._strings_out.flush()
+        return sid
+
+    def lookup(self, value: Any) -> int | None:
+        """Interned id for `value` without interning it (None if never seen)."""
+        if not isinstance(value, str) or not value:
+            return None
+        return self._string_ids.get(value)
+
+    def string(self, sid: int) -> str:
+        return self._strings[int(sid)] if 0 <= int(sid) < len(self._strings) else ""
+
+    def __len__(self) -> int:
+        return sum(seg.rows for seg in self._segments)
+
+    def append(
+        self,
+        event: dict[str, Any],
+        *,
+        context_block: str | None = None,
+        animal_state: int | None = None,
+    ) -> int:
+        ts = float("nan")
+        raw_ts = event.get("timestamp")
+        if isinstance(raw_ts, str) and raw_ts:
+            try:
+                ts = parse_iso8601(raw_ts).timestamp()
+            except Exception:
+                ts = float("nan")
+        payload = json.dumps(event, separators=(",", ":"), ensure_ascii=True, default=str).encode("utf-8")
+        key = self._event_key(event.get("event_id"))
+        with self._lock:
+            values: dict[str, Any] = {"ts": ts, "event": key}
+            for col, field in self.ID_FIELDS.items():
+                values[col] = self._intern(event.get(field))
+            values["context_block"] = self._intern(str(context_block or "").strip().lower() or None)
+            values["animal"] = int(animal_state) if isinstance(animal_state, int) and -128 <= animal_state < 128 else -1
+            prev = self._live_get(key) if key else None
+            seg = self._segments[-1]
+            if seg.full:
+                seg = self._new_segment()
+            row = seg.append(values, payload)
+            if prev is not None:
+                self._segments[prev >> 40].columns["dead"][prev & ((1 << 40) - 1)] = 1
+            seg_index = len(self._segments) - 1
+            if key:
+                self._live_put(key, (seg_index << 40) | row)
+            return self._bases[seg_index] + row
+
+    def column(self, name: str) -> list[memoryview]:
+        """Zero-copy views of one column, one memoryview per segment (trimmed to written rows)."""
+        return [seg.columns[name][: seg.rows] for seg in self._segments]
+
+    def _match(self, *, limit: int | None = None, **filters: Any) -> list[tuple[_EventLogSegment, Any]]:
+        """Live rows matching id filters, per segment in append order (the newest `limit` if given).
+
+        Filters compare whole column views with numpy, so a query is a vectorized pass per segment.
+        """
+        import numpy as np
+
+        wanted: list[tuple[str, Any]] = []
+        for col, field in self.ID_FIELDS.items():
+            value = filters.get(field)
+            if value is None:
+                continue
+            sid = self.lookup(value)
+            if sid is None:
+                return []
+            wanted.append((col, sid))
+        if filters.get("event_id") is not None:
+            wanted.append(("event", np.uint64(self._event_key(filters["event_id"]))))
+        out: list[tuple[_EventLogSegment, Any]] = []
+        for seg in list(self._segments):
+            n = seg.rows
+            if not n:
+                continue
+            mask = np.asarray(seg.columns["dead"][:n]) == 0
+            for col, sid in wanted:
+                mask &= np.asarray(seg.columns[col][:n]) == sid
+            rows = np.flatnonzero(mask)
+            if rows.size:
+                out.append((seg, rows))
+        if limit is not None:
+            remaining = max(0, int(limit))
+            trimmed: list[tuple[_EventLogSegment, Any]] = []
+            for seg, rows in reversed(out):
+                if remaining <= 0:
+                    break
+                rows = rows[-remaining:]
+                remaining -= int(rows.size)
+                trimmed.append((seg, rows))
+            out = trimmed[::-1]
+        return out
+
+    def events(self, *, limit: int | None = None, **filters: Any) -> list[dict[str, Any]]:
+        """Decode payloads matching id filters (org_id/user_id/team_id/project_id) in append order."""
+        with self._lock:
+            return [seg.payload(int(row)) for seg, rows in self._match(limit=limit, **filters) for row in rows]
+
+    def block_inputs(self, *, limit: int | None = None, **filters: Any) -> list[tuple[str, int] | dict[str, Any]]:
+        """Matching rows in append order: `(context_block, animal_state)` read from the columns, or the
+        decoded payload for rows logged without a state (left for the caller to classify)."""
+        import numpy as np
+
+        with self._lock:
+            out: list[tuple[str, int] | dict[str, Any]] = []
+            for seg, rows in self._match(limit=limit, **filters):
+                states = np.asarray(seg.columns["animal"])[rows]
+                blocks = np.asarray(seg.columns["context_block"])[rows]
+                for row, state, block in zip(rows.tolist(), states.tolist(), blocks.tolist()):
+                    if state >= 0 and block:
+                        out.append((self._strings[block], state))
+                    else:
+                        out.append(seg.payload(row))
+            return out
+
+    def block_states(self, **filters: Any) -> list[tuple[str, int]]:
+        """`(context_block, animal_state)` pairs read straight from the fixed-width columns."""
+        return [item for item in self.block_inputs(**filters) if isinstance(item, tuple)]
+
+    def state_sequence(self, *, exclude_event_id: str | None = None, **filters: Any) -> list[tuple[str, float, int]]:
+        """`(user_id, ts, animal_state)` for matching rows with a user and a state, in timestamp order.
+
+        Read from the columns only (no payload decode); untimed rows sort last in append order.
+        """
+        import numpy as np
+
+        skip = np.uint64(self._event_key(exclude_event_id))
+        with self._lock:
+            users: list[Any] = []
+            stamps: list[Any] = []
+            states: list[Any] = []
+            for seg, rows in self._match(**filters):
+                keep = rows[
+                    (np.asarray(seg.columns["animal"])[rows] >= 0)
+                    & (np.asarray(seg.columns["user"])[rows] != 0)
+                    & (np.asarray(seg.columns["event"])[rows] != skip if skip else True)
+                ]
+                users.append(np.asarray(seg.columns["user"])[keep])
+                stamps.append(np.asarray(seg.columns["ts"])[keep])
+                states.append(np.asarray(seg.columns["animal"])[keep])
+            if not users:
+                return []
+            user_ids, ts, animal = np.concatenate(users), np.concatenate(stamps), np.concatenate(states)
+            order = np.argsort(np.where(np.isnan(ts), np.inf, ts), kind="stable")
+            return [
+                (self._strings[u], t, s)
+                for u, t, s in zip(user_ids[order].tolist(), ts[order].tolist(), animal[order].tolist())
+            ]
+
+    def time_range(self) -> tuple[float, float] | None:
+        import numpy as np
+
+        lo, hi = math.inf, -math.inf
+        with self._lock:
+            for seg in self._segments:
+                n = seg.rows
+                if not n:
+                    continue
+                ts = np.asarray(seg.columns["ts"][:n])
+                ts = ts[(np.asarray(seg.columns["dead"][:n]) == 0) & ~np.isnan(ts)]
+                if ts.size:
+                    lo = min(lo, float(ts.min()))
+                    hi = max(hi, float(ts.max()))
+        return (lo, hi) if lo <= hi else None
+
+    def close(self) -> None:
+        with self._lock:
+            for seg in self._segments:
+                seg.close()
+            self._segments.clear()
+            self._strings_out.close()
+
+    def clear(self) -> None:
+        """Drop every segment and the string table, leaving an empty log in the same directory."""
+        with self._lock:
+            paths = [seg.path for seg in self._segments]
+            self.close()
+            for path in paths:
+                for child in path.iterdir():
+                    child.unlink()
+                path.rmdir()
+            (self.root / "strings.jsonl").unlink(missing_ok=True)
+            self._open()
+
+
+class StoreQueryStats:
+    """Per-method call counts and latencies for store queries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, list[float]] = {}
+
+    def record(self, method: str, seconds: float) -> None:
+        with self._lock:
+            row = self._stats.setdefault(method, [0.0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += float(seconds)
+            row[2] = max(row[2], float(seconds))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                method: {
+                    "count": int(count),
+                    "total_ms": total * 1000.0,
+                    "mean_ms": (total / count) * 1000.0 if count else 0.0,
+                    "max_ms": peak * 1000.0,
+                }
+                for method, (count, total, peak) in sorted(self._stats.items())
+            }
+
+
+class CacheStats:
+    """Thread-safe counters for an in-process cache (hits, misses and free-form tallies)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + int(n)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            out: dict[str, Any] = dict(sorted(self._counts.items()))
+        lookups = int(out.get("hits", 0)) + int(out.get("misses", 0))
+        out["hit_rate"] = (int(out.get("hits", 0)) / lookups) if lookups else 0.0
+        return out
+
+
+class ByteBoundedLRU:
+    """LRU mapping bounded by the approximate byte size of its values."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: Any, *, size: int) -> None:
+        size = max(1, int(size))
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[0]
+            if size > self.max_bytes:
+                return
+            self._items[key] = (size, value)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and self._items:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self.nbytes -= evicted
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+def _card_similarity_stats(cards: list[dict[str, Any]], insights: list[dict[str, Any]]) -> dict[str, Any]:
+    """Card coherence from stacked, L2-normalized embeddings.
+
+    Intra: mean cosine between each card centroid and its insights' embeddings (row-wise dot of
+    gathered rows). Inter: mean over the upper triangle of the centroid Gram matrix, taken as
+    (|sum c|^2 - sum |c|^2) / 2 so the k x k matrix is never materialized.
+    """
+    import numpy as np
+
+    by_insight = {str(i.get("insight_id")): i for i in insights if isinstance(i.get("insight_id"), str)}
+    centroids: list[list[float]] = []
+    card_sizes: list[int] = []
+    pair_card: list[int] = []
+    pair_emb: list[list[float]] = []
+    for card in cards:
+        centroid = card.get("embedding")
+        if not isinstance(centroid, list) or not centroid:
+            continue
+        ids = card.get("insight_ids") if isinstance(card.get("insight_ids"), list) else []
+        ids = [str(x) for x in ids if isinstance(x, str)]
+        card_sizes.append(len(ids))
+        for iid in ids:
+            ins = by_insight.get(iid)
+            emb = ins.get("embedding") if isinstance(ins, dict) else None
+            if isinstance(emb, list) and emb:
+                pair_card.append(len(centroids))
+                pair_emb.append(emb)
+        centroids.append(centroid)
+
+    dims = {len(v) for v in centroids} | {len(v) for v in pair_emb}
+    if len(dims) > 1:
+        # Mixed embedding widths: fall back to the pairwise reference implementation.
+        intra = [float(cosine_similarity(centroids[c], e)) for c, e in zip(pair_card, pair_emb)]
+        inter = [
+            float(cosine_similarity(centroids[i], centroids[j]))
+            for i in range(len(centroids))
+            for j in range(i + 1, len(centroids))
+        ]
+        return {
+            "card_sizes": card_sizes,
+            "intra_similarity_mean": float(sum(intra) / len(intra)) if intra else 0.0,
+            "inter_similarity_mean": float(sum(inter) / len(inter)) if inter else 0.0,
+        }
+
+    def _normalized(rows: list[list[float]]) -> Any:
+        m = np.asarray(rows, dtype=np.float64)
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+    intra_mean = 0.0
+    inter_mean = 0.0
+    if centroids:
+        c = _normalized(centroids)
+        if pair_emb:
+            e = _normalized(pair_emb)
+            intra_mean = float(np.einsum("ij,ij->i", c[np.asarray(pair_card)], e).mean())
+        k = c.shape[0]
+        if k > 1:
+            total = c.sum(axis=0)
+            upper = (float(total @ total) - float(np.einsum("ij,ij->", c, c))) / 2.0
+            inter_mean = upper / (k * (k - 1) / 2)
+    return {"card_sizes": card_sizes, "intra_similarity_mean": intra_mean, "inter_similarity_mean": inter_mean}
+
+
+def _paper_report_sections(report: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Split a finished paper report into NDJSON-sized records, consuming it as it goes.
+
+    `metadata` comes out first and every other section follows in the order the report builder
+    wrote its keys, so new sections stream without a hand-kept list. List and mapping sections are
+    emitted one entry per record, and each section is popped from `report` once emitted so the
+    caller's copy shrinks while the response streams.
+    """
+    names = sorted(report, key=lambda k: k != "metadata")
+    for name in names:
+        value = report.pop(name)
+        if isinstance(value, list) and value:
+            for i, item in enumerate(value):
+                yield {"section": name, "index": i, "count": len(value), "data": item}
+        elif isinstance(value, dict) and value and name != "metadata":
+            for key, item in value.items():
+                yield {"section": name, "key": key, "data": item}
+        else:
+            yield {"section": name, "data": value}
+        del value
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1, *, timeout: float | None = None) -> bool:
+        """Block until `n` tokens are available; False when `timeout` elapses first."""
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + max(0.0, float(timeout))
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(float(self.burst), self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return True
+                wait = (n - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class ClassificationExecutor:
+    """Micro-batching front end for LLM-backed classification.
+
+    Requests with `llm_mode` other than "off" are queued; a dispatcher thread groups up to
+    `batch_size` of them (waiting at most `batch_wait_s` for the batch to fill) and hands each
+    batch to a bounded worker pool. Every model request takes one token from the rate limiter.
+    Callers that wait longer than `timeout_s` get the heuristic (`llm_mode="off"`) result instead;
+    the `*_status` variants flag those fallbacks so caches can skip them.
+
+    `stub_latency_s` replaces the model with the heuristic classifier plus a fixed per-request
+    delay, so batching/pooling can be benchmarked without network access.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = LLM_WORKERS,
+        batch_size: int = LLM_BATCH_SIZE,
+        batch_wait_s: float = LLM_BATCH_WAIT_MS / 1000.0,
+        rate_per_s: float = LLM_RATE_PER_S,
+        burst: int = LLM_RATE_BURST,
+        timeout_s: float = LLM_TIMEOUT_S,
+        stub_latency_s: float | None = None,
+        stats: CacheStats | None = None,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.batch_wait_s = max(0.0, float(batch_wait_s))
+        self.timeout_s = max(0.0, float(timeout_s))
+        self.stub_latency_s = stub_latency_s
+        self.bucket = TokenBucket(rate_per_s, burst)
+        self.stats = stats or CacheStats()
+        self._queue: queue.Queue[tuple[str, dict[str, Any], Future]] = queue.Queue()
+        self._dispatcher: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="llm-classify")
+            self._dispatcher = threading.Thread(
+                target=self._dispatch,
+                args=(pool,),
+                name="llm-classify-dispatch",
+                daemon=True,
+            )
+            self._dispatcher.start()
+
+    def _dispatch(self, pool: ThreadPoolExecutor) -> None:
+        while True:
+            first = self._queue.get()
+            pending: dict[str, list[tuple[dict[str, Any], Future]]] = {first[0]: [(first[1], first[2])]}
+            count = 1
+            deadline = time.monotonic() + self.batch_wait_s
+            while count < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                pending.setdefault(item[0], []).append((item[1], item[2]))
+                count += 1
+            for llm_mode, items in pending.items():
+                if self.stub_latency_s is not None or classify_events is not None:
+                    pool.submit(self._run_batch, llm_mode, items)
+                else:
+                    # No multi-event model call: fan single-event requests out across the pool
+                    # instead of running them back to back on one worker.
+                    for item in items:
+                        pool.submit(self._run_batch, llm_mode, [item])
+
+    def _model(self, raws: list[dict[str, Any]], llm_mode: str) -> list[dict[str, Any]]:
+        if self.stub_latency_s is not None:
+            time.sleep(self.stub_latency_s)
+            return [classify_event(raw, llm_mode="off") for raw in raws]
+        if classify_events is not None and len(raws) > 1:
+            return list(classify_events(raws, llm_mode=llm_mode))
+        return [classify_event(raw, llm_mode=llm_mode) for raw in raws]
+
+    def _run_batch(self, llm_mode: str, items: list[tuple[dict[str, Any], Future]]) -> None:
+        """One model request for `items` (a real batch, or a single event when batching is unavailable)."""
+        live = [(raw, fut) for raw, fut in items if fut.set_running_or_notify_cancel()]
+        if not live:
+            return
+        if not self.bucket.acquire(1, timeout=self.timeout_s):
+            self.stats.incr("rate_limited", len(live))
+            for raw, fut in live:
+                fut.set_exception(FutureTimeoutError("classification rate limit wait exceeded timeout"))
+            return
+        self.stats.incr("model_requests")
+        self.stats.incr("batched_events", len(live))
+        try:
+            results = self._model([raw for raw, _ in live], llm_mode)
+        except Exception as e:  # noqa: BLE001
+            for _, fut in live:
+                fut.set_exception(e)
+            return
+        for (_, fut), classified in zip(live, results):
+            fut.set_result(classified)
+
+    def submit(self, raw: dict[str, Any], *, llm_mode: str) -> Future:
+        self._start()
+        fut: Future = Future()
+        self._queue.put((str(llm_mode), raw, fut))
+        return fut
+
+    def _resolve(self, raw: dict[str, Any], fut: Future, deadline: float) -> tuple[dict[str, Any], bool]:
+        """(classified, is_fallback); timeouts and rate-limit waits fall back to the heuristic result."""
+        try:
+            return fut.result(timeout=max(0.0, deadline - time.monotonic())), False
+        except FutureTimeoutError:
+            fut.cancel()
+            self.stats.incr("fallbacks")
+            return classify_event(raw, llm_mode="off"), True
+
+    def classify_status(self, raw: dict[str, Any], *, llm_mode: str) -> tuple[dict[str, Any], bool]:
+        if str(llm_mode or "off").lower() == "off":
+            return classify_event(raw, llm_mode="off"), False
+        return self._resolve(raw, self.submit(raw, llm_mode=llm_mode), time.monotonic() + self.timeout_s)
+
+    def classify_many_status(self, raws: list[dict[str, Any]], *, llm_mode: str) -> list[tuple[dict[str, Any], bool]]:
+        if str(llm_mode or "off").lower() == "off":
+            return [(classify_event(raw, llm_mode="off"), False) for raw in raws]
+        futures = [self.submit(raw, llm_mode=llm_mode) for raw in raws]
+        deadline = time.monotonic() + self.timeout_s
+        return [self._resolve(raw, fut, deadline) for raw, fut in zip(raws, futures)]
+
+    def classify(self, raw: dict[str, Any], *, llm_mode: str) -> dict[str, Any]:
+        return self.classify_status(raw, llm_mode=llm_mode)[0]
+
+    def classify_many(self, raws: list[dict[str, Any]], *, llm_mode: str) -> list[dict[str, Any]]:
+        return [classified for classified, _ in self.classify_many_status(raws, llm_mode=llm_mode)]
+
+    def summary(self) -> dict[str, Any]:
+        counts = self.stats.summary()
+        counts.pop("hit_rate", None)
+        return {
+            **counts,
+            "queued": self._queue.qsize(),
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "stub": self.stub_latency_s is not None,
+        }
+
+
+class ClassificationCache:
+    """Bounded LRU of `classify_event` results keyed by (event content hash, llm_mode, pipeline_version).
+
+    With a `path`, entries are also written through to a small sqlite table so results survive
+    restarts. Hits refresh an entry's `ts` (batched, flushed with the trim), and every
+    `trim_every` inserts the table is trimmed back to the entry bound, least recently used first,
+    using an index on `ts`. sqlite I/O is serialised by its own lock, so it never blocks
+    memory-only hits.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        *,
+        path: str = "",
+        stats: CacheStats | None = None,
+        executor: ClassificationExecutor | None = None,
+        trim_every: int = 256,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.stats = stats or CacheStats()
+        self.executor = executor
+        self.trim_every = max(1, int(trim_every))
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._items: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._touched: dict[str, float] = {}
+        self._inserts = 0
+        self._db: Any = None
+        if path:
+            try:
+                import sqlite3
+
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS classified (key TEXT PRIMARY KEY, value TEXT NOT NULL, ts REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS classified_ts ON classified (ts)")
+                self._db.commit()
+            except Exception:
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def key(raw: dict[str, Any], *, llm_mode: str, pipeline_version: str) -> str:
+        body = json.dumps(raw, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{pipeline_version}|{str(llm_mode or 'off').lower()}|{digest}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is not None:
+                self._items.move_to_end(key)
+                if self._db is not None:
+                    self._touched[key] = time.time()
+                self.stats.incr("hits")
+                self.stats.incr("memory_hits")
+                return copy.deepcopy(hit)
+        row = None
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    row = self._db.execute("SELECT value FROM classified WHERE key = ?", (key,)).fetchone()
+            except Exception:
+                row = None
+        if row is None:
+            self.stats.incr("misses")
+            return None
+        hit = json.loads(row[0])
+        with self._lock:
+            self._remember(key, hit)
+            self._touched[key] = time.time()
+        self.stats.incr("hits")
+        self.stats.incr("disk_hits")
+        return copy.deepcopy(hit)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries <= 0 or not isinstance(value, dict):
+            return
+        value = copy.deepcopy(value)
+        touched: dict[str, float] | None = None
+        with self._lock:
+            self._remember(key, value)
+            if self._db is None:
+                return
+            self._touched.pop(key, None)
+            self._inserts += 1
+            if self._inserts % self.trim_every == 0:
+                touched, self._touched = self._touched, {}
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO classified (key, value, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, default=str), time.time()),
+                )
+                if touched is not None:
+                    self._trim(touched)
+                self._db.commit()
         except Exception:
             pass
-    primary_state_space = os.getenv("TRACKA_PRIMARY_STATE_SPACE")
-    if primary_state_space:
-        cfg["primary_state_space"] = str(primary_state_space)
-    secondary_state_spaces = os.getenv("TRACKA_SECONDARY_STATE_SPACES")
-    if secondary_state_spaces:
-        cfg["secondary_state_spaces"] = str(secondary_state_spaces)
-    return cfg
 
+    def _trim(self, touched: dict[str, float]) -> None:
+        """Flush batched hit timestamps, then drop everything past the newest `max_entries` rows (hold _db_lock)."""
+        if touched:
+            self._db.executemany(
+                "UPDATE classified SET ts = ? WHERE key = ?",
+                [(ts, key) for key, ts in touched.items()],
+            )
+        self._db.execute(
+            "DELETE FROM classified WHERE key IN "
+            "(SELECT key FROM classified ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
 
-def _hypergraph_refine_enabled() -> bool:
-    return str(HYPERGRAPH_REFINE_MODE or "off").strip().lower() in {"1", "true", "on", "yes"}
+    def _remember(self, key: str, value: dict[str, Any]) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+            self.stats.incr("evictions")
+
+    def classify(self, raw: dict[str, Any], *, llm_mode: str, pipeline_version: str = PIPELINE_VERSION) -> dict[str, Any]:
+        key = self.key(raw, llm_mode=llm_mode, pipeline_version=pipeline_version)
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+        fallback = False
+        if self.executor is not None:
+            classified, fallback = self.executor.classify_status(raw, llm_mode=llm_mode)
+        else:
+            classified = classify_event(raw, llm_mode=llm_mode)
+        if not fallback:
+            # A heuristic stand-in must not be cached under the auto/required key.
+            self.put(key, classified)
+        return classified
+
+    def classify_many(
+        self,
+        raws: list[dict[str, Any]],
+        *,
+        llm_mode: str,
+        pipeline_version: str = PIPELINE_VERSION,
+    ) -> list[dict[str, Any]]:
+        keys = [self.key(raw, llm_mode=llm_mode, pipeline_version=pipeline_version) for raw in raws]
+        out: list[dict[str, Any] | None] = [self.get(k) for k in keys]
+        missing = [i for i, hit in enumerate(out) if hit is None]
+        if missing:
+            miss_raws = [raws[i] for i in missing]
+            if self.executor is not None:
+                fresh = self.executor.classify_many_status(miss_raws, llm_mode=llm_mode)
+            else:
+                fresh = [(classify_event(raw, llm_mode=llm_mode), False) for raw in miss_raws]
+            for i, (classified, fallback) in zip(missing, fresh):
+                if not fallback:
+                    self.put(keys[i], classified)
+                out[i] = classified
+        return [c for c in out if c is not None]
+
+    def summary(self) -> dict[str, Any]:
+        return {**self.stats.summary(), "entries": len(self), "max_entries": self.max_entries, "persistent": self._db is not None}
+
+    def prometheus_lines(self) -> str:
+        counts = self.stats.summary()
+        return (
+            "# TYPE intelligence_classification_cache_hits_total counter\n"
+            f"intelligence_classification_cache_hits_total {int(counts.get('hits', 0))}\n"
+            "# TYPE intelligence_classification_cache_misses_total counter\n"
+            f"intelligence_classification_cache_misses_total {int(counts.get('misses', 0))}\n"
+            "# TYPE intelligence_classification_cache_entries gauge\n"
+            f"intelligence_classification_cache_entries {len(self)}\n"
+        )
 
 
-def _maybe_refine_hypergraph(hg: Any) -> Any:
-    if not _hypergraph_refine_enabled():
-        return hg
-    try:
-        dims = max(4, int(HYPERGRAPH_REFINE_DIMS))
-    except Exception:
-        dims = 64
-    try:
-        retain = float(HYPERGRAPH_REFINE_RETAIN)
-    except Exception:
-        retain = 0.7
-    try:
-        return refine_hypergraph_weights(hg, dims=dims, retain_weight=retain)
-    except Exception:
-        return hg
+class TimedStore:
+    """Store proxy that times every public method call into the monitoring collector."""
 
+    def __init__(self, inner: Any, *, stats: StoreQueryStats) -> None:
+        self.wrapped = inner
+        self._stats = stats
+        self._methods: dict[str, Any] = {}
 
-def build_user_profile(
-    user_id: str,
-    org_id: str,
-    events: list[dict[str, Any]],
-    existing_profile: dict[str, Any] | None = None,
-    *,
-    psychodynamics_config: dict[str, Any] | None = None,
-) -> dict[str, Any]:
-    cfg = _psychodynamics_config()
-    if isinstance(psychodynamics_config, dict):
-        cfg.update(psychodynamics_config)
-    return _build_user_profile_base(
-        user_id,
-        org_id,
-        events,
-        existing_profile,
-        psychodynamics_config=cfg,
-    )
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.wrapped, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        timed = self._methods.get(name)
+        if timed is None:
+            if inspect.iscoroutinefunction(attr):
 
+                @wraps(attr)
+                async def timed(*args: Any, **kwargs: Any) -> Any:
+                    start = time.perf_counter()
+                    try:
+                        with LatencyTracker(f"store.{name}"):
+                            return await attr(*args, **kwargs)
+                    finally:
+                        self._stats.record(name, time.perf_counter() - start)
 
-def build_team_profile(
-    team_id: str,
-    org_id: str,
-    member_profiles: list[dict[str, Any]],
-    team_events: list[dict[str, Any]],
-    existing_profile: dict[str, Any] | None = None,
-    *,
-    psychodynamics_config: dict[str, Any] | None = None,
-) -> dict[str, Any]:
-    cfg = _psychodynamics_config()
-    if isinstance(psychodynamics_config, dict):
-        cfg.update(psychodynamics_config)
-    return _build_team_profile_base(
-        team_id,
-        org_id,
-        member_profiles,
-        team_events,
-        existing_profile,
-        psychodynamics_config=cfg,
-    )
+            else:
 
+                @wraps(attr)
+                def timed(*args: Any, **kwargs: Any) -> Any:
+                    start = time.perf_counter()
+                    try:
+                        with LatencyTracker(f"store.{name}"):
+                            return attr(*args, **kwargs)
+                    finally:
+                        self._stats.record(name, time.perf_counter() - start)
 
-def _recompute_block_matrices_for_scope(
-    *,
-    store: Any,
-    events: list[dict[str, Any]],
-    org_id: str,
-    scope_type: str,
-    scope_id: str,
-    pipeline_version: str,
-) -> list[dict[str, Any]]:
-    records_by_ctx: dict[str, dict[str, Any]] = {}
-    mode = str(ANIMAL_CLASSIFIER_MODE or "heuristic")
-    steiner_model = _load_steiner_model()
+            self._methods[name] = timed
+        return timed
 
-    for event in events:
-        try:
-            ctx_block = str(context_block_from_event(event)).strip().lower()
-        except Exception:
-            continue
 
-        try:
-            animal_state = int(
-                classify_animal_event(
-                    event,
-                    mode=mode,
-                    steiner_model=steiner_model,
-                )
-            )
-        except Exception:
-            continue
+class AsyncStore:
+    """Awaitable view of a store for async handlers.
 
-        prev = records_by_ctx.get(ctx_block)
-        updated = update_online_block_matrix_record(
-            prev,
-            org_id=org_id,
-            scope_type=scope_type,
-            scope_id=scope_id,
-            context_block=ctx_block,
-            pipeline_version=pipeline_version,
-            updated_at=utc_now_iso8601(),
-            new_state=int(animal_state),
-        )
-        records_by_ctx[ctx_block] = updated
+    A store may expose native coroutine variants as `<method>_async` (e.g. backed by asyncpg); those
+    are awaited directly. Everything else runs on a dedicated bounded worker pool so slow queries do
+    not exhaust Starlette's default threadpool.
+    """
 
-    for record in records_by_ctx.values():
-        try:
-            store.upsert_psychodynamic_block_matrix(record)
-        except Exception:
-            pass
+    def __init__(self, inner: Any, *, max_threads: int = STORE_THREAD_LIMIT) -> None:
+        self.wrapped = inner
+        self._max_threads = max(1, int(max_threads))
+        self._limiter: Any = None
 
-    return list(records_by_ctx.values())
+    async def run(self, fn: Any, /, *args: Any, **kwargs: Any) -> Any:
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        import anyio
 
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self._max_threads)
+        return await anyio.to_thread.run_sync(partial(fn, *args, **kwargs), limiter=self._limiter)
 
-def _model_dump(obj: Any) -> dict[str, Any]:
-    if hasattr(obj, "model_dump"):
-        return obj.model_dump()  # type: ignore[no-any-return]
-    return obj.dict()  # type: ignore[no-any-return,attr-defined]
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        native = getattr(self.wrapped, f"{name}_async", None)
+        method = native if inspect.iscoroutinefunction(native) else getattr(self.wrapped, name)
 
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(method, *args, **kwargs)
 
-def _fingerprint_request(payload: dict[str, Any]) -> str:
-    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+        return call
 
 
 def _ensure_memcube_id(prefix: str, object_id: Optional[str] = None) -> str:
@@ -639,6 +3818,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
     """
     try:
         from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+        from fastapi.concurrency import run_in_threadpool
         from fastapi.middleware.cors import CORSMiddleware
         from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
     except Exception as e:  # noqa: BLE001
@@ -650,6 +3830,33 @@ def create_app(*, store: Optional[Any] = None) -> Any:
     enable_debug = str(os.getenv("INTELLIGENCE_ENABLE_UI") or "1").strip().lower() in {"1", "true", "yes"}
     enable_monitoring = str(os.getenv("INTELLIGENCE_ENABLE_MONITORING") or "1").strip().lower() in {"1", "true", "yes"}
     collector = get_global_collector()
+    store_query_stats = StoreQueryStats()
+    feed_cache_stats = CacheStats()
+    feed_lru = ByteBoundedLRU(FEED_LRU_MAX_BYTES)
+    feed_cache_ttls = _parse_ttl_map(FEED_CACHE_TTLS, default=FEED_CACHE_TTL_S)
+    paper_report_stats = CacheStats()
+    paper_report_lru = ByteBoundedLRU(PAPER_REPORT_CACHE_MAX_BYTES)
+    classification_executor = ClassificationExecutor(
+        stub_latency_s=(float(LLM_STUB_LATENCY_MS) / 1000.0) if LLM_STUB_LATENCY_MS else None,
+    )
+    classification_cache = ClassificationCache(
+        CLASSIFY_CACHE_SIZE,
+        path=CLASSIFY_CACHE_PATH,
+        executor=classification_executor,
+    )
+    classify = classification_cache.classify
+
+    def _classifier_kwargs(fn: Any, events: list[dict[str, Any]], *, llm_mode: str) -> dict[str, Any]:
+        """Share the classification cache with a pipeline that classifies its own events.
+
+        The events are classified up front in one `classify_many` call, so misses go out as batched
+        model requests and the results land in the cache ingest and replay read from. Pipelines
+        that accept an injected `classifier` then read every event back from that warm cache.
+        """
+        if not events:
+            return {}
+        classification_cache.classify_many(events, llm_mode=llm_mode)
+        return {"classifier": classify} if _accepts_kwarg(fn, "classifier") else {}
 
     # CORS for the polished Collectium frontend (Vite dev server).
     # Keep defaults dev-friendly while remaining explicit.
@@ -685,6 +3892,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
                     schema = os.getenv("INTELLIGENCE_DB_SCHEMA")
                     store = PostgresStore.from_dsn(dsn, ensure_schema=True, schema=schema)
+                    if enable_monitoring:
+                        store = TimedStore(store, stats=store_query_stats)
                 except Exception as e:  # noqa: BLE001
                     raise RuntimeError(
                         "Failed to initialize Postgres storage; check INTELLIGENCE_DATABASE_URL / DATABASE_URL."
@@ -692,6 +3901,134 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             else:
                 store = InMemoryStore()
 
+    store_name = type(getattr(store, "wrapped", store)).__name__
+    astore = AsyncStore(store)
+    profile_index = ProfileVectorIndex()
+    memcube_index = MemcubeVectorIndex()
+    ux_taxonomy = InterventionTaxonomy()
+    bandit_policies = BanditPolicyRegistry()
+    attribution_cache: OrderedDict[tuple[Any, ...], tuple[float, Any, dict[str, Any]]] = OrderedDict()
+    attribution_lock = threading.Lock()
+    project_activity = ProjectActivityIndex()
+    classified_index = ClassifiedEventIndex()
+    event_log = ColumnarEventLog(EVENT_LOG_DIR) if EVENT_LOG_DIR else None
+
+    def _sync_classified_index() -> bool:
+        """Keep the classified-event index aligned with an in-memory store; False if unavailable.
+
+        Every app write goes through `_record_classified_event`, so drift only comes from rows
+        written, replaced or deleted in the store directly; those are reconciled per event (by row
+        identity, so an in-place replacement is caught even when the count is unchanged).
+        """
+        rows = getattr(store, "events_classified", None)
+        if not isinstance(rows, dict):
+            return False
+        classified_index.reconcile(rows)
+        return True
+
+    def _record_classified_event(classified: dict[str, Any]) -> None:
+        store.upsert_event_classified(classified)
+        rows = getattr(store, "events_classified", None)
+        if isinstance(rows, dict):
+            # Only the in-memory store reads through the index; others would just leak a copy.
+            # Index the stored row itself so `reconcile` sees it as unchanged.
+            stored = rows.get(classified.get("event_id"))
+            classified_index.add(stored if isinstance(stored, dict) else classified)
+        if event_log is not None:
+            ctx = classified.get("context") if isinstance(classified.get("context"), dict) else {}
+            animal_state = ctx.get("animal_state")
+            try:
+                event_log.append(
+                    classified,
+                    context_block=ctx.get("context_block") if isinstance(ctx.get("context_block"), str) else None,
+                    animal_state=int(animal_state) if isinstance(animal_state, int) else None,
+                )
+            except Exception:
+                # The log is a read-optimized mirror; never block ingestion on it.
+                pass
+
+    def _user_classified_events(*, org_id: str, user_id: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """A user's classified events for profile building: decoded from the event log when it is
+        enabled (so the store is not re-read per rebuild), else listed from the store."""
+        if event_log is not None:
+            return event_log.events(org_id=org_id, user_id=user_id, limit=limit)
+        if limit is None:
+            return store.list_user_classified_events(org_id=org_id, user_id=user_id)
+        return store.list_user_classified_events(org_id=org_id, user_id=user_id, limit=limit)
+
+    def _team_classified_events(*, org_id: str, team_id: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """Team counterpart of `_user_classified_events`."""
+        if event_log is not None:
+            return event_log.events(org_id=org_id, team_id=team_id, limit=limit)
+        if limit is None:
+            return store.list_team_classified_events(org_id=org_id, team_id=team_id)
+        return store.list_team_classified_events(org_id=org_id, team_id=team_id, limit=limit)
+
+    if event_log is not None and not len(event_log):
+        # A fresh log over a populated in-memory store starts from the store's rows, so the reads
+        # above see the same history the store does.
+        for row in sorted(
+            (r for r in (getattr(store, "events_classified", None) or {}).values() if isinstance(r, dict)),
+            key=lambda r: str(r.get("timestamp") or ""),
+        ):
+            ctx = row.get("context") if isinstance(row.get("context"), dict) else {}
+            event_log.append(
+                row,
+                context_block=ctx.get("context_block") if isinstance(ctx.get("context_block"), str) else None,
+                animal_state=ctx.get("animal_state") if isinstance(ctx.get("animal_state"), int) else None,
+            )
+
+    te_warmed: set[tuple[str, str]] = set()
+    te_warm_lock = threading.Lock()
+
+    def _te_tracker(org_id: str, team_id: str, *, exclude_event_id: str | None = None) -> Any:
+        """The team's online TE tracker, replayed once per process from the event log's state
+        columns when it starts empty (e.g. after a restart)."""
+        registry = get_te_registry()
+        key = (org_id, team_id)
+        if event_log is not None and key not in te_warmed:
+            with te_warm_lock:
+                if key not in te_warmed:
+                    tracker = registry.get_tracker(org_id, team_id)
+                    if not tracker.user_last_state:
+                        for uid, ts, state in event_log.state_sequence(
+                            org_id=org_id,
+                            team_id=team_id,
+                            exclude_event_id=exclude_event_id,
+                        ):
+                            update_te_on_event(
+                                {
+                                    "org_id": org_id,
+                                    "team_id": team_id,
+                                    "user_id": uid,
+                                    "timestamp": (
+                                        datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+                                        if ts == ts
+                                        else None
+                                    ),
+                                },
+                                animal_state=int(state),
+                            )
+                    te_warmed.add(key)
+        return registry.get_tracker(org_id, team_id)
+
+    def _te_pair_sequences(org_id: str, team_id: str, user1: str, user2: str) -> tuple[list[int], list[int]]:
+        """Aligned animal-state sequences for two users from the event log: after both have a state,
+        each event by either one emits their latest states. Empty when the log is disabled."""
+        if event_log is None:
+            return [], []
+        last: dict[str, int] = {}
+        x_seq: list[int] = []
+        y_seq: list[int] = []
+        for uid, _ts, state in event_log.state_sequence(org_id=org_id, team_id=team_id):
+            if uid not in (user1, user2):
+                continue
+            last[uid] = int(state)
+            if user1 in last and user2 in last:
+                x_seq.append(last[user1])
+                y_seq.append(last[user2])
+        return x_seq, y_seq
+
     @app.get("/auth/test")
     def auth_test() -> dict[str, Any]:
         enabled = _supabase_auth_enabled()
@@ -731,36 +4068,185 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             min_samples = int(DEFAULT_POLICY_MIN_SAMPLES)
         return {"mode": mode, "epsilon": float(epsilon), "min_samples": int(min_samples)}
 
-    def _ensure_default_ux_interventions(org_id: str) -> list[dict[str, Any]]:
-        """Ensure the intervention taxonomy exists for an org (idempotent)."""
+    ux_defaults = [dict(row) for row in default_ux_interventions()]
+    ux_defaults_marker = hashlib.sha256(
+        json.dumps([PIPELINE_VERSION, ux_defaults], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+
+    def _ux_taxonomy(org_id: str) -> None:
+        if not ux_taxonomy.loaded(org_id):
+            # A failed read propagates: caching an empty taxonomy would hide the org's rows for the TTL.
+            ux_taxonomy.load(org_id, _list_all(store.list_ux_interventions, org_id=org_id))
+
+    def _upsert_ux_intervention(rec: dict[str, Any]) -> Any:
+        """Store an intervention and refresh the cached taxonomy entry for its org."""
+        record = store.upsert_ux_intervention(rec)
+        org_id = str((record if isinstance(record, dict) else rec).get("org_id") or "")
+        if isinstance(record, dict):
+            ux_taxonomy.upsert(org_id, record)
+        else:
+            ux_taxonomy.invalidate(org_id)
+        return record
+
+    def _ensure_default_ux_interventions(org_id: str, *, force: bool = False) -> list[dict[str, Any]]:
+        """Ensure the intervention taxonomy exists for an org (idempotent).
+
+        Runs once per org and defaults fingerprint: only defaults that are missing (or whose
+        definition changed) are written; later calls are a marker check.
+        """
+        try:
+            _ux_taxonomy(org_id)
+        except Exception:
+            # Best-effort in demo mode: with nothing cached every default is (re)written below.
+            pass
+        if not force and ux_taxonomy.marker(org_id) == ux_defaults_marker:
+            return [r for r in (ux_taxonomy.get(org_id, d.get("intervention_key")) for d in ux_defaults) if r]
+
+        skip = {"org_id", "created_at", "updated_at"}
         interventions: list[dict[str, Any]] = []
         now = utc_now_iso8601()
-        for row in default_ux_interventions():
+        complete = True
+        for row in ux_defaults:
+            existing = ux_taxonomy.get(org_id, str(row.get("intervention_key") or ""))
+            if not force and isinstance(existing, dict) and all(
+                existing.get(k) == v for k, v in row.items() if k not in skip
+            ):
+                interventions.append(existing)
+                continue
             rec = dict(row)
             rec["org_id"] = org_id
             rec.setdefault("created_at", now)
             rec.setdefault("updated_at", now)
             try:
-                interventions.append(store.upsert_ux_intervention(rec))
+                interventions.append(_upsert_ux_intervention(rec))
             except Exception:
                 # Keep bootstrapping best-effort in demo mode.
+                complete = False
                 continue
+        if complete:
+            ux_taxonomy.set_marker(org_id, ux_defaults_marker)
         return interventions
 
     def _list_ux_interventions(org_id: str, *, limit: int = 200) -> list[dict[str, Any]]:
+        _ux_taxonomy(org_id)
+        return ux_taxonomy.rows(org_id, limit=int(limit))
+
+    def _list_page(
+        list_fn: Any,
+        *,
+        ts_keys: tuple[str, ...],
+        id_keys: tuple[str, ...],
+        cursor: str | None,
+        limit: int,
+        predicate: Any = None,
+        table: str | None = None,
+        **filters: Any,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Keyset-paginate a store listing (newest first) using an opaque `(timestamp, id)` cursor.
+
+        Cursor keys should be immutable per row (creation time plus a unique id), so an update between
+        pages cannot move a row across the cursor. Stores whose list method accepts `before=(ts, id)`
+        seek directly. On the in-memory store, `table` names the dict behind the listing and the page
+        is selected from its rows by `filters` (field equality) and `predicate` in one pass, so the
+        cost per page does not grow with depth. Others can only return their newest N rows, so the
+        app scans the newest `PAGE_SCAN_LIMIT` rows and pages within them; when a scan is capped and
+        runs out before the page fills, the returned cursor carries a doubled scan depth instead of
+        ending the listing, so older history stays reachable in a logarithmic number of widenings.
+        """
+        page_limit = max(1, int(limit))
         try:
-            return store.list_ux_interventions(org_id=org_id, limit=int(limit))
-        except Exception:
-            return []
+            before, depth = _decode_cursor_parts(cursor) if cursor else (None, None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+        rows_by_key = getattr(store, table, None) if table else None
+        if isinstance(rows_by_key, dict) and not _accepts_kwarg(list_fn, "before"):
+            rows = (
+                r
+                for r in list(rows_by_key.values())
+                if isinstance(r, dict)
+                and all(r.get(k) == v for k, v in filters.items())
+                and (predicate is None or predicate(r))
+            )
+            return _keyset_page(rows, ts_keys=ts_keys, id_keys=id_keys, before=before, limit=page_limit)
+        if predicate is None and _accepts_kwarg(list_fn, "before"):
+            rows = list_fn(**filters, before=before, limit=page_limit + 1)
+            return _keyset_page(rows, ts_keys=ts_keys, id_keys=id_keys, before=before, limit=page_limit)
+        if before is None and predicate is None:
+            rows = list_fn(**filters, limit=page_limit + 1)
+            return _keyset_page(rows, ts_keys=ts_keys, id_keys=id_keys, before=before, limit=page_limit)
+
+        scan = max(page_limit + 1, int(depth or PAGE_SCAN_LIMIT))
+        rows = list_fn(**filters, limit=scan)
+        capped = len(rows) >= scan
+        scanned = rows
+        if predicate is not None:
+            rows = [r for r in rows if isinstance(r, dict) and predicate(r)]
+        page, next_cursor = _keyset_page(rows, ts_keys=ts_keys, id_keys=id_keys, before=before, limit=page_limit)
+        if next_cursor is not None:
+            return page, (_encode_cursor(*_decode_cursor(next_cursor), scan) if depth else next_cursor)
+        if capped:
+            # Older rows exist past the scan window; resume from the last row with a deeper scan.
+            if page:
+                last = _row_page_key(page[-1], ts_keys=ts_keys, id_keys=id_keys)
+            else:
+                # Nothing matched in the window: skip past everything already scanned.
+                keys = [_row_page_key(r, ts_keys=ts_keys, id_keys=id_keys) for r in scanned if isinstance(r, dict)]
+                if not keys:
+                    return page, None
+                last = min(keys)
+                if before is not None:
+                    last = min(last, before)
+            return page, _encode_cursor(*last, scan * 2)
+        return page, None
+
+    def _list_all(list_fn: Any, **filters: Any) -> list[Any]:
+        """Every row of a newest-N store listing, widening the read until it comes back short.
+
+        Used where a complete set is needed (index loads); the limit doubles, so the total read stays
+        within a small constant of the row count instead of stopping at `PAGE_SCAN_LIMIT`.
+        """
+        limit = max(1, PAGE_SCAN_LIMIT)
+        while True:
+            rows = list(list_fn(**filters, limit=limit) or [])
+            if len(rows) < limit:
+                return rows
+            limit *= 2
+
+    def _ux_runs_version(org_id: str) -> tuple[int, str]:
+        """Persisted version of an org's intervention runs: `(count, newest updated_at)`.
+
+        Read from the stored rows, so a run written by any worker (or deleted) changes it.
+        """
+        runs = store.list_ux_intervention_runs(org_id=org_id, limit=10000)
+        stamps = [
+            str(r.get("updated_at") or r.get("measured_at") or r.get("created_at") or "")
+            for r in runs or []
+            if isinstance(r, dict)
+        ]
+        return len(stamps), max(stamps, default="")
+
+    def _attribution_cached(cache_key: tuple[Any, ...], build: Any) -> dict[str, Any]:
+        """Reuse an attribution result until the org's stored runs change (or the TTL passes)."""
+        version = _ux_runs_version(str(cache_key[1]))
+        with attribution_lock:
+            hit = attribution_cache.get(cache_key)
+            if hit is not None and hit[1] == version and time.monotonic() - hit[0] < ATTRIBUTION_CACHE_TTL_S:
+                attribution_cache.move_to_end(cache_key)
+                return {**hit[2], "cached": True}
+        result = build()
+        with attribution_lock:
+            attribution_cache[cache_key] = (time.monotonic(), version, result)
+            while len(attribution_cache) > max(1, ATTRIBUTION_CACHE_LIMIT):
+                attribution_cache.popitem(last=False)
+        return {**result, "cached": False}
 
     def _lookup_ux_intervention(org_id: str, intervention_key: str) -> dict[str, Any] | None:
         key = str(intervention_key or "")
         if not key:
             return None
-        for row in _list_ux_interventions(org_id, limit=500):
-            if str(row.get("intervention_key") or "") == key:
-                return row
-        return None
+        _ux_taxonomy(org_id)
+        return ux_taxonomy.get(org_id, key)
 
     def _log_wellbeing_window(
         *,
@@ -875,11 +4361,22 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         except Exception:
             return None
         try:
-            store.upsert_memcube(memcube)
+            _upsert_memcube(memcube)
         except Exception:
             return None
         return memcube
 
+    def _profile_stamp(profile: Any) -> str:
+        """Persisted version of a stored profile: its `updated_at`, else a digest of its content.
+
+        Read from the profile row itself, so every worker (and a restarted one) derives the same
+        stamp for the same stored profile.
+        """
+        if not isinstance(profile, dict):
+            return ""
+        updated_at = profile.get("updated_at")
+        return str(updated_at) if updated_at else _fingerprint_request(profile)
+
     def _upsert_team_profile(
         team_profile: dict[str, Any],
         *,
@@ -889,6 +4386,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         updated_at: str | None = None,
     ) -> None:
         store.upsert_team_profile(team_profile)
+        if isinstance(team_profile, dict):
+            profile_index.upsert(org_id, "team", team_id, team_profile)
         psych = team_profile.get("psychodynamics") if isinstance(team_profile, dict) else {}
         psych = psych if isinstance(psych, dict) else {}
         influence_layers = psych.get("influence_layers") if isinstance(psych.get("influence_layers"), dict) else {}
@@ -918,6 +4417,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         updated_at: str | None = None,
     ) -> None:
         store.upsert_user_profile(user_profile)
+        if isinstance(user_profile, dict):
+            profile_index.upsert(org_id, "user", user_id, user_profile)
         psych = user_profile.get("psychodynamics") if isinstance(user_profile, dict) else {}
         psych = psych if isinstance(psych, dict) else {}
         _persist_psychodynamics_memcube(
@@ -930,10 +4431,43 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             created_at=updated_at,
         )
 
+    def _upsert_memcube(memcube: dict[str, Any]) -> Any:
+        """Store a memcube and keep the embedding index for its (org, context_type) in sync."""
+        record = store.upsert_memcube(memcube)
+        memcube_index.upsert(record if isinstance(record, dict) else memcube)
+        return record
+
+    def _memcube_slot(org_id: str, context_type: str) -> None:
+        if not memcube_index.loaded(org_id, context_type):
+            memcube_index.load(
+                org_id,
+                context_type,
+                _list_all(store.list_memcubes, org_id=org_id, context_type=context_type),
+            )
+
+    def _load_population(org_id: str) -> None:
+        if not profile_index.loaded(org_id, "user"):
+            profile_index.load(org_id, "user", store.list_user_profiles(org_id=org_id), id_key="user_id")
+        if not profile_index.loaded(org_id, "team"):
+            profile_index.load(org_id, "team", store.list_team_profiles(org_id=org_id), id_key="team_id")
+
+    def _population_profiles(
+        org_id: str,
+        *,
+        user_profile: Any,
+        team_profile: Any,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Nearest-neighbour user/team profiles for similarity-based CF (top PROFILE_NEIGHBORS each)."""
+        _load_population(org_id)
+        return (
+            profile_index.neighbors(org_id, "user", user_profile, k=PROFILE_NEIGHBORS),
+            profile_index.neighbors(org_id, "team", team_profile, k=PROFILE_NEIGHBORS),
+        )
+
     def _ensure_user_profile(org_id: str, user_id: str) -> dict[str, Any]:
         prof = store.get_user_profile(org_id=org_id, user_id=user_id)
         if prof is None:
-            events = store.list_user_classified_events(org_id=org_id, user_id=user_id)
+            events = _user_classified_events(org_id=org_id, user_id=user_id)
             prof = build_user_profile(user_id, org_id, events)
             _upsert_user_profile(
                 prof,
@@ -947,7 +4481,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
     def _ensure_team_profile(org_id: str, team_id: str) -> dict[str, Any]:
         prof = store.get_team_profile(org_id=org_id, team_id=team_id)
         if prof is None:
-            team_events = store.list_team_classified_events(org_id=org_id, team_id=team_id)
+            team_events = _team_classified_events(org_id=org_id, team_id=team_id)
             member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
             member_profiles: list[dict[str, Any]] = []
             for uid in member_ids:
@@ -979,7 +4513,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         )
         for cube in (animals, steiner):
             try:
-                store.upsert_memcube(cube)
+                _upsert_memcube(cube)
             except Exception:
                 continue
         return [animals, steiner]
@@ -994,7 +4528,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         stored: list[dict[str, Any]] = []
         for cube in memcubes:
             try:
-                stored.append(store.upsert_memcube(cube))
+                stored.append(_upsert_memcube(cube))
             except Exception:
                 continue
         return stored
@@ -1022,29 +4556,128 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         psych = psych if isinstance(psych, dict) else {}
         updated_at = prof.get("updated_at") if isinstance(prof, dict) else None
 
-        block_matrices: list[dict[str, Any]] | None = None
-        if include_blocks and hasattr(store, "list_psychodynamic_block_matrices"):
-            try:
-                block_matrices = store.list_psychodynamic_block_matrices(
-                    org_id=org_id,
-                    scope_type=scope_type,
-                    scope_id=scope_id,
-                    pipeline_version=pipeline_version,
-                    limit=200,
-                )
-            except Exception:
-                block_matrices = None
+        block_matrices: list[dict[str, Any]] | None = None
+        if include_blocks and hasattr(store, "list_psychodynamic_block_matrices"):
+            try:
+                block_matrices = store.list_psychodynamic_block_matrices(
+                    org_id=org_id,
+                    scope_type=scope_type,
+                    scope_id=scope_id,
+                    pipeline_version=pipeline_version,
+                    limit=200,
+                )
+            except Exception:
+                block_matrices = None
+
+        return _persist_psychodynamics_memcube(
+            org_id=org_id,
+            scope_type=scope_type,
+            scope_id=scope_id,
+            pipeline_version=pipeline_version,
+            psychodynamics=psych,
+            block_matrices=block_matrices,
+            source=source,
+            created_at=updated_at,
+        )
+
+    def _exchange_org(org_id: Optional[str], *, scope_type: Optional[str], scope_id: Optional[str]) -> str:
+        resolved_org = org_id
+        if not isinstance(resolved_org, str) or not resolved_org:
+            if isinstance(scope_type, str) and scope_type.lower().strip() == "team":
+                resolved_org = store.resolve_org_id(team_id=scope_id)
+            elif isinstance(scope_type, str) and scope_type.lower().strip() == "user":
+                resolved_org = store.resolve_org_id(user_id=scope_id)
+        if not isinstance(resolved_org, str) or not resolved_org:
+            raise HTTPException(status_code=400, detail="org_id is required (or scope_type/scope_id with known org).")
+        return resolved_org
+
+    def _exchange_memcubes(
+        resolved_org: str,
+        *,
+        scope_type: Optional[str],
+        scope_id: Optional[str],
+        pipeline_version: Optional[str],
+        include_state_schema: bool,
+        include_telemetry: bool,
+        include_block_matrices: bool,
+        source: Optional[str],
+    ) -> list[dict[str, Any]]:
+        pv = str(pipeline_version or PIPELINE_VERSION)
+        memcubes: list[dict[str, Any]] = []
+
+        if bool(include_state_schema):
+            memcubes.extend(_state_schema_memcubes_for_org(resolved_org))
+
+        if bool(include_telemetry):
+            st = str(scope_type or "").strip().lower()
+            sid = str(scope_id or "").strip()
+            if st not in {"user", "team"} or not sid:
+                raise HTTPException(
+                    status_code=400,
+                    detail="scope_type (user|team) and scope_id are required when include_telemetry=true.",
+                )
+            telemetry = _psychodynamics_memcube_for_scope(
+                org_id=resolved_org,
+                scope_type=st,
+                scope_id=sid,
+                pipeline_version=pv,
+                include_blocks=bool(include_block_matrices),
+                source=source or "export",
+            )
+            if telemetry is not None:
+                memcubes.append(telemetry)
+        return memcubes
+
+    def _import_summary(org_id: str) -> dict[str, Any]:
+        return {"org_id": org_id, "imported": 0, "skipped": 0, "errors": []}
+
+    def _import_error(summary: dict[str, Any], reason: str, memcube_id: Any = None) -> None:
+        summary["skipped"] += 1
+        if len(summary["errors"]) < MEMCUBE_IMPORT_ERROR_SAMPLES:
+            summary["errors"].append({"reason": reason, "memcube_id": memcube_id})
 
-        return _persist_psychodynamics_memcube(
-            org_id=org_id,
-            scope_type=scope_type,
-            scope_id=scope_id,
-            pipeline_version=pipeline_version,
-            psychodynamics=psych,
-            block_matrices=block_matrices,
-            source=source,
-            created_at=updated_at,
-        )
+    def _import_memcube_chunk(
+        chunk: list[Any],
+        *,
+        org_id: str,
+        source: str | None,
+        now: str,
+        summary: dict[str, Any],
+    ) -> None:
+        """Prepare and upsert one chunk; a bulk store write when available, else record by record."""
+        records: list[dict[str, Any]] = []
+        for raw in chunk:
+            rec = _prepare_exchange_memcube(raw, org_id=org_id, source=source, now=now)
+            if rec is None:
+                _import_error(summary, "invalid memcube", raw.get("memcube_id") if isinstance(raw, dict) else None)
+                continue
+            records.append(rec)
+        if not records:
+            return
+
+        bulk = getattr(store, "upsert_memcubes", None)
+        if callable(bulk):
+            try:
+                with _store_transaction():
+                    stored = bulk(records)
+            except Exception as exc:  # noqa: BLE001
+                # Not a skip: the records are retried one by one below, which pinpoints the bad ones.
+                stored = None
+                if len(summary["errors"]) < MEMCUBE_IMPORT_ERROR_SAMPLES:
+                    summary["errors"].append({"reason": f"bulk upsert failed: {exc}", "memcube_id": None})
+            if stored is not None:
+                for rec in stored if isinstance(stored, list) and len(stored) == len(records) else records:
+                    memcube_index.upsert(rec)
+                summary["imported"] += len(records)
+                return
+
+        for rec in records:
+            try:
+                _upsert_memcube(rec)
+            except Exception as exc:  # noqa: BLE001
+                _import_error(summary, str(exc), rec.get("memcube_id"))
+                continue
+            summary["imported"] += 1
 
     def _prepare_exchange_memcube(
         memcube: dict[str, Any],
@@ -1055,7 +4688,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
     ) -> dict[str, Any] | None:
         if not isinstance(memcube, dict):
             return None
-        rec = copy.deepcopy(memcube)
+        # Only top-level keys are filled in below, so a shallow copy keeps the caller's payload intact.
+        rec = dict(memcube)
         if not isinstance(rec.get("org_id"), str) or not rec.get("org_id"):
             rec["org_id"] = org_id
 
@@ -1092,8 +4726,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not isinstance(rec.get("memcube_id"), str) or not rec.get("memcube_id"):
             rec["memcube_id"] = f"{rec['context_type']}:{rec['entity_id']}:{uuid.uuid4()}"
 
-        meta = rec.get("metadata") if isinstance(rec.get("metadata"), dict) else {}
-        exchange = meta.get("exchange") if isinstance(meta.get("exchange"), dict) else {}
+        meta = dict(rec["metadata"]) if isinstance(rec.get("metadata"), dict) else {}
+        exchange = dict(meta["exchange"]) if isinstance(meta.get("exchange"), dict) else {}
         exchange["imported_at"] = now
         if isinstance(source, str) and source:
             exchange["source"] = source
@@ -1119,7 +4753,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         if scope_type == "team":
             team_profile = _ensure_team_profile(org_id, scope_id)
-            team_events = store.list_team_classified_events(org_id=org_id, team_id=scope_id)
+            team_events = _team_classified_events(org_id=org_id, team_id=scope_id)
             member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
             member_profiles = [_ensure_user_profile(org_id, uid) for uid in member_ids]
             ux = recommend_ux_interventions(user_profiles=member_profiles, team_profile=team_profile)
@@ -1198,6 +4832,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             "ux_exposures": int(len(getattr(store, "ux_exposures", {}) or {})),
             "psychodynamic_block_matrices": int(len(getattr(store, "psychodynamic_block_matrices", {}) or {})),
             "psychodynamic_influence_layers": int(len(getattr(store, "psychodynamic_influence_layers", {}) or {})),
+            **({"event_log_rows": len(event_log)} if event_log is not None else {}),
         }
 
     def _reset_inmemory_store() -> None:
@@ -1221,6 +4856,21 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         store.psychodynamic_influence_layers.clear()
         store.team_to_org.clear()
         store.user_to_org.clear()
+        classified_index.clear()
+        profile_index.clear()
+        feed_lru.clear()
+        project_activity.clear()
+        if event_log is not None:
+            event_log.clear()
+        with te_warm_lock:
+            te_warmed.clear()
+        dag_cache.clear()
+        readiness_trackers.clear()
+        pending_plan_states.clear()
+        memcube_index.clear()
+        ux_taxonomy.clear()
+        with attribution_lock:
+            attribution_cache.clear()
 
     def _load_sample_events(kind: str) -> list[dict[str, Any]]:
         kind = (kind or "").strip().lower()
@@ -1233,17 +4883,71 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             raise ValueError(f"{filename} must contain a JSON list")
         return [e for e in data if isinstance(e, dict)]
 
+    discourse_cache: OrderedDict[str, tuple[list[dict[str, Any]], list[dict[str, Any]]]] = OrderedDict()
+    discourse_lock = threading.Lock()
+
+    def _discourse_artifacts(
+        org_id: str,
+        events: list[dict[str, Any]],
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Heuristic insights and knowledge cards for an event set, reused while the set is unchanged."""
+        key = f"{org_id}|" + _fingerprint_request(
+            {"events": [(e.get("event_id"), e.get("timestamp")) for e in events]}
+        )
+        with discourse_lock:
+            hit = discourse_cache.get(key)
+            if hit is not None:
+                discourse_cache.move_to_end(key)
+                return hit
+        insights = extract_insights(
+            org_id=org_id,
+            events=events,
+            llm_mode="off",
+            **_classifier_kwargs(extract_insights, events, llm_mode="off"),
+        )
+        cards = build_knowledge_cards(org_id=org_id, insights=insights)
+        with discourse_lock:
+            discourse_cache[key] = (insights, cards)
+            while len(discourse_cache) > max(1, DISCOURSE_CACHE_LIMIT):
+                discourse_cache.popitem(last=False)
+        return insights, cards
+
+    def _store_transaction() -> Any:
+        """One store transaction around a write set when the store exposes `transaction()`; otherwise
+        a no-op (the statements then commit individually)."""
+        begin = getattr(store, "transaction", None)
+        return begin() if callable(begin) else nullcontext()
+
     def _ingest_raw_event(
         raw: dict[str, Any],
         *,
         llm_mode: str,
         update_profiles: bool,
         team_layer_mode: str | None = None,
+    ) -> str:
+        # Classify first: it may wait on the LLM, and no open transaction should be held across
+        # that. Then the whole write set (raw, classified, interaction, kernels, FSA, profiles)
+        # shares one transaction on stores that support it.
+        classified = classify(raw, llm_mode=llm_mode)
+        with _store_transaction():
+            return _ingest_raw_event_writes(
+                raw,
+                classified,
+                update_profiles=update_profiles,
+                team_layer_mode=team_layer_mode,
+            )
+
+    def _ingest_raw_event_writes(
+        raw: dict[str, Any],
+        classified: dict[str, Any],
+        *,
+        update_profiles: bool,
+        team_layer_mode: str | None = None,
     ) -> str:
         with LatencyTracker("event_ingest"):
             store.upsert_event_raw(raw)
+            project_activity.observe(raw)
 
-        classified = classify_event(raw, llm_mode=llm_mode)
         # Normalize context and attach derived context partition info for downstream pipelines.
         ctx = classified.get("context")
         if not isinstance(ctx, dict):
@@ -1282,7 +4986,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             animal_state = None
 
         classified["context"] = ctx
-        store.upsert_event_classified(classified)
+        _record_classified_event(classified)
         collector.record_event_processed()
 
         interaction = interaction_from_event(raw_event=raw, classified_event=classified)
@@ -1327,6 +5031,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         # requiring full recomputation of team profiles.
         try:
             if org_id and team_id and user_id and animal_state is not None:
+                # The event is already in the log; the replay must not count it twice.
+                _te_tracker(org_id, team_id, exclude_event_id=str(raw.get("event_id") or "") or None)
                 te_updates = update_te_on_event(
                     {
                         "org_id": org_id,
@@ -1369,6 +5075,9 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 timestamp=timestamp or None,
             )
             store.upsert_org_fsa_state(org_state)
+            if isinstance(org_state, dict):
+                _note_plan_graph(("org", org_id), org_state.get("project_graph"), raw)
+            _observe_plan_state(("org", org_id), org_state, raw)
 
             project_id = raw.get("project_id")
             if isinstance(project_id, str) and project_id:
@@ -1384,11 +5093,14 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     timestamp=timestamp or None,
                 )
                 store.upsert_project_fsa_state(proj_state)
+                if isinstance(proj_state, dict):
+                    _note_plan_graph(("project", org_id, project_id), proj_state.get("task_graph"), raw)
+                _observe_plan_state(("project", org_id, project_id), proj_state, raw)
 
         if update_profiles:
             window_end = timestamp or utc_now_iso8601()
             if org_id and user_id:
-                user_events = store.list_user_classified_events(org_id=org_id, user_id=user_id)
+                user_events = _user_classified_events(org_id=org_id, user_id=user_id)
                 user_profile = build_user_profile(user_id, org_id, user_events)
                 _upsert_user_profile(
                     user_profile,
@@ -1414,13 +5126,13 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     pass
 
             if org_id and isinstance(team_id, str) and team_id:
-                team_events = store.list_team_classified_events(org_id=org_id, team_id=team_id)
+                team_events = _team_classified_events(org_id=org_id, team_id=team_id)
                 member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
                 member_profiles: list[dict[str, Any]] = []
                 for uid in member_ids:
                     prof = store.get_user_profile(org_id=org_id, user_id=uid)
                     if prof is None:
-                        u_events = store.list_user_classified_events(org_id=org_id, user_id=uid)
+                        u_events = _user_classified_events(org_id=org_id, user_id=uid)
                         prof = build_user_profile(uid, org_id, u_events)
                         _upsert_user_profile(
                             prof,
@@ -1468,7 +5180,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
     @app.get("/health")
     def health() -> dict[str, Any]:
-        return {"ok": True, "pipeline_version": PIPELINE_VERSION, "store": store.__class__.__name__}
+        return {"ok": True, "pipeline_version": PIPELINE_VERSION, "store": store_name}
 
     if enable_monitoring:
         @app.get("/intelligence/monitoring/health")
@@ -1504,15 +5216,34 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "kernel_updates": summary.kernel_updates,
                 "errors": summary.errors,
                 "warnings": summary.warnings,
+                "store_queries": store_query_stats.summary(),
+                "feed_cache": {
+                    **feed_cache_stats.summary(),
+                    "lru_entries": len(feed_lru),
+                    "lru_bytes": feed_lru.nbytes,
+                },
+                "classification_cache": classification_cache.summary(),
+                "classification_executor": classification_executor.summary(),
+                "paper_report_cache": {
+                    **paper_report_stats.summary(),
+                    "lru_entries": len(paper_report_lru),
+                    "lru_bytes": paper_report_lru.nbytes,
+                },
             }
 
+        def _prometheus_text() -> str:
+            text = str(export_prometheus_metrics() or "")
+            if text and not text.endswith("\n"):
+                text += "\n"
+            return text + classification_cache.prometheus_lines()
+
         @app.get("/intelligence/monitoring/metrics")
         def monitoring_metrics() -> Response:
-            return Response(export_prometheus_metrics(), media_type="text/plain")
+            return Response(_prometheus_text(), media_type="text/plain")
 
         @app.get("/metrics", include_in_schema=False)
         def metrics_root() -> Response:
-            return Response(export_prometheus_metrics(), media_type="text/plain")
+            return Response(_prometheus_text(), media_type="text/plain")
 
     @app.get("/", include_in_schema=False)
     def root() -> Any:
@@ -1537,7 +5268,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         @app.get("/intelligence/debug/counts")
         def debug_counts() -> dict[str, Any]:
-            return {"store": store.__class__.__name__, "counts": _store_counts()}
+            return {"store": store_name, "counts": _store_counts()}
 
         @app.post("/intelligence/debug/reset")
         def debug_reset() -> dict[str, Any]:
@@ -1562,16 +5293,31 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             team_id: Optional[str] = None,
             user_id: Optional[str] = None,
             limit: int = 200,
+            cursor: Optional[str] = None,
         ) -> dict[str, Any]:
             resolved_org = org_id or store.resolve_org_id(team_id=team_id, user_id=user_id)
             if not isinstance(resolved_org, str) or not resolved_org:
                 raise HTTPException(status_code=400, detail="org_id (or team_id/user_id with known org) is required.")
-            events = store.list_raw_events(org_id=resolved_org, limit=max(1, int(limit)))
-            if isinstance(team_id, str) and team_id:
-                events = [e for e in events if e.get("team_id") == team_id]
-            if isinstance(user_id, str) and user_id:
-                events = [e for e in events if e.get("user_id") == user_id or e.get("subject_id") == user_id]
-            return {"org_id": resolved_org, "count": len(events), "events": events}
+
+            def _matches(e: dict[str, Any]) -> bool:
+                if isinstance(team_id, str) and team_id and e.get("team_id") != team_id:
+                    return False
+                if isinstance(user_id, str) and user_id and not (e.get("user_id") == user_id or e.get("subject_id") == user_id):
+                    return False
+                return True
+
+            filtered = bool(team_id) or bool(user_id)
+            events, next_cursor = _list_page(
+                store.list_raw_events,
+                ts_keys=("timestamp",),
+                id_keys=("event_id",),
+                cursor=cursor,
+                limit=limit,
+                predicate=_matches if filtered else None,
+                table="events_raw",
+                org_id=resolved_org,
+            )
+            return {"org_id": resolved_org, "count": len(events), "events": events, "next_cursor": next_cursor}
 
         @app.get("/intelligence/debug/telemetry/instrumentation")
         def debug_telemetry_instrumentation(
@@ -1620,26 +5366,58 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             team_id: Optional[str] = None,
             user_id: Optional[str] = None,
             limit: int = 200,
+            cursor: Optional[str] = None,
         ) -> dict[str, Any]:
             resolved_org = org_id or store.resolve_org_id(team_id=team_id, user_id=user_id)
             if not isinstance(resolved_org, str) or not resolved_org:
                 raise HTTPException(status_code=400, detail="org_id (or team_id/user_id with known org) is required.")
 
             events: list[dict[str, Any]]
-            if isinstance(team_id, str) and team_id:
-                events = store.list_team_classified_events(org_id=resolved_org, team_id=team_id, limit=max(1, int(limit)))
+            next_cursor: str | None
+            if _sync_classified_index():
+                if isinstance(team_id, str) and team_id:
+                    scope: tuple[str, ...] = ("team", resolved_org, team_id)
+                elif isinstance(user_id, str) and user_id:
+                    scope = ("user", resolved_org, user_id)
+                else:
+                    scope = ("org", resolved_org)
+                try:
+                    before = _decode_cursor(cursor) if cursor else None
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e)) from e
+                page_limit = max(1, int(limit))
+                rows = classified_index.range(scope, before=before, limit=page_limit + 1)
+                events = rows[:page_limit]
+                next_cursor = None
+                if len(rows) > page_limit and events:
+                    last = events[-1]
+                    next_cursor = _encode_cursor(str(last.get("timestamp") or ""), str(last.get("event_id") or ""))
+            elif isinstance(team_id, str) and team_id:
+                events, next_cursor = _list_page(
+                    store.list_team_classified_events,
+                    ts_keys=("timestamp",),
+                    id_keys=("event_id",),
+                    cursor=cursor,
+                    limit=limit,
+                    table="events_classified",
+                    org_id=resolved_org,
+                    team_id=team_id,
+                )
             elif isinstance(user_id, str) and user_id:
-                events = store.list_user_classified_events(org_id=resolved_org, user_id=user_id, limit=max(1, int(limit)))
+                events, next_cursor = _list_page(
+                    store.list_user_classified_events,
+                    ts_keys=("timestamp",),
+                    id_keys=("event_id",),
+                    cursor=cursor,
+                    limit=limit,
+                    org_id=resolved_org,
+                    user_id=user_id,
+                )
             else:
-                # Postgres store doesn't expose an org-level classified list; fall back to in-memory if available.
-                if hasattr(store, "events_classified"):
-                    rows = [e for e in (getattr(store, "events_classified", {}) or {}).values() if e.get("org_id") == resolved_org]
-                    rows.sort(key=lambda r: str(r.get("timestamp") or ""))
-                    events = rows[-max(1, int(limit)) :]
-                else:
-                    raise HTTPException(status_code=400, detail="team_id or user_id is required for classified events.")
+                # Postgres store doesn't expose an org-level classified list.
+                raise HTTPException(status_code=400, detail="team_id or user_id is required for classified events.")
 
-            return {"org_id": resolved_org, "count": len(events), "events": events}
+            return {"org_id": resolved_org, "count": len(events), "events": events, "next_cursor": next_cursor}
 
         @app.post("/intelligence/debug/psychodynamics/block-matrix/recompute")
         def debug_recompute_block_matrix(
@@ -1663,7 +5441,21 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             if not isinstance(scope_id, str) or not scope_id:
                 raise HTTPException(status_code=400, detail="scope_id is required (user_id or team_id)")
 
-            if scope_type == "user":
+            # Ingest labels events with the heuristic classifier, so the log's animal column is only
+            # reusable when recompute would use the same classifier.
+            events: list[dict[str, Any]] = []
+            states: list[tuple[str, int]] | None = None
+            if event_log is not None and str(ANIMAL_CLASSIFIER_MODE or "heuristic") == "heuristic":
+                scope_filter = {"user_id": scope_id} if scope_type == "user" else {"team_id": scope_id}
+                inputs = event_log.block_inputs(org_id=resolved_org, limit=max(1, int(limit)), **scope_filter)
+                # Rows logged without an animal state (e.g. demo seeds) are classified here, in order.
+                states = []
+                for item in inputs:
+                    if isinstance(item, tuple):
+                        states.append(item)
+                    else:
+                        states.extend(_classify_block_states([item]))
+            elif scope_type == "user":
                 events = store.list_user_classified_events(
                     org_id=resolved_org,
                     user_id=scope_id,
@@ -1684,6 +5476,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 scope_type=scope_type,
                 scope_id=scope_id,
                 pipeline_version=pv,
+                states=states,
             )
 
             return {
@@ -1692,8 +5485,216 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "scope_id": scope_id,
                 "pipeline_version": pv,
                 "records": records,
-                "event_count": len(events),
+                "event_count": len(inputs) if states is not None else len(events),
+            }
+
+        def _paper_report_events(
+            resolved_org: str,
+            *,
+            team_id: Optional[str],
+            user_id: Optional[str],
+            limit: int,
+        ) -> list[dict[str, Any]]:
+            events = store.list_raw_events(org_id=resolved_org, limit=max(1, int(limit)))
+            if isinstance(team_id, str) and team_id:
+                events = [e for e in events if e.get("team_id") == team_id]
+            if isinstance(user_id, str) and user_id:
+                events = [e for e in events if e.get("user_id") == user_id]
+            return events
+
+        def _paper_report_cached(key: str, version: Any) -> Any | None:
+            entry = paper_report_lru.get(key)
+            if entry is None:
+                paper_report_stats.incr("misses")
+                return None
+            stamp, cached_version, value = entry
+            if cached_version != version or (time.monotonic() - stamp) > PAPER_REPORT_CACHE_TTL_S:
+                paper_report_lru.pop(key)
+                paper_report_stats.incr("misses")
+                paper_report_stats.incr("stale")
+                return None
+            paper_report_stats.incr("hits")
+            return value
+
+        def _paper_report_remember(key: str, version: Any, value: Any) -> None:
+            size = len(json.dumps(value, separators=(",", ":"), default=str))
+            paper_report_lru.put(key, (time.monotonic(), version, value), size=size)
+
+        def _memcube_stamps(memcubes: list[dict[str, Any]]) -> list[list[str]]:
+            """Persisted versions of stored memcube rows, as sorted `[memcube_id, updated_at]` pairs."""
+            stamps: list[list[str]] = []
+            for cube in memcubes:
+                if not isinstance(cube, dict):
+                    continue
+                memcube_id = cube.get("memcube_id") or cube.get("id")
+                updated_at = cube.get("updated_at") or cube.get("created_at")
+                stamps.append([str(memcube_id or ""), str(updated_at) if updated_at else _fingerprint_request(cube)])
+            return sorted(stamps)
+
+        def _paper_report_memcubes(
+            resolved_org: str,
+            *,
+            team_id: Optional[str],
+            user_id: Optional[str],
+            pipeline_version: str,
+        ) -> tuple[list[dict[str, Any]], Any, bool]:
+            """Profile memcubes for a production report.
+
+            State-schema rows are re-listed every call (one indexed read) and the telemetry memcube is
+            reused until the scope's stored profile changes; the returned version combines the
+            persisted `updated_at` of both, so any worker sees the same version for the same rows.
+            """
+            scope_type = "team" if isinstance(team_id, str) and team_id else "user"
+            scope_id = team_id if scope_type == "team" else user_id
+            schema = _state_schema_memcubes_for_org(resolved_org)
+            if not (isinstance(scope_id, str) and scope_id):
+                profile_stamp = ""
+            elif scope_type == "team":
+                profile_stamp = _profile_stamp(store.get_team_profile(org_id=resolved_org, team_id=scope_id))
+            else:
+                profile_stamp = _profile_stamp(store.get_user_profile(org_id=resolved_org, user_id=scope_id))
+            version = [profile_stamp, _memcube_stamps(schema)]
+
+            key = f"memcubes|{resolved_org}|{scope_type}|{scope_id or ''}|{pipeline_version}"
+            cached = _paper_report_cached(key, profile_stamp)
+            hit = cached is not None
+            if cached is None:
+                cached = []
+                if isinstance(scope_id, str) and scope_id:
+                    telemetry = _psychodynamics_memcube_for_scope(
+                        org_id=resolved_org,
+                        scope_type=scope_type,
+                        scope_id=scope_id,
+                        pipeline_version=pipeline_version,
+                        source="paper-report",
+                    )
+                    if isinstance(telemetry, dict):
+                        cached = [telemetry]
+                _paper_report_remember(key, profile_stamp, cached)
+            return [*schema, *cached], version, hit
+
+        def _paper_report_windows(events: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+            """Group events into fixed `PAPER_REPORT_WINDOW_S` buckets on their timestamps, oldest first.
+
+            Bucket edges are absolute, so a new event only changes the newest window (and the oldest
+            one once `limit` starts cutting into it); every window in between keeps its contents.
+            """
+            buckets: dict[int, list[dict[str, Any]]] = {}
+            for e in events:
+                try:
+                    bucket = int(parse_iso8601(str(e.get("timestamp") or "")).timestamp() // PAPER_REPORT_WINDOW_S)
+                except Exception:
+                    bucket = 0
+                buckets.setdefault(bucket, []).append(e)
+            return [buckets[b] for b in sorted(buckets)]
+
+        def _paper_report_partials(
+            events: list[dict[str, Any]],
+            *,
+            inputs: dict[str, Any],
+            report_mode: str,
+            llm_mode: str,
+            pipeline_version: str,
+            cfg: dict[str, Any],
+        ) -> tuple[list[Any], int]:
+            """Per-window partial aggregates, each cached on that window's exact event sequence."""
+            partials: list[Any] = []
+            reused = 0
+            for window in _paper_report_windows(events):
+                key = "partial|" + _fingerprint_request(
+                    {**inputs, "events": [(e.get("event_id"), e.get("timestamp")) for e in window]}
+                )
+                partial = _paper_report_cached(key, None)
+                if partial is None:
+                    partial = build_paper_report_partial(
+                        window,
+                        llm_mode=llm_mode,
+                        pipeline_version=pipeline_version,
+                        team_psychodynamics_config=cfg,
+                        report_mode=report_mode,
+                        **_classifier_kwargs(build_paper_report_partial, window, llm_mode=llm_mode),
+                    )
+                    _paper_report_remember(key, None, partial)
+                else:
+                    reused += 1
+                partials.append(partial)
+            return partials, reused
+
+        def _paper_report(
+            events: list[dict[str, Any]],
+            *,
+            resolved_org: str,
+            team_id: Optional[str],
+            user_id: Optional[str],
+            report_mode: str,
+            llm_mode: str,
+            pipeline_version: str,
+            cfg: dict[str, Any],
+            memcubes: list[dict[str, Any]] | None = None,
+            memcube_version: Any = None,
+            cached_sections: dict[str, bool] | None = None,
+            remember: bool = True,
+        ) -> dict[str, Any]:
+            """Build (or reuse) a paper report; keyed by the exact event sequence and report inputs.
+
+            When the report builder exposes per-window partials, a miss only rebuilds the windows
+            whose events changed and merges them with the cached ones. `remember=False` reuses a
+            cached report but does not store a freshly built one.
+            """
+            inputs = {
+                "org_id": resolved_org,
+                "team_id": team_id,
+                "user_id": user_id,
+                "report_mode": report_mode,
+                "llm_mode": llm_mode,
+                "pipeline_version": pipeline_version,
+                "config": cfg,
             }
+            key = "report|" + _fingerprint_request(
+                {**inputs, "events": [(e.get("event_id"), e.get("timestamp")) for e in events]}
+            )
+            sections = dict(cached_sections or {})
+            report = _paper_report_cached(key, memcube_version)
+            sections["report"] = report is not None
+            if report is None:
+                extra: dict[str, Any] = {}
+                if report_mode == "production":
+                    extra["memcubes"] = memcubes if memcubes else None
+                try:
+                    if build_paper_report_partial is not None and merge_paper_report_partials is not None:
+                        partials, reused = _paper_report_partials(
+                            events,
+                            inputs=inputs,
+                            report_mode=report_mode,
+                            llm_mode=llm_mode,
+                            pipeline_version=pipeline_version,
+                            cfg=cfg,
+                        )
+                        sections["windows"] = reused > 0
+                        report = merge_paper_report_partials(
+                            partials,
+                            pipeline_version=pipeline_version,
+                            team_psychodynamics_config=cfg,
+                            report_mode=report_mode,
+                            **extra,
+                        )
+                    else:
+                        report = build_paper_report(
+                            events,
+                            llm_mode=llm_mode,
+                            pipeline_version=pipeline_version,
+                            team_psychodynamics_config=cfg,
+                            report_mode=report_mode,
+                            **extra,
+                            **_classifier_kwargs(build_paper_report, events, llm_mode=llm_mode),
+                        )
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e)) from e
+                if remember:
+                    _paper_report_remember(key, memcube_version, report)
+            if not isinstance(report, dict):
+                return report
+            return {**report, "cached_sections": sorted(k for k, hit in sections.items() if hit)}
 
         @app.get("/intelligence/debug/paper-report")
         def debug_paper_report(
@@ -1713,28 +5714,23 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             if not isinstance(resolved_org, str) or not resolved_org:
                 raise HTTPException(status_code=400, detail="org_id (or team_id/user_id with known org) is required.")
 
-            events = store.list_raw_events(org_id=resolved_org, limit=max(1, int(limit)))
-            if isinstance(team_id, str) and team_id:
-                events = [e for e in events if e.get("team_id") == team_id]
-            if isinstance(user_id, str) and user_id:
-                events = [e for e in events if e.get("user_id") == user_id]
-
+            events = _paper_report_events(resolved_org, team_id=team_id, user_id=user_id, limit=limit)
             cfg = {
                 "significance_mode": str(significance_mode or "on"),
                 "layer_mode": str(layer_mode or "on"),
                 "window": int(window),
             }
             pv = str(pipeline_version or PIPELINE_VERSION)
-            try:
-                return build_paper_report(
-                    events,
-                    llm_mode=llm_mode,
-                    pipeline_version=pv,
-                    team_psychodynamics_config=cfg,
-                    report_mode="audit",
-                )
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=str(e)) from e
+            return _paper_report(
+                events,
+                resolved_org=resolved_org,
+                team_id=team_id,
+                user_id=user_id,
+                report_mode="audit",
+                llm_mode=llm_mode,
+                pipeline_version=pv,
+                cfg=cfg,
+            )
 
         @app.get("/intelligence/paper-report")
         def paper_report(
@@ -1754,11 +5750,56 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             if not isinstance(resolved_org, str) or not resolved_org:
                 raise HTTPException(status_code=400, detail="org_id (or team_id/user_id with known org) is required.")
 
-            events = store.list_raw_events(org_id=resolved_org, limit=max(1, int(limit)))
-            if isinstance(team_id, str) and team_id:
-                events = [e for e in events if e.get("team_id") == team_id]
-            if isinstance(user_id, str) and user_id:
-                events = [e for e in events if e.get("user_id") == user_id]
+            events = _paper_report_events(resolved_org, team_id=team_id, user_id=user_id, limit=limit)
+            cfg = {
+                "significance_mode": str(significance_mode or "on"),
+                "layer_mode": str(layer_mode or "on"),
+                "window": int(window),
+            }
+            pv = str(pipeline_version or PIPELINE_VERSION)
+            memcubes, memcube_version, memcubes_hit = _paper_report_memcubes(
+                resolved_org,
+                team_id=team_id,
+                user_id=user_id,
+                pipeline_version=pv,
+            )
+            return _paper_report(
+                events,
+                resolved_org=resolved_org,
+                team_id=team_id,
+                user_id=user_id,
+                report_mode="production",
+                llm_mode=llm_mode,
+                pipeline_version=pv,
+                cfg=cfg,
+                memcubes=memcubes,
+                memcube_version=memcube_version,
+                cached_sections={"memcubes": memcubes_hit},
+            )
+
+        @app.get("/intelligence/paper-report/stream")
+        def paper_report_stream(
+            *,
+            org_id: Optional[str] = None,
+            team_id: Optional[str] = None,
+            user_id: Optional[str] = None,
+            limit: int = 500,
+            llm_mode: str = "auto",
+            pipeline_version: Optional[str] = None,
+            significance_mode: str = "on",
+            layer_mode: str = "on",
+            window: int = 200,
+            report_mode: str = "production",
+        ) -> Any:
+            """Stream a paper report as NDJSON: one record per section entry, metadata first."""
+            from starlette.responses import StreamingResponse
+
+            resolved_org = org_id or store.resolve_org_id(team_id=team_id, user_id=user_id)
+            if not isinstance(resolved_org, str) or not resolved_org:
+                raise HTTPException(status_code=400, detail="org_id (or team_id/user_id with known org) is required.")
+            mode = str(report_mode or "production").strip().lower()
+            if mode not in {"production", "audit"}:
+                raise HTTPException(status_code=400, detail="report_mode must be production|audit.")
 
             cfg = {
                 "significance_mode": str(significance_mode or "on"),
@@ -1767,32 +5808,68 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             }
             pv = str(pipeline_version or PIPELINE_VERSION)
 
-            memcubes: list[dict[str, Any]] = []
-            memcubes.extend(_state_schema_memcubes_for_org(resolved_org))
-            scope_type = "team" if isinstance(team_id, str) and team_id else "user"
-            scope_id = team_id if scope_type == "team" else user_id
-            if isinstance(scope_id, str) and scope_id:
-                telemetry = _psychodynamics_memcube_for_scope(
-                    org_id=resolved_org,
-                    scope_type=scope_type,
-                    scope_id=scope_id,
-                    pipeline_version=pv,
-                    source="paper-report",
-                )
-                if isinstance(telemetry, dict):
-                    memcubes.append(telemetry)
+            def _report_lines() -> Iterator[str]:
+                events = _paper_report_events(resolved_org, team_id=team_id, user_id=user_id, limit=limit)
+                yield json.dumps(
+                    {
+                        "section": "request",
+                        "data": {
+                            "org_id": resolved_org,
+                            "team_id": team_id,
+                            "user_id": user_id,
+                            "report_mode": mode,
+                            "pipeline_version": pv,
+                            "events": len(events),
+                            "config": cfg,
+                        },
+                    },
+                    default=str,
+                ) + "\n"
 
-            try:
-                return build_paper_report(
+                extra: dict[str, Any] = {}
+                if mode == "production":
+                    memcubes, memcube_version, memcubes_hit = _paper_report_memcubes(
+                        resolved_org,
+                        team_id=team_id,
+                        user_id=user_id,
+                        pipeline_version=pv,
+                    )
+                    extra = {
+                        "memcubes": memcubes,
+                        "memcube_version": memcube_version,
+                        "cached_sections": {"memcubes": memcubes_hit},
+                    }
+                # Streaming callers get the report once; a fresh build is not pinned in the LRU.
+                report = _paper_report(
                     events,
+                    resolved_org=resolved_org,
+                    team_id=team_id,
+                    user_id=user_id,
+                    report_mode=mode,
                     llm_mode=llm_mode,
                     pipeline_version=pv,
-                    team_psychodynamics_config=cfg,
-                    report_mode="production",
-                    memcubes=memcubes if memcubes else None,
+                    cfg=cfg,
+                    remember=False,
+                    **extra,
                 )
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=str(e)) from e
+                del events, extra
+
+                emitted = 0
+                for record in _paper_report_sections(report if isinstance(report, dict) else {"report": report}):
+                    emitted += 1
+                    yield json.dumps(record, default=str) + "\n"
+                yield json.dumps({"section": "end", "records": emitted}) + "\n"
+
+            def _lines() -> Iterator[str]:
+                # Headers are already sent once the first line goes out, so failures become a final record.
+                try:
+                    yield from _report_lines()
+                except HTTPException as e:
+                    yield json.dumps({"section": "error", "detail": e.detail}, default=str) + "\n"
+                except Exception as e:
+                    yield json.dumps({"section": "error", "detail": str(e) or type(e).__name__}, default=str) + "\n"
+
+            return StreamingResponse(_lines(), media_type="application/x-ndjson")
 
         @app.get("/intelligence/debug/ux-policy/eval")
         def debug_ux_policy_eval(
@@ -1838,6 +5915,22 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "summary": summary,
             }
 
+        replay_engines: OrderedDict[tuple[Any, ...], ReplayEngine] = OrderedDict()
+        replay_lock = threading.Lock()
+
+        def _replay_engine(key: tuple[Any, ...], *, org_id: str, raw_events: list[dict[str, Any]]) -> ReplayEngine:
+            """Reuse the engine for `key` while its event sequence (by id, in order) is unchanged."""
+            version = _fingerprint_request({"event_ids": [e.get("event_id") for e in raw_events]})
+            with replay_lock:
+                engine = replay_engines.get(key)
+                if engine is None or engine.version != version:
+                    engine = ReplayEngine(org_id=org_id, raw_events=raw_events, version=version)
+                    replay_engines[key] = engine
+                replay_engines.move_to_end(key)
+                while len(replay_engines) > max(1, REPLAY_ENGINE_LIMIT):
+                    replay_engines.popitem(last=False)
+                return engine
+
         @app.get("/intelligence/debug/replay-snapshot")
         def debug_replay_snapshot(
             *,
@@ -1875,9 +5968,17 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
             raw_events.sort(key=lambda r: str(r.get("timestamp") or ""))
             total = len(raw_events)
+            engine = _replay_engine(
+                (resolved_org, team_id, user_id, int(limit), str(llm_mode)),
+                org_id=resolved_org,
+                raw_events=raw_events,
+            )
+            if str(llm_mode or "off").lower() != "off" and len(engine.classified) < total:
+                # Warm the classification cache in model-sized batches before the sequential replay walk.
+                classification_cache.classify_many(raw_events[len(engine.classified) :], llm_mode=llm_mode)
 
             def _enrich_classified(raw: dict[str, Any]) -> dict[str, Any]:
-                classified = classify_event(raw, llm_mode=llm_mode)
+                classified = classify(raw, llm_mode=llm_mode)
 
                 ctx = classified.get("context")
                 if not isinstance(ctx, dict):
@@ -1935,9 +6036,10 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
             # If requested, compute a full timeline with derived fields (for slider labeling).
             timeline: list[dict[str, Any]] = []
-            classified_all: list[dict[str, Any]] | None = None
-            if bool(include_timeline):
-                classified_all = [_enrich_classified(e) for e in raw_events]
+            if bool(include_timeline) and engine.timeline is not None:
+                timeline = [dict(item) for item in engine.timeline]
+            elif bool(include_timeline):
+                classified_all = engine.classified_prefix(total, _enrich_classified)
                 for i, ev in enumerate(classified_all):
                     ctx = ev.get("context") if isinstance(ev.get("context"), dict) else {}
                     timeline.append(
@@ -1954,6 +6056,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                             "classification_confidence": ev.get("classification_confidence"),
                         }
                     )
+                engine.timeline = [dict(item) for item in timeline]
 
             # Build subset.
             subset_raw = raw_events[:m]
@@ -1967,108 +6070,100 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     "snapshot": None,
                 }
 
-            classified_subset = (
-                (classified_all or [])[:m] if classified_all is not None else [_enrich_classified(e) for e in subset_raw]
-            )
+            classified_subset = engine.classified_prefix(m, _enrich_classified)
 
             team_id_local = str(team_id or subset_raw[0].get("team_id") or "team_001")
-            user_ids = sorted({str(e.get("user_id")) for e in subset_raw if isinstance(e.get("user_id"), str)})
-
-            member_profiles: list[dict[str, Any]] = []
-            for uid in user_ids:
-                member_profiles.append(build_user_profile(uid, resolved_org, classified_subset))
-
-            team_profile = build_team_profile(
-                team_id_local,
-                resolved_org,
-                member_profiles,
-                classified_subset,
-                psychodynamics_config={
-                    "window": int(window),
-                    "layer_mode": str(layer_mode),
-                    "significance_mode": str(significance_mode),
-                },
-            )
+            # Profiles and discourse/decide artifacts are not incremental: they are built at the FSA
+            # checkpoint stride (see `ReplayEngine.derived_at`), so scrubbing inside a stride reuses them.
+            derived_m = engine.derived_at(m)
+            derived_raw = raw_events[:derived_m]
+            user_ids = sorted({str(e.get("user_id")) for e in derived_raw if isinstance(e.get("user_id"), str)})
+
+            def _derive() -> tuple[Any, ...]:
+                derived_classified = classified_subset[:derived_m]
+                member_profiles: list[dict[str, Any]] = []
+                for uid in user_ids:
+                    member_profiles.append(build_user_profile(uid, resolved_org, derived_classified))
 
-            # Discourse → Decide artifacts.
-            try:
-                insights = extract_insights(org_id=resolved_org, events=subset_raw, llm_mode=llm_mode)
-            except Exception:
-                insights = []
-            try:
-                cards = build_knowledge_cards(org_id=resolved_org, insights=insights)
-            except Exception:
-                cards = []
-            try:
-                directions = generate_strategic_directions(
-                    org_id=resolved_org, cards=cards, max_directions=max(1, int(direction_limit))
+                team_profile = build_team_profile(
+                    team_id_local,
+                    resolved_org,
+                    member_profiles,
+                    derived_classified,
+                    psychodynamics_config={
+                        "window": int(window),
+                        "layer_mode": str(layer_mode),
+                        "significance_mode": str(significance_mode),
+                    },
                 )
-            except Exception:
-                directions = []
 
-            ranked: list[dict[str, Any]] = []
-            hg_payload: dict[str, Any] | None = None
-            user_weights: dict[str, float] | None = None
-            if directions and user_ids:
+                # Discourse → Decide artifacts.
+                try:
+                    insights = extract_insights(
+                        org_id=resolved_org,
+                        events=derived_raw,
+                        llm_mode=llm_mode,
+                        **_classifier_kwargs(extract_insights, derived_raw, llm_mode=llm_mode),
+                    )
+                except Exception:
+                    insights = []
                 try:
-                    user_weights = derive_user_weights_from_profiles(member_profiles)
+                    cards = build_knowledge_cards(org_id=resolved_org, insights=insights)
                 except Exception:
-                    user_weights = None
+                    cards = []
                 try:
-                    hg = build_hypergraph(user_ids=user_ids, insights=insights, cards=cards, directions=directions)
-                    hg = _maybe_refine_hypergraph(hg)
-                    ranked = rank_directions_for_group(
-                        user_ids=user_ids,
-                        hg=hg,
-                        user_weights=user_weights or {},
-                        limit=max(1, int(direction_limit)),
+                    directions = generate_strategic_directions(
+                        org_id=resolved_org, cards=cards, max_directions=max(1, int(direction_limit))
                     )
-                    if bool(include_hypergraph):
-                        hg_payload = {
-                            "nodes": len(hg.node_ids),
-                            "edges": len(hg.edges),
-                            "node_ids": hg.node_ids,
-                            "node_types": hg.node_types,
-                            "hyperedges": hg.edges,
-                            "edge_weights": hg.edge_weights,
-                        }
                 except Exception:
-                    ranked = []
-                    hg_payload = None
-
-            # Do: simulate org/project FSA state evolution on the subset.
-            org_state: dict[str, Any] | None = None
-            project_states: dict[str, Any] = {}
-            for raw, classified in zip(subset_raw, classified_subset):
-                action = str(classified.get("action") or raw.get("event_type") or "")
-                if not action:
-                    continue
-                ts = str(raw.get("timestamp") or "") or None
-                eid = str(raw.get("event_id") or "") or None
-                uid = str(raw.get("user_id") or "") or None
-                org_state = apply_org_fsa_event(
-                    org_state,
-                    org_id=resolved_org,
-                    action=action,
-                    context={"event_data": raw.get("event_data") or {}},
-                    event_id=eid,
-                    user_id=uid,
-                    timestamp=ts,
-                )
+                    directions = []
+
+                ranked: list[dict[str, Any]] = []
+                hg_payload: dict[str, Any] | None = None
+                user_weights: dict[str, float] | None = None
+                if directions and user_ids:
+                    try:
+                        user_weights = derive_user_weights_from_profiles(member_profiles)
+                    except Exception:
+                        user_weights = None
+                    try:
+                        hg = build_hypergraph(user_ids=user_ids, insights=insights, cards=cards, directions=directions)
+                        hg = _maybe_refine_hypergraph(hg)
+                        ranked = rank_directions_for_group(
+                            user_ids=user_ids,
+                            hg=hg,
+                            user_weights=user_weights or {},
+                            limit=max(1, int(direction_limit)),
+                        )
+                        if bool(include_hypergraph):
+                            hg_payload = {
+                                "nodes": len(hg.node_ids),
+                                "edges": len(hg.edges),
+                                "node_ids": hg.node_ids,
+                                "node_types": hg.node_types,
+                                "hyperedges": hg.edges,
+                                "edge_weights": hg.edge_weights,
+                            }
+                    except Exception:
+                        ranked = []
+                        hg_payload = None
+                return member_profiles, team_profile, insights, cards, directions, ranked, hg_payload, user_weights
 
-                project_id = raw.get("project_id")
-                if isinstance(project_id, str) and project_id:
-                    prev_proj = project_states.get(project_id)
-                    project_states[project_id] = apply_project_fsa_event(
-                        prev_proj,
-                        org_id=resolved_org,
-                        project_id=project_id,
-                        action=action,
-                        context={"event_data": raw.get("event_data") or {}},
-                        event_id=eid,
-                        user_id=uid,
-                        timestamp=ts,
-                    )
+            derive_key = (
+                derived_m,
+                team_id_local,
+                int(window),
+                str(layer_mode),
+                str(significance_mode),
+                int(direction_limit),
+                bool(include_hypergraph),
+            )
+            member_profiles, team_profile, insights, cards, directions, ranked, hg_payload, user_weights = engine.memo(
+                derive_key, _derive
+            )
+
+            # Do: org/project FSA state at position m, replayed from the nearest checkpoint.
+            org_state, project_states = engine.fsa_at(m, _enrich_classified)
 
             # Surface a small, inspectable subset of events for UI detail panes.
             events_out: list[dict[str, Any]] | None = None
@@ -2104,6 +6199,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "snapshot": {
                     "range": {
                         "events_included": m,
+                        "derived_events_included": derived_m,
                         "start_ts": str(subset_raw[0].get("timestamp") or ""),
                         "end_ts": str(subset_raw[-1].get("timestamp") or ""),
                     },
@@ -2168,35 +6264,11 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
 
             raw_events = store.list_raw_events(org_id=resolved_org)
-            insights = extract_insights(org_id=resolved_org, events=raw_events, llm_mode="off")
-            cards = build_knowledge_cards(org_id=resolved_org, insights=insights)
+            insights, cards = _discourse_artifacts(resolved_org, raw_events)
 
-            # Card coherence: mean similarity between each insight embedding and its card centroid.
-            by_insight = {str(i.get("insight_id")): i for i in insights if isinstance(i.get("insight_id"), str)}
-            intra_sims: list[float] = []
-            card_sizes: list[int] = []
-            for card in cards:
-                centroid = card.get("embedding")
-                if not isinstance(centroid, list) or not centroid:
-                    continue
-                ids = card.get("insight_ids") if isinstance(card.get("insight_ids"), list) else []
-                ids = [str(x) for x in ids if isinstance(x, str)]
-                card_sizes.append(len(ids))
-                for iid in ids:
-                    ins = by_insight.get(iid)
-                    emb = ins.get("embedding") if isinstance(ins, dict) else None
-                    if isinstance(emb, list) and emb:
-                        intra_sims.append(float(cosine_similarity(centroid, emb)))
-
-            # Inter-card similarity (centroids).
-            centroids = [c.get("embedding") for c in cards if isinstance(c.get("embedding"), list) and c.get("embedding")]
-            inter_sims: list[float] = []
-            for i in range(len(centroids)):
-                for j in range(i + 1, len(centroids)):
-                    inter_sims.append(float(cosine_similarity(centroids[i], centroids[j])))
-
-            def _mean(xs: list[float]) -> float:
-                return float(sum(xs) / len(xs)) if xs else 0.0
+            # Card coherence (insight↔centroid) and inter-card similarity (centroid↔centroid).
+            coherence = _card_similarity_stats(cards, insights)
+            card_sizes: list[int] = coherence["card_sizes"]
 
             def _min(xs: list[int]) -> int:
                 return int(min(xs)) if xs else 0
@@ -2224,8 +6296,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     "size_min": _min(card_sizes),
                     "size_max": _max(card_sizes),
                     "size_mean": float(sum(card_sizes) / len(card_sizes)) if card_sizes else 0.0,
-                    "intra_similarity_mean": _mean(intra_sims),
-                    "inter_similarity_mean": _mean(inter_sims),
+                    "intra_similarity_mean": coherence["intra_similarity_mean"],
+                    "inter_similarity_mean": coherence["inter_similarity_mean"],
                 },
             }
 
@@ -2241,7 +6313,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
             prof = store.get_user_profile(org_id=resolved_org, user_id=user_id)
             if prof is None:
-                events = store.list_user_classified_events(org_id=resolved_org, user_id=user_id)
+                events = _user_classified_events(org_id=resolved_org, user_id=user_id)
                 prof = build_user_profile(user_id, resolved_org, events)
                 _upsert_user_profile(
                     prof,
@@ -2263,7 +6335,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             resolved_org = org_id or store.resolve_org_id(team_id=team_id, user_id=user_id)
             if not isinstance(resolved_org, str) or not resolved_org:
                 raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
-            events = store.list_user_classified_events(org_id=resolved_org, user_id=user_id, limit=5000)
+            events = _user_classified_events(org_id=resolved_org, user_id=user_id, limit=5000)
             return drift_report_user(events, user_id=user_id, window=int(window))
 
         @app.get("/intelligence/debug/profiles/team")
@@ -2284,13 +6356,13 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
             prof = store.get_team_profile(org_id=resolved_org, team_id=team_id)
             if prof is None or bool(recompute):
-                team_events = store.list_team_classified_events(org_id=resolved_org, team_id=team_id)
+                team_events = _team_classified_events(org_id=resolved_org, team_id=team_id)
                 member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
                 member_profiles: list[dict[str, Any]] = []
                 for uid in member_ids:
                     up = store.get_user_profile(org_id=resolved_org, user_id=uid)
                     if up is None:
-                        u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                        u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                         up = build_user_profile(uid, resolved_org, u_events)
                         _upsert_user_profile(
                             up,
@@ -2318,166 +6390,361 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     org_id=resolved_org,
                     team_id=team_id,
                     pipeline_version=PIPELINE_VERSION,
-                )
-            return prof
-
-    def _dag_view_from_graph(graph: dict[str, Any]) -> dict[str, Any]:
-        nodes_raw = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
-        edges_raw = graph.get("edges") if isinstance(graph.get("edges"), list) else []
-
-        node_ids: set[str] = {str(k) for k in nodes_raw.keys() if isinstance(k, str) and k}
-        edge_pairs: list[tuple[str, str]] = []
-        blocked_by: dict[str, list[str]] = {}
-        for e in edges_raw:
-            if not isinstance(e, dict):
-                continue
-            if str(e.get("type") or "depends_on") != "depends_on":
-                continue
-            src = e.get("from")
-            dst = e.get("to")
-            if not isinstance(src, str) or not src:
-                continue
-            if not isinstance(dst, str) or not dst:
-                continue
-            node_ids.add(src)
-            node_ids.add(dst)
-            edge_pairs.append((src, dst))
-            blocked_by.setdefault(dst, []).append(src)
+                )
+            return prof
 
-        for nid in node_ids:
-            blocked_by.setdefault(nid, [])
-        for nid, preds in blocked_by.items():
-            blocked_by[nid] = sorted(set(preds))
+    dag_cache: OrderedDict[tuple[str, ...], IncrementalDag] = OrderedDict()
+    dag_lock = threading.Lock()
+    plan_edge_locks: OrderedDict[tuple[str, ...], threading.Lock] = OrderedDict()
 
-        topo = topological_sort(nodes=sorted(node_ids), edges=edge_pairs)
-        is_dag = topo is not None
-        levels = compute_levels(nodes=sorted(node_ids), edges=edge_pairs) if is_dag else {}
-        level_groups = [{"level": lvl, "node_ids": ids} for (lvl, ids) in iter_level_groups(levels)]
+    def _dag(scope: tuple[str, ...], graph: dict[str, Any]) -> IncrementalDag:
+        """Cached DAG for `scope`, reused while it matches the graph's structural digest (hold dag_lock).
 
-        return {
-            "is_dag": bool(is_dag),
-            "topo_order": topo or [],
-            "levels": levels,
-            "level_groups": level_groups,
-            "blocked_by": blocked_by,
-            "edge_pairs": edge_pairs,
-            "node_ids": sorted(node_ids),
+        The digest covers the exact node and edge sets, so a graph changed by another worker or a
+        direct store write is rebuilt even when its node and edge counts are unchanged.
+        """
+        version = _graph_version(graph)
+        dag = dag_cache.get(scope)
+        if dag is None or dag.version != version:
+            dag = IncrementalDag.from_graph(graph)
+            dag_cache[scope] = dag
+            while len(dag_cache) > max(1, PLAN_CACHE_LIMIT):
+                dag_cache.popitem(last=False)
+        dag_cache.move_to_end(scope)
+        return dag
+
+    def _plan_edge_lock(scope: tuple[str, ...]) -> threading.Lock:
+        """Serialises edge mutations per plan scope within this process (LRU-bounded; held locks stay)."""
+        with dag_lock:
+            lock = plan_edge_locks.get(scope)
+            if lock is None:
+                lock = plan_edge_locks[scope] = threading.Lock()
+                for stale in list(plan_edge_locks)[: max(0, len(plan_edge_locks) - max(1, PLAN_CACHE_LIMIT))]:
+                    if not plan_edge_locks[stale].locked():
+                        del plan_edge_locks[stale]
+            plan_edge_locks.move_to_end(scope)
+            return lock
+
+    def _plan_edge_change(raw: dict[str, Any], kind: str) -> tuple[str, str, str] | None:
+        """(op, from, to) for an ingested depends_on add/remove event on a `kind` graph."""
+        event_type = str(raw.get("event_type") or "")
+        prefix = "project.depends_on." if kind == "org" else "task.depends_on."
+        if not event_type.startswith(prefix):
+            return None
+        op = event_type[len(prefix) :]
+        data = raw.get("event_data") if isinstance(raw.get("event_data"), dict) else {}
+        node_key, dep_key = ("project_id", "depends_on_project_id") if kind == "org" else ("task_id", "depends_on_task_id")
+        dst, src = data.get(node_key), data.get(dep_key)
+        if op not in {"add", "remove"} or not isinstance(src, str) or not src or not isinstance(dst, str) or not dst:
+            return None
+        return op, src, dst
+
+    def _note_plan_graph(scope: tuple[str, ...], graph: Any, raw: dict[str, Any]) -> None:
+        """Ingest hook: apply a single depends_on edge change to the cached DAG in place.
+
+        The result is kept only when its digest then matches the stored graph's; any other change
+        (or a cache that was already behind) is left for `_dag` to rebuild on the next read.
+        """
+        edge = _plan_edge_change(raw, scope[0])
+        if edge is None or not isinstance(graph, dict):
+            return
+        with dag_lock:
+            dag = dag_cache.get(scope)
+            if dag is None:
+                return
+            op, src, dst = edge
+            if op == "add":
+                ok = dag.add_edge(src, dst)
+            else:
+                dag.remove_edge(src, dst)
+                ok = True
+            if not ok or dag.version != _graph_version(graph):
+                dag_cache.pop(scope, None)
+
+    def _closes_cycle(graph: Any, src: str, dst: str) -> bool:
+        """Whether the stored graph has a cycle through its `src -> dst` edge (re-checked after a write)."""
+        dag = IncrementalDag.from_graph(graph if isinstance(graph, dict) else {})
+        dag.remove_edge(src, dst)
+        return dag.would_create_cycle(src, dst)
+
+    def _confirm_plan_edge(raw_event: dict[str, Any], *, src: str, dst: str, graph: Any) -> None:
+        """Re-check a committed edge add against the stored graph and revert it if it closed a cycle.
+
+        The edge endpoints run the cycle check and the write in one store transaction under the
+        scope's edge lock, but that lock is per process: another worker can commit the reverse
+        edge concurrently. Whichever request re-checks second sees both edges, ingests a
+        compensating remove and fails with 409, so the stored graph stays acyclic.
+        """
+        if not _closes_cycle(graph, src, dst):
+            return
+        undo = {
+            **raw_event,
+            "event_id": str(uuid.uuid4()),
+            "event_type": str(raw_event.get("event_type") or "").replace(".add", ".remove"),
+            "timestamp": utc_now_iso8601(),
         }
+        _ingest_raw_event(undo, llm_mode="off", update_profiles=False)
+        raise HTTPException(status_code=409, detail="a concurrent edge change made this edge close a cycle; it was reverted.")
+
+    def _dag_view(scope: tuple[str, ...], graph: dict[str, Any]) -> dict[str, Any]:
+        with dag_lock:
+            return _dag(scope, graph).view()
+
+    readiness_trackers: OrderedDict[tuple[str, ...], ReadinessTracker] = OrderedDict()
+    # Per tracked scope: the latest ingested FSA state, the node ids its events named and the edge
+    # changes they carried, applied lazily (as a delta) by readers and streams.
+    pending_plan_states: dict[tuple[str, ...], tuple[dict[str, Any], set[str], list[tuple[str, str, str]]]] = {}
+    readiness_rules: dict[str, tuple[str, frozenset[str], str]] = {
+        "org": ("project_graph", frozenset({"completed"}), "waiting_for_project_id"),
+        "project": ("task_graph", frozenset({"completed_approved"}), "waiting_for_task_id"),
+    }
 
-    def _ready_map(*, blocked_by: dict[str, list[str]], state_by_id: dict[str, str], done_states: set[str]) -> dict[str, bool]:
-        out: dict[str, bool] = {}
-        for nid, preds in blocked_by.items():
-            if not preds:
-                out[nid] = True
-                continue
-            ok = True
-            for pred in preds:
-                if state_by_id.get(pred) not in done_states:
-                    ok = False
-                    break
-            out[nid] = ok
-        return out
+    def _plan_graph_states(kind: str, state: dict[str, Any]) -> tuple[dict[str, Any], dict[str, str]]:
+        graph_key = readiness_rules[kind][0]
+        graph = state.get(graph_key) if isinstance(state.get(graph_key), dict) else {"nodes": {}, "edges": []}
+        if kind == "org":
+            nodes = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
+            state_by_id = {
+                str(pid): str(meta.get("state") or "")
+                for pid, meta in nodes.items()
+                if isinstance(pid, str) and isinstance(meta, dict)
+            }
+        else:
+            tasks = state.get("tasks") if isinstance(state.get("tasks"), dict) else {}
+            state_by_id = {str(k): str(v) for k, v in tasks.items() if isinstance(k, str) and isinstance(v, str)}
+        return graph, state_by_id
 
-    def _block_status(
-        *,
-        meta: dict[str, Any],
-        now: datetime,
-        state_by_id: dict[str, str],
-        done_states: set[str],
-        wait_key: str,
-    ) -> tuple[bool, dict[str, Any]]:
-        if not isinstance(meta, dict):
-            return False, {}
-        block_type = str(meta.get("block_type") or "").strip().lower()
-        blocked_until = meta.get("blocked_until")
-        reason = meta.get("block_reason") or meta.get("reason")
-        note = meta.get("block_note")
-
-        # Time blocks.
-        if block_type == "time" or (isinstance(blocked_until, str) and blocked_until.strip()):
-            until_str = blocked_until if isinstance(blocked_until, str) and blocked_until.strip() else None
-            if until_str is None:
-                return True, {"block_type": "time", "blocked_until": None, "reason": reason, "note": note}
-            try:
-                until_dt = parse_iso8601(until_str)
-                return until_dt > now, {"block_type": "time", "blocked_until": until_str, "reason": reason, "note": note}
-            except Exception:
-                return True, {"block_type": "time", "blocked_until": until_str, "reason": reason, "note": note}
-
-        # Memory blocks.
-        waiting_for = meta.get(wait_key)
-        waiting_for = waiting_for if isinstance(waiting_for, str) and waiting_for.strip() else None
-        waiting_for_external = meta.get("waiting_for_external")
-        if block_type == "memory" or waiting_for is not None or bool(waiting_for_external):
-            resolved_by_dependency = waiting_for is not None and state_by_id.get(waiting_for) in done_states
-            if resolved_by_dependency and not bool(waiting_for_external):
-                return False, {}
-            return True, {
-                "block_type": "memory",
-                "waiting_for": waiting_for,
-                "waiting_for_external": bool(waiting_for_external),
-                "reason": reason,
-                "note": note,
+    def _plan_stamp(state: Any) -> Any:
+        """Cheap change marker of a stored FSA state (None when it carries none)."""
+        if not isinstance(state, dict):
+            return None
+        stamp = (state.get("updated_at"), state.get("last_event_id"))
+        return stamp if any(stamp) else None
+
+    def _readiness(scope: tuple[str, ...], state: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Ready/blocked snapshot for a plan scope, fully re-syncing its tracker with the given FSA state."""
+        _, done_states, wait_key = readiness_rules[scope[0]]
+        graph, state_by_id = _plan_graph_states(scope[0], state)
+        nodes = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
+        version = _graph_version(graph, any_type=True)
+        with dag_lock:
+            pending = pending_plan_states.get(scope)
+            if pending is not None and pending[0] is state:
+                pending_plan_states.pop(scope, None)
+            tracker = readiness_trackers.get(scope)
+            if tracker is None or tracker.version != version:
+                tracker = ReadinessTracker(graph, done_states=done_states, wait_key=wait_key)
+                readiness_trackers[scope] = tracker
+                while len(readiness_trackers) > max(1, PLAN_CACHE_LIMIT):
+                    evicted, _ = readiness_trackers.popitem(last=False)
+                    pending_plan_states.pop(evicted, None)
+            readiness_trackers.move_to_end(scope)
+            tracker.sync(nodes, state_by_id, now=time.time())
+            tracker.stamp = _plan_stamp(state)
+            return tracker.snapshot()
+
+    def _readiness_delta(
+        scope: tuple[str, ...],
+        state: dict[str, Any],
+        changed: set[str],
+        edges: list[tuple[str, str, str]],
+    ) -> bool:
+        """Advance a tracker by the nodes and edges ingested events named, in O(degree); False when
+        the graph moved in a way those events do not explain (the caller then re-syncs fully)."""
+        graph_key = readiness_rules[scope[0]][0]
+        graph = state.get(graph_key) if isinstance(state.get(graph_key), dict) else {}
+        nodes = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
+        edges_raw = graph.get("edges") if isinstance(graph.get("edges"), list) else []
+        touched = set(changed)
+        for _, src, dst in edges:
+            touched.update((src, dst))
+        if scope[0] == "org":
+            state_by_id = {
+                nid: str(nodes[nid].get("state") or "") for nid in touched if isinstance(nodes.get(nid), dict)
             }
+        else:
+            tasks = state.get("tasks") if isinstance(state.get("tasks"), dict) else {}
+            state_by_id = {nid: tasks[nid] for nid in touched if isinstance(tasks.get(nid), str)}
+        now = time.time()
+        with dag_lock:
+            tracker = readiness_trackers.get(scope)
+            if tracker is None:
+                return False
+            pending = pending_plan_states.get(scope)
+            if pending is not None and pending[0] is state:
+                pending_plan_states.pop(scope, None)
+            for op, src, dst in edges:
+                if op == "add":
+                    tracker.add_edge(src, dst, now=now)
+                else:
+                    tracker.remove_edge(src, dst, now=now)
+            if tracker.edge_count != len(edges_raw) or any(nid not in tracker.pending for nid in touched if nid in nodes):
+                readiness_trackers.pop(scope, None)
+                return False
+            tracker.sync(nodes, state_by_id, now=now, changed=touched)
+            tracker.stamp = _plan_stamp(state)
+            return True
+
+    def _observe_plan_state(scope: tuple[str, ...], state: Any, raw: dict[str, Any]) -> None:
+        """Ingest hook: remember the newest FSA state of a tracked scope plus the node ids and edge
+        change its event named; the readiness stream applies them on its next tick, so ingest never
+        pays for a readiness sync."""
+        if scope not in readiness_trackers or not isinstance(state, dict):
+            return
+        data = raw.get("event_data") if isinstance(raw.get("event_data"), dict) else {}
+        named = {str(v) for k, v in data.items() if k.endswith("_id") and isinstance(v, str) and v}
+        if scope[0] == "org" and isinstance(raw.get("project_id"), str) and raw.get("project_id"):
+            named.add(raw["project_id"])
+        edge = _plan_edge_change(raw, scope[0])
+        with dag_lock:
+            _, changed, edges = pending_plan_states.get(scope) or (None, set(), [])
+            changed |= named
+            if edge is not None:
+                edges.append(edge)
+            pending_plan_states[scope] = (state, changed, edges)
+
+    def _plan_state(scope: tuple[str, ...]) -> Any:
+        if scope[0] == "project":
+            return store.get_project_fsa_state(org_id=scope[1], project_id=scope[2])
+        return store.get_org_fsa_state(org_id=scope[1])
+
+    def _readiness_tick(
+        scope: tuple[str, ...],
+        tracker: ReadinessTracker | None,
+        last_seq: int,
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]], ReadinessTracker | None, int]:
+        """One stream step (blocking; run off the event loop): apply this process's pending ingest
+        delta, else reload the stored state (other workers write it too) and re-sync when its stamp
+        moved; then release expired time blocks and collect changes since `last_seq`."""
+        with dag_lock:
+            pending = pending_plan_states.get(scope)
+        if pending is not None:
+            state, changed, edges = pending
+            if not _readiness_delta(scope, state, changed, edges):
+                _readiness(scope, state)
+        else:
+            stored = _plan_state(scope)
+            current = readiness_trackers.get(scope)
+            if isinstance(stored, dict) and (current is None or current.stamp is None or current.stamp != _plan_stamp(stored)):
+                _readiness(scope, stored)
+        with dag_lock:
+            current = readiness_trackers.get(scope)
+            if current is None:
+                return None, [], tracker, last_seq
+            current.advance(time.time())
+            if current is not tracker:
+                # Graph structure changed; the tracker was rebuilt, so resend a full snapshot.
+                payload = {"type": "initial", "scope": list(scope), **current.snapshot()}
+                return payload, [], current, current.seq
+            changes = [change for _, change in current.since(last_seq)]
+            return None, changes, current, current.seq
+
+    def _org_projects_plan(resolved_org: str, state: dict[str, Any]) -> dict[str, Any]:
+        """DAG view, readiness and block status for the org project graph (CPU-bound)."""
+        graph = state.get("project_graph") if isinstance(state.get("project_graph"), dict) else {"nodes": {}, "edges": []}
+        view = _dag_view(("org", resolved_org), graph)
+        readiness = _readiness(("org", resolved_org), state)
+        return {
+            "org_id": resolved_org,
+            "graph": graph,
+            "view": view,
+            "ready": readiness["ready"],
+            "deps_ready": readiness["deps_ready"],
+            "blocked": readiness["blocked"],
+            "blocks": readiness["blocks"],
+        }
 
-        return False, {}
+    def _project_tasks_plan(resolved_org: str, project_id: str, state: dict[str, Any]) -> dict[str, Any]:
+        """DAG view, readiness and block status for a project task graph (CPU-bound)."""
+        graph = state.get("task_graph") if isinstance(state.get("task_graph"), dict) else {"nodes": {}, "edges": []}
+        view = _dag_view(("project", resolved_org, project_id), graph)
+        readiness = _readiness(("project", resolved_org, project_id), state)
+        return {
+            "org_id": resolved_org,
+            "project_id": project_id,
+            "graph": graph,
+            "view": view,
+            "ready": readiness["ready"],
+            "deps_ready": readiness["deps_ready"],
+            "blocked": readiness["blocked"],
+            "blocks": readiness["blocks"],
+        }
 
     @app.get("/intelligence/state/org")
-    def get_org_state(*, org_id: Optional[str] = None, team_id: Optional[str] = None) -> dict[str, Any]:
-        resolved_org = org_id or store.resolve_org_id(team_id=team_id)
+    async def get_org_state(*, org_id: Optional[str] = None, team_id: Optional[str] = None) -> dict[str, Any]:
+        resolved_org = org_id or await astore.resolve_org_id(team_id=team_id)
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
-        state = store.get_org_fsa_state(org_id=resolved_org)
+        state = await astore.get_org_fsa_state(org_id=resolved_org)
         if state is None:
             raise HTTPException(status_code=404, detail="org_fsa_state not found; ingest events first.")
         return state
 
     @app.get("/intelligence/plan/org/projects")
-    def get_org_projects_plan(*, org_id: Optional[str] = None, team_id: Optional[str] = None) -> dict[str, Any]:
+    async def get_org_projects_plan(*, org_id: Optional[str] = None, team_id: Optional[str] = None) -> dict[str, Any]:
         """Org-level project dependency plan (DAG) derived from org_fsa_state.project_graph."""
-        resolved_org = org_id or store.resolve_org_id(team_id=team_id)
+        resolved_org = org_id or await astore.resolve_org_id(team_id=team_id)
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
-        state = store.get_org_fsa_state(org_id=resolved_org)
+        state = await astore.get_org_fsa_state(org_id=resolved_org)
         if state is None:
             raise HTTPException(status_code=404, detail="org_fsa_state not found; ingest events first.")
+        return await run_in_threadpool(_org_projects_plan, resolved_org, state)
 
-        graph = state.get("project_graph") if isinstance(state.get("project_graph"), dict) else {"nodes": {}, "edges": []}
-        view = _dag_view_from_graph(graph)
-        nodes = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
-        state_by_id = {
-            str(pid): str(meta.get("state") or "")
-            for pid, meta in nodes.items()
-            if isinstance(pid, str) and isinstance(meta, dict)
-        }
-        deps_ready = _ready_map(blocked_by=view["blocked_by"], state_by_id=state_by_id, done_states={"completed"})
+    @app.get("/intelligence/plan/readiness/stream")
+    async def stream_plan_readiness(
+        *,
+        org_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+    ):
+        """
+        Server-Sent Events stream of readiness changes for the org project plan,
+        or for a project's task plan when project_id is given.
+        """
+        from starlette.responses import StreamingResponse
+        import asyncio
 
-        now = datetime.now(timezone.utc)
-        blocks: dict[str, dict[str, Any]] = {}
-        blocked: dict[str, bool] = {}
-        for pid in view["node_ids"]:
-            meta = nodes.get(pid) if isinstance(nodes.get(pid), dict) else {}
-            is_blocked, info = _block_status(
-                meta=meta if isinstance(meta, dict) else {},
-                now=now,
-                state_by_id=state_by_id,
-                done_states={"completed"},
-                wait_key="waiting_for_project_id",
-            )
-            blocked[pid] = bool(is_blocked)
-            if info:
-                blocks[pid] = info
+        resolved_org = org_id or await astore.resolve_org_id(team_id=team_id)
+        if not isinstance(resolved_org, str) or not resolved_org:
+            raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
+        if project_id:
+            scope: tuple[str, ...] = ("project", resolved_org, project_id)
+            state = await astore.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
+        else:
+            scope = ("org", resolved_org)
+            state = await astore.get_org_fsa_state(org_id=resolved_org)
+        if state is None:
+            raise HTTPException(status_code=404, detail="fsa state not found; ingest events first.")
+        await run_in_threadpool(_readiness, scope, state)
 
-        ready = {pid: bool(deps_ready.get(pid, True)) and not bool(blocked.get(pid)) for pid in view["node_ids"]}
-        return {
-            "org_id": resolved_org,
-            "graph": graph,
-            "view": view,
-            "ready": ready,
-            "deps_ready": deps_ready,
-            "blocked": blocked,
-            "blocks": blocks,
-        }
+        async def event_generator():
+            tracker = readiness_trackers.get(scope)
+            last_seq = tracker.seq if tracker is not None else 0
+            snapshot = tracker.snapshot() if tracker is not None else {}
+            yield f"data: {json.dumps({'type': 'initial', 'scope': list(scope), **snapshot})}\n\n"
+
+            while True:
+                await asyncio.sleep(1.0)
+                # dag_lock is a threading lock and syncing may hit the store; keep both off the loop.
+                payload, changes, tracker, last_seq = await run_in_threadpool(
+                    _readiness_tick, scope, tracker, last_seq
+                )
+                if payload is not None:
+                    yield f"data: {json.dumps(payload)}\n\n"
+                elif changes:
+                    yield f"data: {json.dumps({'type': 'update', 'changes': changes})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'type': 'heartbeat'})}\n\n"
+
+        return StreamingResponse(
+            event_generator(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+            },
+        )
 
     @app.post("/intelligence/plan/org/projects/edges")
     def mutate_org_projects_edges(payload: dict[str, Any]) -> dict[str, Any]:
@@ -2499,49 +6766,60 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         dry_run = bool(payload.get("dry_run"))
         team_id = payload.get("team_id")
 
-        state = store.get_org_fsa_state(org_id=resolved_org)
-        if state is None:
-            raise HTTPException(status_code=404, detail="org_fsa_state not found; ingest events first.")
-
-        graph = state.get("project_graph") if isinstance(state.get("project_graph"), dict) else {"nodes": {}, "edges": []}
-        view = _dag_view_from_graph(graph)
-
-        if op == "add":
-            if would_create_cycle(nodes=view["node_ids"], edges=view["edge_pairs"], new_edge=(src, dst)):
-                raise HTTPException(status_code=400, detail="edge would create a cycle; DAG invariant violated.")
-        elif op == "remove":
-            pass
-        else:
-            raise HTTPException(status_code=400, detail="op must be 'add' or 'remove'.")
-
-        if dry_run:
-            return {"ok": True, "dry_run": True, "op": op, "from": src, "to": dst, "would_create_cycle": False}
-
-        now = utc_now_iso8601()
-        event_type = "project.depends_on.add" if op == "add" else "project.depends_on.remove"
-        raw_event = {
-            "event_id": str(uuid.uuid4()),
-            "event_type": event_type,
-            "event_data": {
-                "project_id": dst,
-                "depends_on_project_id": src,
-                "reason": reason,
-                "evidence_event_ids": evidence if isinstance(evidence, list) else [],
-            },
-            "context": {
-                "collectium_context": {"phase": "do", "block": "task"},
-                "attribution": {"actor_user_id": user_id, "reason": reason},
-            },
-            "user_id": user_id,
-            "org_id": resolved_org,
-            "team_id": team_id,
-            "project_id": None,
-            "timestamp": now,
-        }
-        _ingest_raw_event(raw_event, llm_mode="off", update_profiles=False)
+        scope = ("org", resolved_org)
+        # Hold the scope's edge lock and one store transaction from the cycle check through the
+        # write, so two concurrent requests (A->B and B->A) cannot both pass the check; the add is
+        # then re-checked against the committed graph to cover writers in other processes.
+        with _plan_edge_lock(scope):
+            with _store_transaction():
+                state = store.get_org_fsa_state(org_id=resolved_org)
+                if state is None:
+                    raise HTTPException(status_code=404, detail="org_fsa_state not found; ingest events first.")
+
+                graph = state.get("project_graph")
+                if not isinstance(graph, dict):
+                    graph = {"nodes": {}, "edges": []}
+
+                if op == "add":
+                    with dag_lock:
+                        creates_cycle = _dag(scope, graph).would_create_cycle(src, dst)
+                    if creates_cycle:
+                        raise HTTPException(status_code=400, detail="edge would create a cycle; DAG invariant violated.")
+                elif op == "remove":
+                    pass
+                else:
+                    raise HTTPException(status_code=400, detail="op must be 'add' or 'remove'.")
+
+                if dry_run:
+                    return {"ok": True, "dry_run": True, "op": op, "from": src, "to": dst, "would_create_cycle": False}
+
+                now = utc_now_iso8601()
+                event_type = "project.depends_on.add" if op == "add" else "project.depends_on.remove"
+                raw_event = {
+                    "event_id": str(uuid.uuid4()),
+                    "event_type": event_type,
+                    "event_data": {
+                        "project_id": dst,
+                        "depends_on_project_id": src,
+                        "reason": reason,
+                        "evidence_event_ids": evidence if isinstance(evidence, list) else [],
+                    },
+                    "context": {
+                        "collectium_context": {"phase": "do", "block": "task"},
+                        "attribution": {"actor_user_id": user_id, "reason": reason},
+                    },
+                    "user_id": user_id,
+                    "org_id": resolved_org,
+                    "team_id": team_id,
+                    "project_id": None,
+                    "timestamp": now,
+                }
+                _ingest_raw_event_writes(raw_event, classify(raw_event, llm_mode="off"), update_profiles=False)
 
-        updated = store.get_org_fsa_state(org_id=resolved_org)
-        return {"ok": True, "org_id": resolved_org, "state": updated}
+            updated = store.get_org_fsa_state(org_id=resolved_org)
+            if op == "add" and isinstance(updated, dict):
+                _confirm_plan_edge(raw_event, src=src, dst=dst, graph=updated.get("project_graph"))
+            return {"ok": True, "org_id": resolved_org, "state": updated}
 
     @app.post("/intelligence/plan/org/projects/blocks")
     def mutate_org_projects_blocks(payload: dict[str, Any]) -> dict[str, Any]:
@@ -2603,72 +6881,37 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         return {"ok": True, "org_id": resolved_org, "state": updated}
 
     @app.get("/intelligence/state/project")
-    def get_project_state(
+    async def get_project_state(
         *,
         project_id: str,
         org_id: Optional[str] = None,
         team_id: Optional[str] = None,
     ) -> dict[str, Any]:
-        resolved_org = org_id or store.resolve_org_id(team_id=team_id)
+        resolved_org = org_id or await astore.resolve_org_id(team_id=team_id)
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
         if not project_id:
             raise HTTPException(status_code=400, detail="project_id is required.")
-        state = store.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
+        state = await astore.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
         if state is None:
             raise HTTPException(status_code=404, detail="project_fsa_state not found; ingest project events first.")
         return state
 
     @app.get("/intelligence/projects/{project_id}/plan/tasks")
-    def get_project_tasks_plan(
+    async def get_project_tasks_plan(
         project_id: str,
         *,
         org_id: Optional[str] = None,
         team_id: Optional[str] = None,
     ) -> dict[str, Any]:
         """Project-level task dependency plan (DAG) derived from project_fsa_state.task_graph."""
-        resolved_org = org_id or store.resolve_org_id(team_id=team_id)
+        resolved_org = org_id or await astore.resolve_org_id(team_id=team_id)
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
-        state = store.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
+        state = await astore.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
         if state is None:
             raise HTTPException(status_code=404, detail="project_fsa_state not found; ingest project events first.")
-        graph = state.get("task_graph") if isinstance(state.get("task_graph"), dict) else {"nodes": {}, "edges": []}
-        view = _dag_view_from_graph(graph)
-
-        tasks = state.get("tasks") if isinstance(state.get("tasks"), dict) else {}
-        state_by_id = {str(k): str(v) for k, v in tasks.items() if isinstance(k, str) and isinstance(v, str)}
-        deps_ready = _ready_map(blocked_by=view["blocked_by"], state_by_id=state_by_id, done_states={"completed_approved"})
-
-        nodes = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
-        now = datetime.now(timezone.utc)
-        blocks: dict[str, dict[str, Any]] = {}
-        blocked: dict[str, bool] = {}
-        for tid in view["node_ids"]:
-            meta = nodes.get(tid) if isinstance(nodes.get(tid), dict) else {}
-            is_blocked, info = _block_status(
-                meta=meta if isinstance(meta, dict) else {},
-                now=now,
-                state_by_id=state_by_id,
-                done_states={"completed_approved"},
-                wait_key="waiting_for_task_id",
-            )
-            blocked[tid] = bool(is_blocked)
-            if info:
-                blocks[tid] = info
-
-        ready = {tid: bool(deps_ready.get(tid, True)) and not bool(blocked.get(tid)) for tid in view["node_ids"]}
-
-        return {
-            "org_id": resolved_org,
-            "project_id": project_id,
-            "graph": graph,
-            "view": view,
-            "ready": ready,
-            "deps_ready": deps_ready,
-            "blocked": blocked,
-            "blocks": blocks,
-        }
+        return await run_in_threadpool(_project_tasks_plan, resolved_org, project_id, state)
 
     @app.post("/intelligence/projects/{project_id}/plan/tasks/edges")
     def mutate_project_task_edges(
@@ -2695,49 +6938,60 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         evidence = payload.get("evidence_event_ids")
         dry_run = bool(payload.get("dry_run"))
 
-        state = store.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
-        if state is None:
-            raise HTTPException(status_code=404, detail="project_fsa_state not found; ingest project events first.")
-
-        graph = state.get("task_graph") if isinstance(state.get("task_graph"), dict) else {"nodes": {}, "edges": []}
-        view = _dag_view_from_graph(graph)
-
-        if op == "add":
-            if would_create_cycle(nodes=view["node_ids"], edges=view["edge_pairs"], new_edge=(src, dst)):
-                raise HTTPException(status_code=400, detail="edge would create a cycle; DAG invariant violated.")
-        elif op == "remove":
-            pass
-        else:
-            raise HTTPException(status_code=400, detail="op must be 'add' or 'remove'.")
-
-        if dry_run:
-            return {"ok": True, "dry_run": True, "op": op, "from": src, "to": dst, "would_create_cycle": False}
-
-        now = utc_now_iso8601()
-        event_type = "task.depends_on.add" if op == "add" else "task.depends_on.remove"
-        raw_event = {
-            "event_id": str(uuid.uuid4()),
-            "event_type": event_type,
-            "event_data": {
-                "task_id": dst,
-                "depends_on_task_id": src,
-                "reason": reason,
-                "evidence_event_ids": evidence if isinstance(evidence, list) else [],
-            },
-            "context": {
-                "collectium_context": {"phase": "do", "block": "task"},
-                "attribution": {"actor_user_id": user_id, "reason": reason},
-            },
-            "user_id": user_id,
-            "org_id": resolved_org,
-            "team_id": team_id,
-            "project_id": project_id,
-            "timestamp": now,
-        }
-        _ingest_raw_event(raw_event, llm_mode="off", update_profiles=False)
+        scope = ("project", resolved_org, project_id)
+        # Hold the scope's edge lock and one store transaction from the cycle check through the
+        # write, so two concurrent requests (A->B and B->A) cannot both pass the check; the add is
+        # then re-checked against the committed graph to cover writers in other processes.
+        with _plan_edge_lock(scope):
+            with _store_transaction():
+                state = store.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
+                if state is None:
+                    raise HTTPException(status_code=404, detail="project_fsa_state not found; ingest project events first.")
+
+                graph = state.get("task_graph")
+                if not isinstance(graph, dict):
+                    graph = {"nodes": {}, "edges": []}
+
+                if op == "add":
+                    with dag_lock:
+                        creates_cycle = _dag(scope, graph).would_create_cycle(src, dst)
+                    if creates_cycle:
+                        raise HTTPException(status_code=400, detail="edge would create a cycle; DAG invariant violated.")
+                elif op == "remove":
+                    pass
+                else:
+                    raise HTTPException(status_code=400, detail="op must be 'add' or 'remove'.")
+
+                if dry_run:
+                    return {"ok": True, "dry_run": True, "op": op, "from": src, "to": dst, "would_create_cycle": False}
+
+                now = utc_now_iso8601()
+                event_type = "task.depends_on.add" if op == "add" else "task.depends_on.remove"
+                raw_event = {
+                    "event_id": str(uuid.uuid4()),
+                    "event_type": event_type,
+                    "event_data": {
+                        "task_id": dst,
+                        "depends_on_task_id": src,
+                        "reason": reason,
+                        "evidence_event_ids": evidence if isinstance(evidence, list) else [],
+                    },
+                    "context": {
+                        "collectium_context": {"phase": "do", "block": "task"},
+                        "attribution": {"actor_user_id": user_id, "reason": reason},
+                    },
+                    "user_id": user_id,
+                    "org_id": resolved_org,
+                    "team_id": team_id,
+                    "project_id": project_id,
+                    "timestamp": now,
+                }
+                _ingest_raw_event_writes(raw_event, classify(raw_event, llm_mode="off"), update_profiles=False)
 
-        updated = store.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
-        return {"ok": True, "org_id": resolved_org, "project_id": project_id, "state": updated}
+            updated = store.get_project_fsa_state(org_id=resolved_org, project_id=project_id)
+            if op == "add" and isinstance(updated, dict):
+                _confirm_plan_edge(raw_event, src=src, dst=dst, graph=updated.get("task_graph"))
+            return {"ok": True, "org_id": resolved_org, "project_id": project_id, "state": updated}
 
     @app.post("/intelligence/projects/{project_id}/plan/tasks/blocks")
     def mutate_project_task_blocks(
@@ -2815,7 +7069,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         team_profile = store.get_team_profile(org_id=resolved_org, team_id=team_id)
         if team_profile is None:
-            team_events = store.list_team_classified_events(org_id=resolved_org, team_id=team_id)
+            team_events = _team_classified_events(org_id=resolved_org, team_id=team_id)
             member_ids = sorted(
                 {str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)}
             )
@@ -2823,7 +7077,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             for uid in member_ids:
                 prof = store.get_user_profile(org_id=resolved_org, user_id=uid)
                 if prof is None:
-                    u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                    u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                     prof = build_user_profile(uid, resolved_org, u_events)
                     _upsert_user_profile(
                         prof,
@@ -2841,13 +7095,13 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 pipeline_version=PIPELINE_VERSION,
             )
 
-        team_events = store.list_team_classified_events(org_id=resolved_org, team_id=team_id)
+        team_events = _team_classified_events(org_id=resolved_org, team_id=team_id)
         member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
         user_profiles: list[dict[str, Any]] = []
         for uid in member_ids:
             prof = store.get_user_profile(org_id=resolved_org, user_id=uid)
             if prof is None:
-                u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                 prof = build_user_profile(uid, resolved_org, u_events)
                 _upsert_user_profile(
                     prof,
@@ -2918,7 +7172,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         return out
 
     @app.get("/intelligence/psychodynamics/block-matrix")
-    def get_psychodynamics_block_matrix(
+    async def get_psychodynamics_block_matrix(
         *,
         scope_type: str = "user",
         scope_id: str,
@@ -2939,15 +7193,15 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         resolved_org = org_id
         if not isinstance(resolved_org, str) or not resolved_org:
             if scope_type == "user":
-                resolved_org = store.resolve_org_id(team_id=team_id, user_id=scope_id)
+                resolved_org = await astore.resolve_org_id(team_id=team_id, user_id=scope_id)
             else:
-                resolved_org = store.resolve_org_id(team_id=scope_id)
+                resolved_org = await astore.resolve_org_id(team_id=scope_id)
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id/user_id with known org) is required.")
 
         pv = str(pipeline_version or PIPELINE_VERSION)
         if isinstance(context_block, str) and context_block.strip():
-            rec = store.get_psychodynamic_block_matrix(
+            rec = await astore.get_psychodynamic_block_matrix(
                 org_id=resolved_org,
                 scope_type=scope_type,
                 scope_id=scope_id,
@@ -2956,7 +7210,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             )
             records = [rec] if isinstance(rec, dict) else []
         else:
-            records = store.list_psychodynamic_block_matrices(
+            records = await astore.list_psychodynamic_block_matrices(
                 org_id=resolved_org,
                 scope_type=scope_type,
                 scope_id=scope_id,
@@ -2973,7 +7227,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         }
 
     @app.get("/intelligence/psychodynamics/influence-layers")
-    def get_psychodynamics_influence_layers(
+    async def get_psychodynamics_influence_layers(
         *,
         team_id: str,
         org_id: Optional[str] = None,
@@ -2988,13 +7242,13 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not team_id:
             raise HTTPException(status_code=400, detail="team_id is required.")
 
-        resolved_org = org_id or store.resolve_org_id(team_id=team_id)
+        resolved_org = org_id or await astore.resolve_org_id(team_id=team_id)
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
 
         pv = str(pipeline_version or PIPELINE_VERSION)
         if isinstance(context_block, str) and context_block.strip():
-            rec = store.get_psychodynamic_influence_layer(
+            rec = await astore.get_psychodynamic_influence_layer(
                 org_id=resolved_org,
                 team_id=team_id,
                 context_block=context_block.strip().lower(),
@@ -3002,7 +7256,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             )
             records = [rec] if isinstance(rec, dict) else []
         else:
-            records = store.list_psychodynamic_influence_layers(
+            records = await astore.list_psychodynamic_influence_layers(
                 org_id=resolved_org,
                 team_id=team_id,
                 pipeline_version=pv,
@@ -3041,8 +7295,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
 
-        registry = get_te_registry()
-        tracker = registry.get_tracker(resolved_org, team_id)
+        tracker = _te_tracker(resolved_org, team_id)
 
         agents, te_matrix = tracker.compute_te_matrix()
         edges = tracker.get_influence_edges(min_te=float(min_te))
@@ -3103,8 +7356,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
 
-        registry = get_te_registry()
-        tracker = registry.get_tracker(resolved_org, team_id)
+        tracker = _te_tracker(resolved_org, team_id)
 
         summary = tracker.get_user_influence_summary(user_id)
 
@@ -3137,8 +7389,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not isinstance(resolved_org, str) or not resolved_org:
             raise HTTPException(status_code=400, detail="org_id (or team_id with known org) is required.")
 
-        registry = get_te_registry()
-        tracker = registry.get_tracker(resolved_org, team_id)
+        tracker = _te_tracker(resolved_org, team_id)
 
         async def event_generator():
             # Send initial state
@@ -3213,6 +7464,9 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             org_id=resolved_org,
             team_id=team_id,
         )
+        # A reset tracker stays empty rather than being replayed from the event log.
+        with te_warm_lock:
+            te_warmed.add((resolved_org, team_id))
 
         return {
             "ok": True,
@@ -3284,26 +7538,27 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             lam_vals = [float(x.strip()) for x in lambda_values.split(",")]
             beta_vals = [float(x.strip()) for x in beta_values.split(",")]
 
-            # Get user sequences from tracker
-            registry = get_te_registry()
-            tracker = registry.get_tracker(resolved_org, team_id)
-
-            if user1 and user2 and user1 in tracker.user_last_state and user2 in tracker.user_last_state:
-                # Use real data from pairwise stats
-                key = (user1, user2)
-                if key in tracker.pairwise_stats:
-                    stats = tracker.pairwise_stats[key]
-                    # For now, generate synthetic data matching the pattern
-                    # (A full implementation would extract the actual sequences)
+            # Real per-user state sequences from the event log's columns when enabled.
+            tracker = _te_tracker(resolved_org, team_id)
+            x_seq, y_seq = _te_pair_sequences(resolved_org, team_id, user1, user2) if user1 and user2 else ([], [])
+
+            if len(x_seq) < 2:
+                if user1 and user2 and user1 in tracker.user_last_state and user2 in tracker.user_last_state:
+                    # Use real data from pairwise stats
+                    key = (user1, user2)
+                    if key in tracker.pairwise_stats:
+                        stats = tracker.pairwise_stats[key]
+                        # For now, generate synthetic data matching the pattern
+                        # (A full implementation would extract the actual sequences)
+                        from collectium_intelligence.te_validation import _generate_leader_follower_sequence
+                        x_seq, y_seq = _generate_leader_follower_sequence(500, noise=0.2, seed=42)
+                    else:
+                        from collectium_intelligence.te_validation import _generate_independent_sequences
+                        x_seq, y_seq = _generate_independent_sequences(500, seed=42)
+                else:
+                    # Use synthetic data
                     from collectium_intelligence.te_validation import _generate_leader_follower_sequence
                     x_seq, y_seq = _generate_leader_follower_sequence(500, noise=0.2, seed=42)
-                else:
-                    from collectium_intelligence.te_validation import _generate_independent_sequences
-                    x_seq, y_seq = _generate_independent_sequences(500, seed=42)
-            else:
-                # Use synthetic data
-                from collectium_intelligence.te_validation import _generate_leader_follower_sequence
-                x_seq, y_seq = _generate_leader_follower_sequence(500, noise=0.2, seed=42)
 
             result = sensitivity_analysis(x_seq, y_seq, lambda_values=lam_vals, beta_values=beta_vals)
             result["org_id"] = resolved_org
@@ -3618,8 +7873,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
     @app.post("/intelligence/ux/bootstrap", response_model=dict[str, Any])
     def bootstrap_ux_taxonomy(*, org_id: str) -> dict[str, Any]:
         """Create/refresh the default UX intervention taxonomy for an org (idempotent)."""
-        interventions = _ensure_default_ux_interventions(org_id)
-        return {"org_id": org_id, "interventions": interventions}
+        interventions = _ensure_default_ux_interventions(org_id, force=True)
+        return {"org_id": org_id, "interventions": interventions, "taxonomy_version": ux_taxonomy.version(org_id)}
 
     @app.post("/intelligence/ux/runs/apply", response_model=dict[str, Any])
     def apply_ux_intervention(req: UxApplyRequest) -> dict[str, Any]:
@@ -3757,6 +8012,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not scope_id:
             raise HTTPException(status_code=400, detail="run.scope_id missing")
 
+        remeasured = bool(run.get("measured_at"))
         measured_at = utc_now_iso8601()
         post_state = _snapshot_scope_state(org_id=org_id, scope_type=scope_type, scope_id=scope_id, pipeline_version=pv)
 
@@ -3824,17 +8080,33 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             consent_granted=consent_flag,
         )
 
-        return {"run": record}
+        bandit_update: dict[str, Any] | None = None
+        try:
+            # A re-measurement would feed the same run's reward to the online policy twice.
+            log = None if remeasured else _bandit_log_from_run(run)
+            if log is not None and log.get("intervention_key"):
+                from collectium_intelligence.bandit import extract_context
+
+                bandit_update = bandit_policies.observe(
+                    org_id,
+                    str(log["intervention_key"]),
+                    extract_context(log["group_metrics"]),
+                    log["reward"],
+                )
+        except Exception:
+            bandit_update = None
+
+        return {"run": record, "bandit_update": bandit_update}
 
     @app.post("/intelligence/ux/interventions", response_model=dict[str, Any])
     def upsert_ux_intervention_endpoint(intervention: UxIntervention) -> dict[str, Any]:
         payload = _model_dump(intervention)
-        record = store.upsert_ux_intervention(payload)
+        record = _upsert_ux_intervention(payload)
         return {"intervention": record}
 
     @app.get("/intelligence/ux/interventions", response_model=dict[str, Any])
-    def list_ux_interventions_endpoint(*, org_id: str, limit: int = 200) -> dict[str, Any]:
-        rows = store.list_ux_interventions(org_id=org_id, limit=int(limit))
+    async def list_ux_interventions_endpoint(*, org_id: str, limit: int = 200) -> dict[str, Any]:
+        rows = await run_in_threadpool(_list_ux_interventions, org_id, limit=int(limit))
         return {"interventions": rows}
 
     @app.post("/intelligence/ux/runs", response_model=dict[str, Any])
@@ -3846,20 +8118,26 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         return {"run": record}
 
     @app.get("/intelligence/ux/runs", response_model=dict[str, Any])
-    def list_ux_runs_endpoint(
+    async def list_ux_runs_endpoint(
         *,
         org_id: str,
         scope_type: Optional[str] = None,
         scope_id: Optional[str] = None,
         limit: int = 200,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
-        rows = store.list_ux_intervention_runs(
+        rows, next_cursor = await astore.run(
+            _list_page,
+            store.list_ux_intervention_runs,
+            ts_keys=("decided_at", "created_at"),
+            id_keys=("run_id",),
+            cursor=cursor,
+            limit=limit,
             org_id=org_id,
             scope_type=scope_type,
             scope_id=scope_id,
-            limit=int(limit),
         )
-        return {"runs": rows}
+        return {"runs": rows, "next_cursor": next_cursor}
 
     @app.post("/intelligence/ux/wellbeing", response_model=dict[str, Any])
     def upsert_wellbeing_endpoint(window: WellbeingWindow) -> dict[str, Any]:
@@ -3882,20 +8160,27 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         return {"window": record}
 
     @app.get("/intelligence/ux/wellbeing", response_model=dict[str, Any])
-    def list_wellbeing_endpoint(
+    async def list_wellbeing_endpoint(
         *,
         org_id: str,
         scope_type: str,
         scope_id: str,
         limit: int = 200,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
-        rows = store.list_wellbeing_windows(
+        rows, next_cursor = await astore.run(
+            _list_page,
+            store.list_wellbeing_windows,
+            ts_keys=("window_end",),
+            id_keys=("pipeline_version",),
+            cursor=cursor,
+            limit=limit,
+            table="wellbeing_windows",
             org_id=org_id,
             scope_type=scope_type,
             scope_id=scope_id,
-            limit=int(limit),
         )
-        return {"windows": rows}
+        return {"windows": rows, "next_cursor": next_cursor}
 
     @app.post("/intelligence/consent", response_model=dict[str, Any])
     def upsert_consent_endpoint(record: ConsentRecord) -> dict[str, Any]:
@@ -3907,24 +8192,30 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         return {"consent": stored}
 
     @app.get("/intelligence/consent", response_model=dict[str, Any])
-    def list_consent_endpoint(
+    async def list_consent_endpoint(
         *,
         org_id: str,
         subject_type: Optional[str] = None,
         subject_id: Optional[str] = None,
         consent_key: Optional[str] = None,
         limit: int = 200,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
         if not hasattr(store, "list_consent_records"):
             raise HTTPException(status_code=501, detail="consent registry not supported by this store.")
-        rows = store.list_consent_records(
+        rows, next_cursor = await astore.run(
+            _list_page,
+            store.list_consent_records,
+            ts_keys=("created_at",),
+            id_keys=("subject_type", "subject_id", "consent_key"),
+            cursor=cursor,
+            limit=limit,
             org_id=org_id,
             subject_type=subject_type,
             subject_id=subject_id,
             consent_key=consent_key,
-            limit=int(limit),
         )
-        return {"consent": rows}
+        return {"consent": rows, "next_cursor": next_cursor}
 
     @app.post("/intelligence/ux/exposures", response_model=dict[str, Any])
     def upsert_ux_exposure_endpoint(req: UxExposureRequest) -> dict[str, Any]:
@@ -3961,7 +8252,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         return {"exposure": stored}
 
     @app.get("/intelligence/ux/exposures", response_model=dict[str, Any])
-    def list_ux_exposures_endpoint(
+    async def list_ux_exposures_endpoint(
         *,
         org_id: str,
         scope_type: Optional[str] = None,
@@ -3969,46 +8260,90 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         user_id: Optional[str] = None,
         intervention_key: Optional[str] = None,
         limit: int = 200,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
         if not hasattr(store, "list_ux_exposures"):
             raise HTTPException(status_code=501, detail="ux_exposures not supported by this store.")
-        rows = store.list_ux_exposures(
+        rows, next_cursor = await astore.run(
+            _list_page,
+            store.list_ux_exposures,
+            ts_keys=("occurred_at",),
+            id_keys=("exposure_id",),
+            cursor=cursor,
+            limit=limit,
             org_id=org_id,
             scope_type=scope_type,
             scope_id=scope_id,
             user_id=user_id,
             intervention_key=intervention_key,
-            limit=int(limit),
         )
-        return {"exposures": rows}
+        return {"exposures": rows, "next_cursor": next_cursor}
 
     @app.post("/intelligence/memcubes", response_model=dict[str, Any])
     def upsert_memcube_endpoint(memcube: Memcube) -> dict[str, Any]:
         payload = _model_dump(memcube)
-        record = store.upsert_memcube(payload)
+        record = _upsert_memcube(payload)
         return {"memcube": record}
 
     @app.get("/intelligence/memcubes", response_model=dict[str, Any])
-    def list_memcubes_endpoint(
+    async def list_memcubes_endpoint(
         *,
         org_id: str,
         level: Optional[str] = None,
         entity_id: Optional[str] = None,
         context_type: Optional[str] = None,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
-        rows = store.list_memcubes(
+        rows, next_cursor = await astore.run(
+            _list_page,
+            store.list_memcubes,
+            ts_keys=("updated_at", "created_at"),
+            id_keys=("memcube_id",),
+            cursor=cursor,
+            limit=limit,
             org_id=org_id,
             level=level,
             entity_id=entity_id,
             context_type=context_type,
-            limit=int(limit),
         )
-        return {"memcubes": rows}
+        return {"memcubes": rows, "next_cursor": next_cursor}
+
+    @app.get("/intelligence/memcubes/search", response_model=dict[str, Any])
+    def search_memcubes_endpoint(
+        *,
+        org_id: str,
+        context_type: str = "knowledge_card",
+        vector: Optional[str] = Query(None, description="Query embedding as comma-separated floats or a JSON list"),
+        memcube_id: Optional[str] = Query(None, description="Use this memcube's embedding as the query"),
+        k: int = 10,
+    ) -> dict[str, Any]:
+        query: Any = None
+        if isinstance(vector, str) and vector.strip():
+            text = vector.strip()
+            try:
+                query = json.loads(text) if text.startswith("[") else [float(x) for x in text.split(",") if x.strip()]
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"invalid vector: {e}") from e
+        elif isinstance(memcube_id, str) and memcube_id:
+            rec = store.get_memcube(org_id=org_id, memcube_id=memcube_id)
+            if rec is None:
+                raise HTTPException(status_code=404, detail="memcube not found")
+            query = rec.get("embedding") if isinstance(rec, dict) else None
+        if not isinstance(query, list) or not query:
+            raise HTTPException(status_code=400, detail="vector (or memcube_id with an embedding) is required.")
+
+        _memcube_slot(org_id, context_type)
+        hits = memcube_index.search(org_id, context_type, query, k=max(1, min(int(k), 1000)))
+        return {
+            "org_id": org_id,
+            "context_type": context_type,
+            "results": [{"score": score, "memcube": memcube} for score, memcube in hits],
+        }
 
     @app.get("/intelligence/memcubes/{memcube_id}", response_model=dict[str, Any])
-    def get_memcube_endpoint(memcube_id: str, *, org_id: str) -> dict[str, Any]:
-        rec = store.get_memcube(org_id=org_id, memcube_id=memcube_id)
+    async def get_memcube_endpoint(memcube_id: str, *, org_id: str) -> dict[str, Any]:
+        rec = await astore.get_memcube(org_id=org_id, memcube_id=memcube_id)
         if rec is None:
             raise HTTPException(status_code=404, detail="memcube not found")
         return {"memcube": rec}
@@ -4016,6 +8351,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
     @app.delete("/intelligence/memcubes/{memcube_id}", response_model=dict[str, Any])
     def delete_memcube_endpoint(memcube_id: str, *, org_id: str) -> dict[str, Any]:
         deleted = bool(store.delete_memcube(org_id=org_id, memcube_id=memcube_id))
+        memcube_index.remove(org_id, memcube_id)
         return {"deleted": deleted}
 
     @app.post("/intelligence/memos/messages", response_model=dict[str, Any])
@@ -4069,52 +8405,74 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
         return {"status": "ok", **result}
 
-    @app.get("/intelligence/psychodynamics/memcubes/export", response_model=dict[str, Any])
-    def export_psychodynamics_memcubes(
-        *,
-        org_id: Optional[str] = None,
-        scope_type: Optional[str] = None,
-        scope_id: Optional[str] = None,
-        pipeline_version: Optional[str] = None,
-        include_state_schema: bool = True,
-        include_telemetry: bool = True,
-        include_block_matrices: bool = False,
-        source: Optional[str] = None,
-    ) -> dict[str, Any]:
-        resolved_org = org_id
-        if not isinstance(resolved_org, str) or not resolved_org:
-            if isinstance(scope_type, str) and scope_type.lower().strip() == "team":
-                resolved_org = store.resolve_org_id(team_id=scope_id)
-            elif isinstance(scope_type, str) and scope_type.lower().strip() == "user":
-                resolved_org = store.resolve_org_id(user_id=scope_id)
-        if not isinstance(resolved_org, str) or not resolved_org:
-            raise HTTPException(status_code=400, detail="org_id is required (or scope_type/scope_id with known org).")
-
-        pv = str(pipeline_version or PIPELINE_VERSION)
-        memcubes: list[dict[str, Any]] = []
-
-        if bool(include_state_schema):
-            memcubes.extend(_state_schema_memcubes_for_org(resolved_org))
+    def _context_memcubes(org_id: str, context_type: str) -> Iterator[dict[str, Any]]:
+        """Every memcube of one context type, newest first, in pages of `MEMCUBE_IMPORT_CHUNK`.
 
-        if bool(include_telemetry):
-            st = str(scope_type or "").strip().lower()
-            sid = str(scope_id or "").strip()
-            if st not in {"user", "team"} or not sid:
-                raise HTTPException(
-                    status_code=400,
-                    detail="scope_type (user|team) and scope_id are required when include_telemetry=true.",
-                )
-            telemetry = _psychodynamics_memcube_for_scope(
-                org_id=resolved_org,
-                scope_type=st,
-                scope_id=sid,
-                pipeline_version=pv,
-                include_blocks=bool(include_block_matrices),
-                source=source or "export",
+        Stores that seek by `before=(ts, id)` are paged lazily. The in-memory store is paged by seeking
+        its rows directly on `(created_at, memcube_id)`: only those keys are collected up front and each
+        page re-reads its rows, so nothing is buffered ahead of the first line. Any other store can only
+        return its newest N rows, and paging that by ever deeper scans re-reads the head on every page,
+        so its listing is read once instead.
+        """
+        rows_by_id = getattr(store, "memcubes", None)
+        if not _accepts_kwarg(store.list_memcubes, "before") and isinstance(rows_by_id, dict):
+            keys = sorted(
+                (
+                    (str(row.get("created_at") or ""), str(memcube_id))
+                    for memcube_id, row in list(rows_by_id.items())
+                    if isinstance(row, dict) and row.get("org_id") == org_id and row.get("context_type") == context_type
+                ),
+                reverse=True,
+            )
+            step = max(1, MEMCUBE_IMPORT_CHUNK)
+            for start in range(0, len(keys), step):
+                for _, memcube_id in keys[start : start + step]:
+                    row = rows_by_id.get(memcube_id)
+                    if isinstance(row, dict):
+                        yield row
+            return
+        if not _accepts_kwarg(store.list_memcubes, "before"):
+            rows = _list_all(store.list_memcubes, org_id=org_id, context_type=context_type)
+            yield from (r for r in rows if isinstance(r, dict))
+            return
+        cursor: str | None = None
+        while True:
+            rows, cursor = _list_page(
+                store.list_memcubes,
+                ts_keys=("created_at",),
+                id_keys=("memcube_id",),
+                cursor=cursor,
+                limit=MEMCUBE_IMPORT_CHUNK,
+                org_id=org_id,
+                context_type=context_type,
             )
-            if telemetry is not None:
-                memcubes.append(telemetry)
+            yield from rows
+            if cursor is None:
+                return
 
+    @app.get("/intelligence/psychodynamics/memcubes/export", response_model=dict[str, Any])
+    def export_psychodynamics_memcubes(
+        *,
+        org_id: Optional[str] = None,
+        scope_type: Optional[str] = None,
+        scope_id: Optional[str] = None,
+        pipeline_version: Optional[str] = None,
+        include_state_schema: bool = True,
+        include_telemetry: bool = True,
+        include_block_matrices: bool = False,
+        source: Optional[str] = None,
+    ) -> dict[str, Any]:
+        resolved_org = _exchange_org(org_id, scope_type=scope_type, scope_id=scope_id)
+        memcubes = _exchange_memcubes(
+            resolved_org,
+            scope_type=scope_type,
+            scope_id=scope_id,
+            pipeline_version=pipeline_version,
+            include_state_schema=include_state_schema,
+            include_telemetry=include_telemetry,
+            include_block_matrices=include_block_matrices,
+            source=source,
+        )
         bundle = build_psychodynamic_exchange_bundle(
             org_id=resolved_org,
             memcubes=memcubes,
@@ -4122,6 +8480,50 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         )
         return {"bundle": bundle}
 
+    @app.get("/intelligence/psychodynamics/memcubes/export/stream")
+    def export_psychodynamics_memcubes_stream(
+        *,
+        org_id: Optional[str] = None,
+        scope_type: Optional[str] = None,
+        scope_id: Optional[str] = None,
+        pipeline_version: Optional[str] = None,
+        include_state_schema: bool = True,
+        include_telemetry: bool = True,
+        include_block_matrices: bool = False,
+        context_type: Optional[str] = Query(None, description="Also export every memcube of this context type"),
+        source: Optional[str] = None,
+    ) -> Any:
+        """NDJSON export: a bundle header line, then one memcube per line (store pages read lazily)."""
+        from starlette.responses import StreamingResponse
+
+        resolved_org = _exchange_org(org_id, scope_type=scope_type, scope_id=scope_id)
+        memcubes = _exchange_memcubes(
+            resolved_org,
+            scope_type=scope_type,
+            scope_id=scope_id,
+            pipeline_version=pipeline_version,
+            include_state_schema=include_state_schema,
+            include_telemetry=include_telemetry,
+            include_block_matrices=include_block_matrices,
+            source=source,
+        )
+        header = build_psychodynamic_exchange_bundle(org_id=resolved_org, memcubes=[], source=source or "tracka")
+        header = {k: v for k, v in header.items() if k != "memcubes"} if isinstance(header, dict) else {}
+
+        def _lines() -> Iterator[str]:
+            yield json.dumps({"bundle": header}, default=str) + "\n"
+            seen: set[str] = set()
+            for memcube in memcubes:
+                seen.add(str(memcube.get("memcube_id") or ""))
+                yield json.dumps(memcube, default=str) + "\n"
+            if not (isinstance(context_type, str) and context_type):
+                return
+            for memcube in _context_memcubes(resolved_org, context_type):
+                if str(memcube.get("memcube_id") or "") not in seen:
+                    yield json.dumps(memcube, default=str) + "\n"
+
+        return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
     @app.post("/intelligence/psychodynamics/memcubes/import", response_model=dict[str, Any])
     def import_psychodynamics_memcubes(payload: MemcubeExchangeImport) -> dict[str, Any]:
         data = _model_dump(payload)
@@ -4136,26 +8538,86 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             memcubes = list(memcubes) + list(bundle.get("memcubes"))
 
         now = utc_now_iso8601()
-        imported: list[dict[str, Any]] = []
-        skipped: list[dict[str, Any]] = []
-        for raw in memcubes:
-            rec = _prepare_exchange_memcube(raw, org_id=org_id, source=source, now=now)
-            if rec is None:
-                skipped.append({"reason": "invalid memcube", "memcube": raw})
-                continue
-            try:
-                stored = store.upsert_memcube(rec)
-            except Exception as exc:  # noqa: BLE001
-                skipped.append({"reason": str(exc), "memcube_id": rec.get("memcube_id")})
-                continue
-            imported.append(stored)
+        summary = _import_summary(org_id)
+        for start in range(0, len(memcubes), max(1, MEMCUBE_IMPORT_CHUNK)):
+            _import_memcube_chunk(
+                memcubes[start : start + MEMCUBE_IMPORT_CHUNK],
+                org_id=org_id,
+                source=source,
+                now=now,
+                summary=summary,
+            )
+        return summary
 
-        return {
-            "org_id": org_id,
-            "imported": len(imported),
-            "skipped": skipped,
-            "memcubes": imported,
-        }
+    @app.post("/intelligence/psychodynamics/memcubes/import/stream", response_model=dict[str, Any])
+    async def import_psychodynamics_memcubes_stream(
+        request: Request,
+        *,
+        org_id: str,
+        source: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """NDJSON import: memcubes (bare or as {"memcube": …}) and optional {"bundle": …} header lines.
+
+        The body is read incrementally and upserted in chunks, so memory is bounded by the chunk size
+        and `MEMCUBE_IMPORT_LINE_BYTES`; a longer line is skipped (and reported) without being buffered.
+        """
+        org_id = str(org_id or "").strip()
+        if not org_id:
+            raise HTTPException(status_code=400, detail="org_id is required.")
+        now = utc_now_iso8601()
+        summary = _import_summary(org_id)
+        chunk: list[Any] = []
+        buffer = b""
+        line_no = 0
+        oversized = False
+
+        def _take(line: bytes) -> None:
+            nonlocal source, line_no
+            line_no += 1
+            line = line.strip()
+            if not line:
+                return
+            try:
+                obj = json.loads(line)
+            except ValueError as e:
+                _import_error(summary, f"line {line_no}: invalid JSON ({e})")
+                return
+            if isinstance(obj, dict) and isinstance(obj.get("bundle"), dict):
+                bundle = obj["bundle"]
+                source = source or bundle.get("source")
+                if isinstance(bundle.get("memcubes"), list):
+                    chunk.extend(bundle["memcubes"])
+                return
+            chunk.append(obj.get("memcube") if isinstance(obj, dict) and isinstance(obj.get("memcube"), dict) else obj)
+
+        async for data in request.stream():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            if oversized and lines:
+                # The first piece ends the line that was already reported and dropped.
+                lines.pop(0)
+                oversized = False
+            for line in lines:
+                _take(line)
+            if oversized or len(buffer) > MEMCUBE_IMPORT_LINE_BYTES:
+                if not oversized:
+                    line_no += 1
+                    _import_error(summary, f"line {line_no}: longer than {MEMCUBE_IMPORT_LINE_BYTES} bytes")
+                    oversized = True
+                buffer = b""
+            if len(chunk) >= MEMCUBE_IMPORT_CHUNK:
+                batch = list(chunk)
+                chunk.clear()
+                await run_in_threadpool(
+                    _import_memcube_chunk, batch, org_id=org_id, source=source, now=now, summary=summary
+                )
+        if not oversized:
+            _take(buffer)
+        if chunk:
+            await run_in_threadpool(
+                _import_memcube_chunk, list(chunk), org_id=org_id, source=source, now=now, summary=summary
+            )
+        return summary
 
     @token_required
     @app.post("/events", response_model=IngestEventResponse)
@@ -4184,9 +8646,70 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         )
         return IngestEventResponse(stored=True, event_id=event_id)
 
+    feed_snapshots: OrderedDict[str, tuple[float, str, list[dict[str, Any]]]] = OrderedDict()
+    feed_snapshots_lock = threading.Lock()
+
+    def _pin_feed_snapshot(snapshot_key: str, ranked_items: list[dict[str, Any]]) -> str:
+        """Keep a full ranking addressable by id so cursor pages read from one consistent snapshot."""
+        snapshot_id = uuid.uuid4().hex[:16]
+        with feed_snapshots_lock:
+            feed_snapshots[snapshot_id] = (time.monotonic(), snapshot_key, ranked_items)
+            while len(feed_snapshots) > max(1, FEED_SNAPSHOT_LIMIT):
+                feed_snapshots.popitem(last=False)
+        return snapshot_id
+
+    def _feed_snapshot(snapshot_id: str) -> tuple[str, list[dict[str, Any]]] | None:
+        with feed_snapshots_lock:
+            entry = feed_snapshots.get(snapshot_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > FEED_SNAPSHOT_TTL_S:
+                feed_snapshots.pop(snapshot_id, None)
+                return None
+            return entry[1], entry[2]
+
+    def _feed_profile_versions(user_profile: Any, team_profile: Any) -> tuple[str, str]:
+        return _profile_stamp(user_profile), _profile_stamp(team_profile)
+
+    def _feed_store_fingerprint(request_fingerprint: str, versions: tuple[str, str]) -> str:
+        """Store-cache key for a ranking: the request plus the persisted profile versions it was ranked
+        against, so a profile rewrite by any worker misses the store cache too (older entries age out
+        by TTL)."""
+        return _fingerprint_request({"request": request_fingerprint, "profile_versions": list(versions)})
+
+    def _remember_feed_ranking(
+        lru_key: str,
+        ranked_items: list[dict[str, Any]],
+        *,
+        versions: tuple[str, str],
+    ) -> None:
+        size = len(json.dumps(ranked_items, separators=(",", ":"), default=str))
+        feed_lru.put(lru_key, (time.monotonic(), versions, ranked_items), size=size)
+
+    def _feed_page(
+        ranked_items: list[dict[str, Any]],
+        *,
+        snapshot_key: str,
+        snapshot_id: str | None,
+        offset: int,
+        limit: int,
+    ) -> RankFeedPageResponse:
+        """One page of a ranking; a snapshot is pinned only when a further page exists to read from it."""
+        total = len(ranked_items)
+        has_more = (offset + limit) < total
+        feed_cache_stats.incr("pages")
+        if has_more and snapshot_id is None:
+            snapshot_id = _pin_feed_snapshot(snapshot_key, ranked_items)
+        return RankFeedPageResponse(
+            ranked_items=ranked_items[offset : offset + limit],
+            total=total,
+            has_more=has_more,
+            next_cursor=_encode_cursor(snapshot_id, str(offset + limit)) if has_more else None,
+        )
+
     @token_required
-    @app.post("/intelligence/feeds/rank", response_model=RankFeedResponse)
-    def rank_feed_endpoint(req: RankFeedRequest, request: Request) -> RankFeedResponse:
+    @app.post("/intelligence/feeds/rank", response_model=RankFeedPageResponse)
+    def rank_feed_endpoint(req: RankFeedPageRequest, request: Request) -> RankFeedPageResponse:
         payload = _model_dump(req)
         user_id = payload["user_id"]
         team_id = payload["team_id"]
@@ -4200,29 +8723,64 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         if not isinstance(org_id, str) or not org_id:
             raise HTTPException(status_code=400, detail="Unknown org_id; ingest at least one event first.")
 
+        limit = max(1, int(payload.get("limit") or 20))
+        offset = max(0, int(payload.get("offset") or 0))
+        cursor = payload.get("cursor")
+        snapshot_id: str | None = None
+        if isinstance(cursor, str) and cursor:
+            try:
+                snapshot_id, cursor_offset = _decode_cursor(cursor)
+                offset = max(0, int(cursor_offset))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail="invalid cursor") from e
+
+        feed_cache_stats.incr("requests")
         request_fingerprint = _fingerprint_request({"items": items, "context": context, "feed_type": feed_type})
+        snapshot_key = f"{org_id}|{user_id}|{request_fingerprint}"
+        pinned = _feed_snapshot(snapshot_id) if snapshot_id else None
+        if pinned is not None and pinned[0] == snapshot_key:
+            feed_cache_stats.incr("hits")
+            feed_cache_stats.incr("snapshot_hits")
+            return _feed_page(
+                pinned[1], snapshot_key=snapshot_key, snapshot_id=snapshot_id, offset=offset, limit=limit
+            )
+
+        ttl_s = feed_cache_ttls.get(str(feed_type).lower(), feed_cache_ttls["*"])
+        lru_key = f"{PIPELINE_VERSION}|{snapshot_key}"
+        # Versions come from the stored profiles (two keyed reads), which the miss path reuses.
+        user_profile = store.get_user_profile(org_id=org_id, user_id=user_id)
+        team_profile = store.get_team_profile(org_id=org_id, team_id=team_id)
+        versions = _feed_profile_versions(user_profile, team_profile)
+        local = feed_lru.get(lru_key)
+        if local is not None:
+            stored_at, stored_versions, ranked_items = local
+            if stored_versions == versions and time.monotonic() - stored_at <= ttl_s:
+                feed_cache_stats.incr("hits")
+                feed_cache_stats.incr("lru_hits")
+                return _feed_page(
+                    ranked_items, snapshot_key=snapshot_key, snapshot_id=None, offset=offset, limit=limit
+                )
+            feed_lru.pop(lru_key)
+            feed_cache_stats.incr("lru_invalidations")
+
         cached = store.get_feed_cache(
             org_id=org_id,
             user_id=user_id,
             feed_type=feed_type,
             pipeline_version=PIPELINE_VERSION,
-            request_fingerprint=request_fingerprint,
-            max_age_s=30.0,
+            request_fingerprint=_feed_store_fingerprint(request_fingerprint, versions),
+            max_age_s=ttl_s,
         )
         if cached is not None:
-            ranked_items = cached.get("ranked_items") or []
-            total = len(items)
-            limit = int(payload.get("limit") or 20)
-            offset = int(payload.get("offset") or 0)
-            return RankFeedResponse(
-                ranked_items=ranked_items,
-                total=total,
-                has_more=(offset + limit) < total,
-            )
+            feed_cache_stats.incr("hits")
+            feed_cache_stats.incr("store_hits")
+            ranked_items = list(cached.get("ranked_items") or [])
+            _remember_feed_ranking(lru_key, ranked_items, versions=versions)
+            return _feed_page(ranked_items, snapshot_key=snapshot_key, snapshot_id=None, offset=offset, limit=limit)
+        feed_cache_stats.incr("misses")
 
-        user_profile = store.get_user_profile(org_id=org_id, user_id=user_id)
         if user_profile is None:
-            events = store.list_user_classified_events(org_id=org_id, user_id=user_id)
+            events = _user_classified_events(org_id=org_id, user_id=user_id)
             user_profile = build_user_profile(user_id, org_id, events)
             _upsert_user_profile(
                 user_profile,
@@ -4232,9 +8790,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 updated_at=user_profile.get("updated_at") if isinstance(user_profile, dict) else None,
             )
 
-        team_profile = store.get_team_profile(org_id=org_id, team_id=team_id)
         if team_profile is None:
-            team_events = store.list_team_classified_events(org_id=org_id, team_id=team_id)
+            team_events = _team_classified_events(org_id=org_id, team_id=team_id)
             member_ids = sorted(
                 {str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)}
             )
@@ -4242,7 +8799,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             for uid in member_ids:
                 prof = store.get_user_profile(org_id=org_id, user_id=uid)
                 if prof is None:
-                    u_events = store.list_user_classified_events(org_id=org_id, user_id=uid)
+                    u_events = _user_classified_events(org_id=org_id, user_id=uid)
                     prof = build_user_profile(uid, org_id, u_events)
                     _upsert_user_profile(
                         prof,
@@ -4261,8 +8818,11 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             )
 
         # Provide population context for similarity-based CF.
-        user_profiles = store.list_user_profiles(org_id=org_id)
-        team_profiles = store.list_team_profiles(org_id=org_id)
+        user_profiles, team_profiles = _population_profiles(
+            org_id,
+            user_profile=user_profile,
+            team_profile=team_profile,
+        )
 
         ranked_items = rank_feed(
             feed_type=feed_type,
@@ -4277,23 +8837,127 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             team_profiles=team_profiles,
         )
 
+        feed_cache_stats.incr("ranked_items", len(ranked_items))
+        # Profiles may have been (re)built above; stamp the ranking with the versions it used.
+        versions = _feed_profile_versions(user_profile, team_profile)
+        _remember_feed_ranking(lru_key, ranked_items, versions=versions)
         store.upsert_feed_cache(
             org_id=org_id,
             user_id=user_id,
             feed_type=feed_type,
             pipeline_version=PIPELINE_VERSION,
-            request_fingerprint=request_fingerprint,
+            request_fingerprint=_feed_store_fingerprint(request_fingerprint, versions),
             ranked_items=ranked_items,
         )
 
-        total = len(items)
-        limit = int(payload.get("limit") or 20)
-        offset = int(payload.get("offset") or 0)
-        return RankFeedResponse(
-            ranked_items=ranked_items[:limit],
-            total=total,
-            has_more=(offset + limit) < total,
-        )
+        return _feed_page(ranked_items, snapshot_key=snapshot_key, snapshot_id=None, offset=offset, limit=limit)
+
+    @token_required
+    @app.post("/intelligence/feeds/rank/batch")
+    def rank_feed_batch_endpoint(req: RankFeedBatchRequest, request: Request) -> Any:
+        """Rank one candidate item set for many users; streams one NDJSON line per user."""
+        from starlette.responses import StreamingResponse
+
+        payload = _model_dump(req)
+        feed_type = str(payload.get("feed_type") or "")
+        items = payload.get("items") or []
+        context = payload.get("context") or {}
+        default_team = str(payload.get("team_id") or "")
+        targets: list[tuple[str, str]] = []
+        for entry in payload.get("users") or []:
+            if entry.get("user_id"):
+                targets.append((str(entry["user_id"]), str(entry.get("team_id") or default_team)))
+        for uid in payload.get("user_ids") or []:
+            if uid:
+                targets.append((str(uid), default_team))
+        if not feed_type or not targets:
+            raise HTTPException(status_code=400, detail="feed_type and users (or user_ids) are required.")
+        if any(not tid for _, tid in targets):
+            raise HTTPException(status_code=400, detail="team_id is required for every user.")
+        # Same rule as /feeds/rank: an authenticated caller may only rank their own feed.
+        auth_user = getattr(request, "supabase_user_id", None)
+        if auth_user and any(uid != auth_user for uid, _ in targets):
+            raise HTTPException(status_code=403, detail="User not authorized for this feed request.")
+
+        # Resolve each distinct team once (falling back to the user for unknown teams) rather than
+        # one store round-trip per target.
+        team_orgs: dict[str, Any] = {tid: store.resolve_org_id(team_id=tid) for tid in dict.fromkeys(t for _, t in targets)}
+        target_orgs = [
+            team_orgs[tid] if isinstance(team_orgs[tid], str) and team_orgs[tid] else store.resolve_org_id(team_id=tid, user_id=uid)
+            for uid, tid in targets
+        ]
+        requested_org = str(payload.get("org_id") or "")
+        org_id = requested_org or next((o for o in target_orgs if isinstance(o, str) and o), None)
+        if not isinstance(org_id, str) or not org_id:
+            raise HTTPException(status_code=400, detail="Unknown org_id; ingest at least one event first.")
+        rejected: list[dict[str, Any]] = []
+        allowed: list[tuple[str, str]] = []
+        for (uid, tid), user_org in zip(targets, target_orgs):
+            if not isinstance(user_org, str) or not user_org:
+                rejected.append({"user_id": uid, "team_id": tid, "error": "Unknown org_id; ingest at least one event first."})
+            elif user_org != org_id:
+                rejected.append({"user_id": uid, "team_id": tid, "error": "User not authorized for this feed request."})
+            else:
+                allowed.append((uid, tid))
+        targets = allowed
+
+        limit = int(payload["limit"])
+        project_id = payload.get("project_id")
+        request_fingerprint = _fingerprint_request({"items": items, "context": context, "feed_type": feed_type})
+        _load_population(org_id)
+
+        def _lines() -> Iterator[str]:
+            for line in rejected:
+                yield json.dumps(line) + "\n"
+            team_profiles: dict[str, Any] = {}
+            team_pops: dict[str, list[dict[str, Any]]] = {}
+            for start in range(0, len(targets), 256):
+                chunk: list[tuple[str, str, Any]] = []
+                for uid, tid in targets[start : start + 256]:
+                    try:
+                        prof = profile_index.get(org_id, "user", uid) or _ensure_user_profile(org_id, uid)
+                        if tid not in team_profiles:
+                            team_profiles[tid] = profile_index.get(org_id, "team", tid) or _ensure_team_profile(org_id, tid)
+                    except Exception as e:  # noqa: BLE001
+                        yield json.dumps({"user_id": uid, "team_id": tid, "error": str(e)}) + "\n"
+                        continue
+                    chunk.append((uid, tid, prof))
+
+                new_teams = sorted({tid for _, tid, _ in chunk} - set(team_pops))
+                for tid, pop in zip(
+                    new_teams,
+                    profile_index.neighbors_many(org_id, "team", [team_profiles[t] for t in new_teams], k=PROFILE_NEIGHBORS),
+                ):
+                    team_pops[tid] = pop
+                user_pops = profile_index.neighbors_many(org_id, "user", [p for _, _, p in chunk], k=PROFILE_NEIGHBORS)
+
+                for (uid, tid, prof), user_pop in zip(chunk, user_pops):
+                    try:
+                        ranked_items = rank_feed(
+                            feed_type=feed_type,
+                            user_id=uid,
+                            team_id=tid,
+                            project_id=project_id,
+                            items=items,
+                            context=context,
+                            user_profile=prof,
+                            team_profile=team_profiles[tid],
+                            user_profiles=user_pop,
+                            team_profiles=team_pops[tid],
+                        )
+                    except Exception as e:  # noqa: BLE001
+                        yield json.dumps({"user_id": uid, "team_id": tid, "error": str(e)}) + "\n"
+                        continue
+                    feed_cache_stats.incr("ranked_items", len(ranked_items))
+                    _remember_feed_ranking(
+                        f"{PIPELINE_VERSION}|{org_id}|{uid}|{request_fingerprint}",
+                        ranked_items,
+                        versions=_feed_profile_versions(prof, team_profiles[tid]),
+                    )
+                    line = {"user_id": uid, "team_id": tid, "total": len(ranked_items), "ranked_items": ranked_items[:limit]}
+                    yield json.dumps(line, default=str) + "\n"
+
+        return StreamingResponse(_lines(), media_type="application/x-ndjson")
 
     @app.get("/intelligence/decide/directions")
     def get_decide_directions(
@@ -4329,8 +8993,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             ranked = cached.get("ranked") or []
             ranked_by_user = cached.get("ranked_by_user") or {}
         else:
-            insights = extract_insights(org_id=resolved_org, events=discourse_events, llm_mode="off")
-            cards = build_knowledge_cards(org_id=resolved_org, insights=insights)
+            insights, cards = _discourse_artifacts(resolved_org, discourse_events)
             directions = generate_strategic_directions(org_id=resolved_org, cards=cards, max_directions=int(limit))
 
             user_ids = sorted({e.get("user_id") for e in raw_events if isinstance(e.get("user_id"), str)})
@@ -4339,7 +9002,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 prof = store.get_user_profile(org_id=resolved_org, user_id=uid)
                 if prof is None:
                     # Use classified events for psychometrics if available.
-                    u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                    u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                     prof = build_user_profile(uid, resolved_org, u_events)
                     _upsert_user_profile(
                         prof,
@@ -4372,7 +9035,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     "created_at": now,
                     "updated_at": now,
                 }
-                store.upsert_memcube(memcube)
+                _upsert_memcube(memcube)
 
             for card in cards:
                 memcube = {
@@ -4387,7 +9050,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                     "created_at": now,
                     "updated_at": now,
                 }
-                store.upsert_memcube(memcube)
+                _upsert_memcube(memcube)
 
             memcube = {
                 "org_id": resolved_org,
@@ -4401,7 +9064,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "created_at": now,
                 "updated_at": now,
             }
-            store.upsert_memcube(memcube)
+            _upsert_memcube(memcube)
 
             store.upsert_decide_cache(
                 org_id=resolved_org,
@@ -4528,8 +9191,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         discourse_events = [e for e in project_events if _is_discourse_candidate_event(e)]
 
-        insights = extract_insights(org_id=resolved_org, events=discourse_events, llm_mode="off")
-        cards = build_knowledge_cards(org_id=resolved_org, insights=insights)
+        insights, cards = _discourse_artifacts(resolved_org, discourse_events)
         directions = generate_strategic_directions(org_id=resolved_org, cards=cards, max_directions=int(limit))
 
         user_ids = sorted({e.get("user_id") for e in project_events if isinstance(e.get("user_id"), str)})
@@ -4537,7 +9199,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         for uid in user_ids:
             prof = store.get_user_profile(org_id=resolved_org, user_id=uid)
             if prof is None:
-                u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                 prof = build_user_profile(uid, resolved_org, u_events)
                 _upsert_user_profile(
                     prof,
@@ -4571,7 +9233,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "created_at": now,
                 "updated_at": now,
             }
-            store.upsert_memcube(memcube)
+            _upsert_memcube(memcube)
 
         for card in cards:
             memcube = {
@@ -4586,7 +9248,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "created_at": now,
                 "updated_at": now,
             }
-            store.upsert_memcube(memcube)
+            _upsert_memcube(memcube)
 
         memcube = {
             "org_id": resolved_org,
@@ -4600,7 +9262,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             "created_at": now,
             "updated_at": now,
         }
-        store.upsert_memcube(memcube)
+        _upsert_memcube(memcube)
 
         store.upsert_decide_cache(
             org_id=resolved_org,
@@ -4682,62 +9344,16 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         graph = state.get("project_graph") if isinstance(state.get("project_graph"), dict) else {}
         nodes = graph.get("nodes") if isinstance(graph.get("nodes"), dict) else {}
-        edges = graph.get("edges") if isinstance(graph.get("edges"), list) else []
-
-        blocked_by_project: dict[str, list[str]] = {}
-        for e in edges:
-            if not isinstance(e, dict):
-                continue
-            if str(e.get("type") or "depends_on") != "depends_on":
-                continue
-            src = e.get("from")
-            dst = e.get("to")
-            if isinstance(src, str) and isinstance(dst, str) and src and dst:
-                blocked_by_project.setdefault(dst, []).append(src)
-        for k, v in blocked_by_project.items():
-            blocked_by_project[k] = sorted(set(v))
-
-        state_by_id = {
-            str(pid): str(meta.get("state") or "")
-            for pid, meta in nodes.items()
-            if isinstance(pid, str) and isinstance(meta, dict)
-        }
-        deps_ready = _ready_map(blocked_by=blocked_by_project, state_by_id=state_by_id, done_states={"completed"})
-
+        blocked_by_project = _dag_view(("org", resolved_org), graph)["blocked_by"]
+        readiness = _readiness(("org", resolved_org), state)
+        deps_ready = readiness["deps_ready"]
+        blocked = readiness["blocked"]
         now = datetime.now(timezone.utc)
-        blocked: dict[str, bool] = {}
-        for pid, meta in nodes.items():
-            if not isinstance(pid, str) or not isinstance(meta, dict):
-                continue
-            is_blocked, _info = _block_status(
-                meta=meta,
-                now=now,
-                state_by_id=state_by_id,
-                done_states={"completed"},
-                wait_key="waiting_for_project_id",
-            )
-            blocked[pid] = bool(is_blocked)
 
-        # Build lightweight project membership/activity signals from raw events (demo-friendly).
-        raw_events = store.list_raw_events(org_id=resolved_org)
-        project_members: dict[str, set[str]] = {}
-        project_last_ts: dict[str, str] = {}
-        for ev in raw_events:
-            if not isinstance(ev, dict):
-                continue
-            ev_pid = ev.get("project_id")
-            ev_data = ev.get("event_data") if isinstance(ev.get("event_data"), dict) else {}
-            pid = ev_pid if isinstance(ev_pid, str) and ev_pid else ev_data.get("project_id")
-            if not isinstance(pid, str) or not pid:
-                continue
-            uid = ev.get("user_id")
-            if isinstance(uid, str) and uid:
-                project_members.setdefault(pid, set()).add(uid)
-            ts = ev.get("timestamp")
-            if isinstance(ts, str) and ts:
-                prev_ts = project_last_ts.get(pid)
-                if not prev_ts or ts > prev_ts:
-                    project_last_ts[pid] = ts
+        # Project membership/activity signals come from the ingest-maintained index (reloaded per TTL).
+        if not project_activity.loaded(resolved_org):
+            project_activity.rebuild(resolved_org, partial(store.list_raw_events, org_id=resolved_org))
+        now_s = now.timestamp()
 
         items: list[dict[str, Any]] = []
         for pid, meta in nodes.items():
@@ -4750,8 +9366,10 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             if not bool(deps_ready.get(pid, True)) or bool(blocked.get(pid)):
                 continue
 
-            members = sorted(project_members.get(pid) or set())
-            data: dict[str, Any] = {"members": members}
+            activity = project_activity.project(resolved_org, pid, now=now_s)
+            data: dict[str, Any] = {"members": activity["members"]}
+            if activity["activity"]:
+                data["member_activity"] = activity["activity"]
             deps = blocked_by_project.get(pid) or []
             if deps:
                 data["dependencies"] = deps
@@ -4760,14 +9378,14 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             for key in ("priority", "created_at", "updated_at", "deadline"):
                 if key in meta_dict:
                     md[key] = meta_dict.get(key)
-            if pid in project_last_ts:
-                md["updated_at"] = project_last_ts[pid]
+            if activity["last_ts"]:
+                md["updated_at"] = activity["last_ts"]
 
             items.append({"item_id": pid, "item_type": "project", "data": data, "metadata": md})
 
         user_profile = store.get_user_profile(org_id=resolved_org, user_id=user_id)
         if user_profile is None:
-            events = store.list_user_classified_events(org_id=resolved_org, user_id=user_id)
+            events = _user_classified_events(org_id=resolved_org, user_id=user_id)
             user_profile = build_user_profile(user_id, resolved_org, events)
             _upsert_user_profile(
                 user_profile,
@@ -4779,13 +9397,13 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         team_profile = store.get_team_profile(org_id=resolved_org, team_id=team_id)
         if team_profile is None:
-            team_events = store.list_team_classified_events(org_id=resolved_org, team_id=team_id)
+            team_events = _team_classified_events(org_id=resolved_org, team_id=team_id)
             member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
             member_profiles: list[dict[str, Any]] = []
             for uid in member_ids:
                 prof = store.get_user_profile(org_id=resolved_org, user_id=uid)
                 if prof is None:
-                    u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                    u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                     prof = build_user_profile(uid, resolved_org, u_events)
                     _upsert_user_profile(
                         prof,
@@ -4803,6 +9421,11 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 pipeline_version=PIPELINE_VERSION,
             )
 
+        user_profiles, team_profiles = _population_profiles(
+            resolved_org,
+            user_profile=user_profile,
+            team_profile=team_profile,
+        )
         ranked_items = rank_feed(
             feed_type="projects",
             user_id=user_id,
@@ -4812,8 +9435,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             context={"org_stage": state.get("stage")},
             user_profile=user_profile,
             team_profile=team_profile,
-            user_profiles=store.list_user_profiles(org_id=resolved_org),
-            team_profiles=store.list_team_profiles(org_id=resolved_org),
+            user_profiles=user_profiles,
+            team_profiles=team_profiles,
         )
 
         return {
@@ -4853,6 +9476,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         edges = graph.get("edges") if isinstance(graph.get("edges"), list) else []
         tasks_state = state.get("tasks") if isinstance(state.get("tasks"), dict) else {}
 
+        # Any task-graph edge gates a recommendation (not only depends_on, which is all the DAG
+        # models); the readiness tracker follows the same edges.
         blockers_by_task: dict[str, list[str]] = {}
         for e in edges:
             if not isinstance(e, dict):
@@ -4863,9 +9488,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 blockers_by_task.setdefault(dst, []).append(src)
         for k, v in blockers_by_task.items():
             blockers_by_task[k] = sorted(set(v))
-
-        state_by_id = {str(k): str(v) for k, v in tasks_state.items() if isinstance(k, str) and isinstance(v, str)}
-        now = datetime.now(timezone.utc)
+        readiness = _readiness(("project", resolved_org, project_id), state)
         done_states = {"completed_pending_approval", "completed_approved"}
 
         items: list[dict[str, Any]] = []
@@ -4880,17 +9503,9 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             )
 
             dependencies = blockers_by_task.get(tid) or []
-            unsatisfied = [
-                dep for dep in dependencies if state_by_id.get(dep) not in {"completed_approved"}
-            ]
-
-            is_blocked, block_info = _block_status(
-                meta=node_dict,
-                now=now,
-                state_by_id=state_by_id,
-                done_states={"completed_approved"},
-                wait_key="waiting_for_task_id",
-            )
+            unsatisfied = [dep for dep in dependencies if tasks_state.get(dep) != "completed_approved"]
+            is_blocked = bool(readiness["blocked"].get(tid))
+            block_info = readiness["blocks"].get(tid) or {}
 
             # Do not recommend blocked tasks (except completed/review states).
             if task_state_local not in done_states and (unsatisfied or is_blocked):
@@ -4928,7 +9543,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         user_profile = store.get_user_profile(org_id=resolved_org, user_id=user_id)
         if user_profile is None:
-            events = store.list_user_classified_events(org_id=resolved_org, user_id=user_id)
+            events = _user_classified_events(org_id=resolved_org, user_id=user_id)
             user_profile = build_user_profile(user_id, resolved_org, events)
             _upsert_user_profile(
                 user_profile,
@@ -4940,13 +9555,13 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         team_profile = store.get_team_profile(org_id=resolved_org, team_id=team_id)
         if team_profile is None:
-            team_events = store.list_team_classified_events(org_id=resolved_org, team_id=team_id)
+            team_events = _team_classified_events(org_id=resolved_org, team_id=team_id)
             member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
             member_profiles: list[dict[str, Any]] = []
             for uid in member_ids:
                 prof = store.get_user_profile(org_id=resolved_org, user_id=uid)
                 if prof is None:
-                    u_events = store.list_user_classified_events(org_id=resolved_org, user_id=uid)
+                    u_events = _user_classified_events(org_id=resolved_org, user_id=uid)
                     prof = build_user_profile(uid, resolved_org, u_events)
                     _upsert_user_profile(
                         prof,
@@ -4964,6 +9579,11 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 pipeline_version=PIPELINE_VERSION,
             )
 
+        user_profiles, team_profiles = _population_profiles(
+            resolved_org,
+            user_profile=user_profile,
+            team_profile=team_profile,
+        )
         ranked_items = rank_feed(
             feed_type="tasks",
             user_id=user_id,
@@ -4973,8 +9593,8 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             context={"project_stage": state.get("stage")},
             user_profile=user_profile,
             team_profile=team_profile,
-            user_profiles=store.list_user_profiles(org_id=resolved_org),
-            team_profiles=store.list_team_profiles(org_id=resolved_org),
+            user_profiles=user_profiles,
+            team_profiles=team_profiles,
         )
 
         return {
@@ -5015,14 +9635,21 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         elif scope_type == "team":
             team_profile = store.get_team_profile(org_id=org_id, team_id=scope_id)
             # Get user profiles for team members
-            team_events = store.list_team_classified_events(org_id=org_id, team_id=scope_id)
+            team_events = _team_classified_events(org_id=org_id, team_id=scope_id)
             member_ids = sorted({str(e.get("user_id")) for e in team_events if isinstance(e.get("user_id"), str)})
             for uid in member_ids[:50]:  # Limit to 50 members
                 p = store.get_user_profile(org_id=org_id, user_id=uid)
                 if p:
                     user_profiles.append(p)
 
-        interventions = store.list_ux_interventions(org_id=org_id, limit=100)
+        interventions = _list_ux_interventions(org_id, limit=100)
+
+        # One heuristic pass: it is both the fallback ranking and the bandit's context source.
+        result = recommend_ux_interventions(
+            user_profiles=user_profiles,
+            team_profile=team_profile,
+            interventions=interventions,
+        )
 
         # Try bandit if requested
         bandit_used = False
@@ -5031,40 +9658,31 @@ def create_app(*, store: Optional[Any] = None) -> Any:
 
         if use_bandit:
             try:
-                from collectium_intelligence.bandit import (
-                    load_policy,
-                    recommend_intervention,
-                )
-
-                policy_path = f"/tmp/bandit_policy_{org_id}.json"
-                policy = load_policy(policy_path)
-                if policy is not None:
-                    heuristic_result = recommend_ux_interventions(
-                        user_profiles=user_profiles,
-                        team_profile=team_profile,
-                        interventions=interventions,
-                    )
-                    group_metrics = heuristic_result.get("group_metrics", {})
-                    arm_keys = [str(i.get("intervention_key")) for i in interventions if i.get("intervention_key")]
-
+                from collectium_intelligence.bandit import extract_context, recommend_intervention
+
+                online = bandit_policies.online(org_id)
+                policy = bandit_policies.get(org_id)
+                arm_keys = [str(i.get("intervention_key")) for i in interventions if i.get("intervention_key")]
+                group_metrics = result.get("group_metrics", {})
+                if online is not None and online.seeded and online.updates > 0 and arm_keys and group_metrics:
+                    # Seeded from the current trained policy plus every run measured since, it leads
+                    # the periodic offline retrain; unseeded online state never overrides that policy.
+                    ctx = extract_context(group_metrics)
+                    bandit_arm, _ = online.select(ctx, arm_keys)
+                    theta = online.get_theta(bandit_arm) if bandit_arm else None
+                    bandit_confidence = float(ctx @ theta) if theta is not None else None
+                    bandit_used = bandit_arm is not None
+                elif policy is not None:
                     if arm_keys and group_metrics:
                         bandit_arm = recommend_intervention(policy, group_metrics, arm_keys)
                         bandit_used = True
                         # Get UCB confidence
-                        from collectium_intelligence.bandit import extract_context
                         ctx = extract_context(group_metrics)
                         theta = policy.get_theta(bandit_arm)
                         bandit_confidence = float(ctx @ theta) if theta is not None else None
             except Exception:
                 pass
 
-        # Always compute heuristic as fallback/comparison
-        result = recommend_ux_interventions(
-            user_profiles=user_profiles,
-            team_profile=team_profile,
-            interventions=interventions,
-        )
-
         # If bandit selected an arm, reorder recommendations
         if bandit_used and bandit_arm:
             recs = result.get("recommendations", [])
@@ -5080,6 +9698,54 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         result["bandit_arm"] = bandit_arm
         return result
 
+    def _bandit_drift(
+        org_id: str,
+        offline: Any,
+        logs: list[dict[str, Any]],
+        arm_keys: list[str],
+    ) -> dict[str, Any] | None:
+        """Compare the online (measure-time) policy with an offline retrain: θ distance and arm agreement."""
+        import numpy as np
+        from collectium_intelligence.bandit import extract_context, recommend_intervention
+
+        online = bandit_policies.online(org_id)
+        if online is None or online.updates == 0:
+            return None
+        arms: dict[str, Any] = {}
+        for key in arm_keys:
+            a = online.get_theta(key)
+            b = offline.get_theta(key)
+            if a is None or b is None or np.shape(a) != np.shape(b):
+                continue
+            a = np.asarray(a, dtype=np.float64)
+            b = np.asarray(b, dtype=np.float64)
+            denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+            arms[key] = {
+                "theta_l2": float(np.linalg.norm(a - b)),
+                "theta_cosine": float(a @ b / denom) if denom > 0 else 0.0,
+                "online_updates": int(online.arms.get(key, {}).get("n", 0)),
+            }
+        thetas = {k: online.get_theta(k) for k in arm_keys}
+        thetas = {k: t for k, t in thetas.items() if t is not None}
+        agree = 0
+        compared = 0
+        for log in logs[-1000:]:
+            try:
+                x = np.asarray(extract_context(log["group_metrics"]), dtype=np.float64)
+                online_arm = max(thetas, key=lambda k: float(x @ thetas[k])) if thetas else None
+                offline_arm = recommend_intervention(offline, log["group_metrics"], arm_keys)
+            except Exception:
+                continue
+            compared += 1
+            agree += int(online_arm == offline_arm)
+        return {
+            "online_updates": online.updates,
+            "arms": arms,
+            "theta_l2_mean": float(np.mean([a["theta_l2"] for a in arms.values()])) if arms else None,
+            "arm_agreement": (agree / compared) if compared else None,
+            "compared_logs": compared,
+        }
+
     @app.post("/intelligence/ux/policy/train")
     def train_bandit_policy(*, org_id: str, policy_type: str = "linucb") -> dict[str, Any]:
         """Train bandit policy from historical intervention logs.
@@ -5090,7 +9756,6 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             LinUCBPolicy,
             ThompsonSamplingPolicy,
             train_policy_from_logs,
-            save_policy,
             evaluate_policy_offline,
         )
 
@@ -5099,40 +9764,15 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         logs: list[dict[str, Any]] = []
 
         for run in runs:
-            if not run.get("measured_at"):
-                continue
-            delta = run.get("delta") if isinstance(run.get("delta"), dict) else {}
-            wb_delta = delta.get("wellbeing_proxies") if isinstance(delta.get("wellbeing_proxies"), dict) else {}
-
-            # Compute reward from wellbeing improvement
-            improvements = [v for v in wb_delta.values() if isinstance(v, (int, float)) and v > 0]
-            reward = sum(improvements) / max(len(improvements), 1) if improvements else 0.0
-
-            # Get pre-state group metrics
-            pre_state = run.get("pre_state") if isinstance(run.get("pre_state"), dict) else {}
-            psych = pre_state.get("team_profile_psychodynamics") or pre_state.get("user_profile_psychodynamics")
-            if not isinstance(psych, dict):
-                continue
-
-            group_metrics = {
-                "avg_animals": psych.get("animals", {}),
-                "avg_kernel_drift": psych.get("kernel_drift", 0.0),
-                "te_reciprocity": psych.get("te_reciprocity"),
-                "dominance_ratio": psych.get("dominance_ratio", 0.0),
-                "avg_mean_certainty": psych.get("mean_certainty", 0.0),
-            }
-
-            logs.append({
-                "intervention_key": run.get("intervention_key"),
-                "group_metrics": group_metrics,
-                "reward": float(reward),
-            })
+            log = _bandit_log_from_run(run)
+            if log is not None:
+                logs.append(log)
 
         if len(logs) < 10:
             return {"status": "insufficient_data", "n_logs": len(logs), "min_required": 10}
 
         # Get arm keys
-        interventions = store.list_ux_interventions(org_id=org_id, limit=100)
+        interventions = _list_ux_interventions(org_id, limit=100)
         arm_keys = list({str(i.get("intervention_key")) for i in interventions if i.get("intervention_key")})
 
         if not arm_keys:
@@ -5144,9 +9784,10 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         # Evaluate offline
         eval_result = evaluate_policy_offline(policy, logs)
 
-        # Save policy
-        policy_path = f"/tmp/bandit_policy_{org_id}.json"
-        save_policy(policy, policy_path)
+        # Compare against the online policy before `put` replaces it, then save the policy (JSON +
+        # .npz snapshot) and serve it from memory from now on.
+        drift = _bandit_drift(org_id, policy, logs, arm_keys)
+        saved = bandit_policies.put(org_id, policy)
 
         return {
             "status": "trained",
@@ -5155,7 +9796,10 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             "n_arms": len(arm_keys),
             "arm_keys": arm_keys,
             "evaluation": eval_result,
-            "policy_path": policy_path,
+            "policy_path": saved["policy_path"],
+            "snapshot_path": saved["snapshot_path"],
+            "policy_version": saved["version"],
+            "online_drift": drift,
         }
 
     # -------------------------------------------------------------------------
@@ -5172,8 +9816,27 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         min_runs: int = 5,
     ) -> dict[str, Any]:
         """Generate causal attribution report for interventions."""
+        return _attribution_cached(
+            ("report", org_id, intervention_key, scope_type, scope_id, int(min_runs)),
+            lambda: _attribution_report(
+                org_id=org_id,
+                intervention_key=intervention_key,
+                scope_type=scope_type,
+                scope_id=scope_id,
+                min_runs=min_runs,
+            ),
+        )
+
+    def _attribution_report(
+        *,
+        org_id: str,
+        intervention_key: str | None,
+        scope_type: str | None,
+        scope_id: str | None,
+        min_runs: int,
+    ) -> dict[str, Any]:
+        import numpy as np
         from collectium_intelligence.intervention_effects import aggregate_effects, InterventionEffect
-        from datetime import datetime
 
         runs = store.list_ux_intervention_runs(
             org_id=org_id,
@@ -5194,60 +9857,42 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "min_required": min_runs,
             }
 
-        # Build effects list
+        # Standardized pre→post effect per run over the proxies present on both sides. A single run
+        # has no interval of its own (it is a group of one: degenerate CI, p = 1); significance is
+        # a bootstrap over each intervention's runs, reported per intervention.
+        cols = _run_effect_columns(measured_runs)
+        common = np.isfinite(cols["pre"]) & np.isfinite(cols["post"])
+        effect, counts = _row_stats([cols["pre"], cols["post"]], common, _pooled_effect)
+        valid = counts > 0
+        effect_cis = _bootstrap_group_means(effect[valid], [k for k, ok in zip(cols["keys"], valid) if ok])
+
         effects: list[InterventionEffect] = []
-        for run in measured_runs:
+        for i in np.flatnonzero(valid):
+            run = cols["runs"][i]
             delta = run.get("delta") if isinstance(run.get("delta"), dict) else {}
             wb_delta = delta.get("wellbeing_proxies") if isinstance(delta.get("wellbeing_proxies"), dict) else {}
-
-            pre_state = run.get("pre_state") if isinstance(run.get("pre_state"), dict) else {}
-            post_state = run.get("post_state") if isinstance(run.get("post_state"), dict) else {}
-
-            # Extract wellbeing proxies
-            def extract_wb(state: dict) -> dict:
-                psych = state.get("team_profile_psychodynamics") or state.get("user_profile_psychodynamics")
-                if isinstance(psych, dict):
-                    return psych.get("wellbeing_proxies", {})
-                return {}
-
-            pre_wb = extract_wb(pre_state)
-            post_wb = extract_wb(post_state)
-
-            if not pre_wb and not post_wb:
-                continue
-
-            # Compute effect size
-            common_keys = set(pre_wb.keys()) & set(post_wb.keys())
-            if not common_keys:
-                continue
-
-            pre_vals = [pre_wb[k] for k in common_keys]
-            post_vals = [post_wb[k] for k in common_keys]
-
-            pre_mean = sum(pre_vals) / len(pre_vals)
-            post_mean = sum(post_vals) / len(post_vals)
-            pooled_std = (sum((x - pre_mean)**2 for x in pre_vals) + sum((x - post_mean)**2 for x in post_vals))
-            pooled_std = (pooled_std / max(len(pre_vals) + len(post_vals) - 2, 1)) ** 0.5 if pooled_std > 0 else 1.0
-            effect_size = (post_mean - pre_mean) / max(pooled_std, 1e-10)
-
             effects.append(InterventionEffect(
-                run_id=str(run.get("run_id")),
-                intervention_key=str(run.get("intervention_key")),
-                pre_wellbeing=pre_wb,
-                post_wellbeing=post_wb,
+                run_id=cols["run_ids"][i],
+                intervention_key=cols["keys"][i],
+                pre_wellbeing=_run_wellbeing(run.get("pre_state")),
+                post_wellbeing=_run_wellbeing(run.get("post_state")),
                 delta=wb_delta,
-                effect_size=effect_size,
-                confidence_interval=(-1.0, 1.0),  # Simplified
-                p_value=0.05 if abs(effect_size) > 0.2 else 0.5,  # Simplified
-                significant=abs(effect_size) > 0.2,
-                attributed_to=str(run.get("intervention_key")),
-                measurement_time=datetime.now(),
+                effect_size=float(effect[i]),
+                confidence_interval=(float(effect[i]), float(effect[i])),
+                p_value=1.0,
+                significant=False,
+                attributed_to=cols["keys"][i],
+                measurement_time=(
+                    datetime.fromtimestamp(cols["measured_at"][i])
+                    if np.isfinite(cols["measured_at"][i])
+                    else datetime.now()
+                ),
                 observation_window_seconds=3600,
-                sample_size=len(common_keys),
+                sample_size=int(counts[i]),
             ))
 
         # Aggregate
-        summary = aggregate_effects(effects)
+        summary = _with_group_significance(aggregate_effects(effects), effect_cis)
 
         # Generate recommendations
         recommendations: list[str] = []
@@ -5264,6 +9909,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             "org_id": org_id,
             "intervention_key": intervention_key,
             "summary": summary,
+            "effect_ci_by_intervention": effect_cis,
             "recommendations": recommendations,
             "n_effects": len(effects),
         }
@@ -5276,79 +9922,164 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         treatment_scope_id: str,
         control_scope_ids: list[str],
         scope_type: str = "team",
-        pre_periods: int = 7,
-        post_periods: int = 7,
+        pre_periods: int = Query(7, ge=2),
+        post_periods: int = Query(7, ge=1),
+        since: Optional[str] = None,
+        until: Optional[str] = None,
     ) -> dict[str, Any]:
         """Run Difference-in-Differences analysis for an intervention."""
-        from collectium_intelligence.causal_attribution import (
-            difference_in_differences,
-            parallel_trends_test,
-            UnitTimeSeries,
+        result = _did_batch(
+            org_id=org_id,
+            scope_type=scope_type,
+            treatments=[{"intervention_key": intervention_key, "treatment_scope_id": treatment_scope_id}],
+            control_scope_ids=control_scope_ids,
+            pre_periods=pre_periods,
+            post_periods=post_periods,
+            since=since,
+            until=until,
         )
+        return result["results"][0]
 
-        # Get wellbeing windows for treatment and control groups
-        def get_unit_series(scope_id: str, is_treated: bool) -> UnitTimeSeries | None:
-            windows = store.list_wellbeing_windows(
-                org_id=org_id,
-                scope_type=scope_type,
-                scope_id=scope_id,
-                limit=pre_periods + post_periods + 10,
+    @app.post("/intelligence/ux/attribution/did/batch")
+    def run_difference_in_differences_batch(payload: DidBatchRequest) -> dict[str, Any]:
+        """DiD for several (intervention_key, treatment_scope_id) pairs over one shared panel."""
+        data = _model_dump(payload)
+        org_id = str(data.get("org_id") or "").strip()
+        treatments = [t for t in data.get("interventions") or [] if t.get("treatment_scope_id")]
+        controls = [str(c) for c in data.get("control_scope_ids") or [] if c]
+        if not org_id or not treatments or not controls:
+            raise HTTPException(
+                status_code=400,
+                detail="org_id, interventions [{intervention_key, treatment_scope_id}] and control_scope_ids are required.",
             )
-            if len(windows) < pre_periods + post_periods:
-                return None
-
-            # Extract outcomes (mean wellbeing proxy value per window)
-            outcomes = []
-            for w in sorted(windows, key=lambda x: x.get("window_end", "")):
-                proxies = w.get("proxies") if isinstance(w.get("proxies"), dict) else {}
-                if proxies:
-                    outcomes.append(sum(proxies.values()) / len(proxies))
+        return _did_batch(
+            org_id=org_id,
+            scope_type=str(data.get("scope_type") or "team"),
+            treatments=treatments,
+            control_scope_ids=controls,
+            pre_periods=int(data["pre_periods"]),
+            post_periods=int(data["post_periods"]),
+            since=data.get("since"),
+            until=data.get("until"),
+        )
 
-            if len(outcomes) < pre_periods + post_periods:
-                return None
+    def _wellbeing_windows_by_scope(
+        *,
+        org_id: str,
+        scope_type: str,
+        scope_ids: list[str],
+        limit: int,
+        since: str | None,
+        until: str | None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Wellbeing windows for many scopes, newest first (at most `limit` per scope).
+
+        Stores exposing `list_wellbeing_windows_for_scopes(org_id=, scope_type=, scope_ids=, limit=,
+        since=, until=)` answer in one query. Otherwise each scope is listed; a time range is then
+        applied by the store when it accepts `since`/`until`, else the scope's full listing is read
+        and filtered here, since filtering only the newest `limit` rows could drop windows inside it.
+        """
 
-            treatment_time = pre_periods if is_treated else None
+        def _in_range(row: dict[str, Any]) -> bool:
+            end = str(row.get("window_end") or "")
+            return (not since or end >= since) and (not until or end <= until)
 
-            return UnitTimeSeries(
-                unit_id=scope_id,
-                outcomes=outcomes[: pre_periods + post_periods],
-                treatment_time=treatment_time,
+        out: dict[str, list[dict[str, Any]]] = {sid: [] for sid in scope_ids}
+        if hasattr(store, "list_wellbeing_windows_for_scopes"):
+            rows = store.list_wellbeing_windows_for_scopes(
+                org_id=org_id,
+                scope_type=scope_type,
+                scope_ids=list(scope_ids),
+                limit=limit,
+                since=since,
+                until=until,
             )
+            for row in rows or []:
+                if isinstance(row, dict) and str(row.get("scope_id") or "") in out:
+                    out[str(row.get("scope_id"))].append(row)
+            for sid, scoped in out.items():
+                scoped.sort(key=lambda w: str(w.get("window_end") or ""), reverse=True)
+                del scoped[max(1, limit) :]
+            return out
+
+        list_fn = store.list_wellbeing_windows
+        native = all(_accepts_kwarg(list_fn, k) for k, v in (("since", since), ("until", until)) if v)
+        extra = {k: v for k, v in (("since", since), ("until", until)) if v} if native else {}
+        for sid in scope_ids:
+            if native or not (since or until):
+                out[sid] = list_fn(org_id=org_id, scope_type=scope_type, scope_id=sid, limit=limit, **extra)
+            else:
+                rows = _list_all(list_fn, org_id=org_id, scope_type=scope_type, scope_id=sid)
+                out[sid] = [r for r in rows if isinstance(r, dict) and _in_range(r)]
+        return out
 
-        # Build treatment series
-        treatment_series = get_unit_series(treatment_scope_id, is_treated=True)
-        if treatment_series is None:
-            return {"status": "insufficient_treatment_data", "treatment_scope_id": treatment_scope_id}
-
-        # Build control series
-        control_series = []
-        for cid in control_scope_ids:
-            cs = get_unit_series(cid, is_treated=False)
-            if cs:
-                control_series.append(cs)
-
-        if not control_series:
-            return {"status": "insufficient_control_data", "control_scope_ids": control_scope_ids}
-
-        # Run DiD
-        did_result = difference_in_differences(treatment_series, control_series, pre_periods)
-
-        # Run parallel trends test
-        pt_result = parallel_trends_test(treatment_series, control_series, pre_periods)
+    def _did_batch(
+        *,
+        org_id: str,
+        scope_type: str,
+        treatments: list[dict[str, Any]],
+        control_scope_ids: list[str],
+        pre_periods: int,
+        post_periods: int,
+        since: str | None,
+        until: str | None,
+    ) -> dict[str, Any]:
+        import numpy as np
 
-        return {
-            "status": "success",
-            "intervention_key": intervention_key,
-            "treatment_scope_id": treatment_scope_id,
-            "control_scope_ids": [cs.unit_id for cs in control_series],
-            "did_estimate": did_result.estimate,
-            "did_std_error": did_result.std_error,
-            "did_t_stat": did_result.t_stat,
-            "did_p_value": did_result.p_value,
-            "did_significant": did_result.significant,
-            "parallel_trends_p_value": pt_result.get("p_value"),
-            "parallel_trends_valid": pt_result.get("p_value", 0) > 0.05,
+        periods = int(pre_periods) + int(post_periods)
+        treated_ids = [str(t.get("treatment_scope_id")) for t in treatments]
+        scope_ids = list(dict.fromkeys(treated_ids + [str(c) for c in control_scope_ids]))
+        windows = _wellbeing_windows_by_scope(
+            org_id=org_id,
+            scope_type=scope_type,
+            scope_ids=scope_ids,
+            limit=periods + 10,
+            since=since,
+            until=until,
+        )
+        outcomes = {
+            sid: _wellbeing_outcomes(rows, fetch_limit=periods + 10, periods=periods)
+            for sid, rows in windows.items()
         }
+        units, panel = _did_panel(outcomes, scope_ids)
+        row_of = {u: i for i, u in enumerate(units)}
+        control_rows = [row_of[c] for c in dict.fromkeys(control_scope_ids) if c in row_of]
+
+        results: list[dict[str, Any]] = []
+        for t in treatments:
+            key = t.get("intervention_key")
+            tid = str(t.get("treatment_scope_id"))
+            if tid not in row_of:
+                results.append({"status": "insufficient_treatment_data", "intervention_key": key, "treatment_scope_id": tid})
+                continue
+            rows = [r for r in control_rows if units[r] != tid]
+            if not rows:
+                results.append({
+                    "status": "insufficient_control_data",
+                    "intervention_key": key,
+                    "treatment_scope_id": tid,
+                    "control_scope_ids": control_scope_ids,
+                })
+                continue
+            sub = panel[[row_of[tid]] + rows]
+            treated = np.zeros(len(rows) + 1, dtype=bool)
+            treated[0] = True
+            did = _did_estimate(sub, treated, int(pre_periods))
+            pt_p = did["parallel_trends_p_value"]
+            results.append({
+                "status": "success",
+                "intervention_key": key,
+                "treatment_scope_id": tid,
+                "control_scope_ids": [units[r] for r in rows],
+                "did_estimate": did["estimate"],
+                "did_std_error": did["std_error"],
+                "did_t_stat": did["t_stat"],
+                "did_p_value": did["p_value"],
+                "did_significant": did["significant"],
+                "parallel_trends_p_value": pt_p,
+                "parallel_trends_valid": None if pt_p is None else pt_p > 0.05,
+            })
+        return {"org_id": org_id, "scope_type": scope_type, "panel_units": len(units), "periods": periods, "results": results}
 
     @app.get("/intelligence/ux/effects/aggregate")
     def get_aggregated_effects(
@@ -5358,65 +10089,56 @@ def create_app(*, store: Optional[Any] = None) -> Any:
         days: int = 30,
     ) -> dict[str, Any]:
         """Get aggregated intervention effects over time."""
+        return _attribution_cached(
+            ("effects", org_id, intervention_key, int(days)),
+            lambda: _aggregated_effects(org_id=org_id, intervention_key=intervention_key, days=days),
+        )
+
+    def _aggregated_effects(*, org_id: str, intervention_key: str | None, days: int) -> dict[str, Any]:
+        import numpy as np
         from collectium_intelligence.intervention_effects import aggregate_effects, InterventionEffect
-        from datetime import datetime, timedelta
 
         runs = store.list_ux_intervention_runs(org_id=org_id, limit=10000)
-        cutoff = datetime.now() - timedelta(days=days)
-
-        # Filter by date and measurement status
-        recent_runs = []
-        for r in runs:
-            measured_at = r.get("measured_at")
-            if not measured_at:
-                continue
-            try:
-                ts = datetime.fromisoformat(measured_at.replace("Z", "+00:00"))
-                if ts >= cutoff:
-                    recent_runs.append(r)
-            except:
-                pass
-
         if intervention_key:
-            recent_runs = [r for r in recent_runs if r.get("intervention_key") == intervention_key]
+            runs = [r for r in runs if r.get("intervention_key") == intervention_key]
+        cols = _run_effect_columns(runs)
+
+        # Filter by date (unparseable measured_at drops the run) and require numeric deltas.
+        cutoff = time.time() - float(days) * 86400.0
+        recent = np.isfinite(cols["measured_at"]) & (np.nan_to_num(cols["measured_at"], nan=-np.inf) >= cutoff)
+        usable = np.isfinite(cols["delta"]) & recent[:, None]
+        effect, counts = _row_stats([cols["delta"]], usable, lambda d: d.mean(axis=-1))
+        valid = counts > 0
+        effect_cis = _bootstrap_group_means(effect[valid], [k for k, ok in zip(cols["keys"], valid) if ok])
 
-        # Build simplified effects
         effects = []
-        for run in recent_runs:
+        for i in np.flatnonzero(valid):
+            run = cols["runs"][i]
             delta = run.get("delta", {}).get("wellbeing_proxies", {})
-            if not delta:
-                continue
-
-            improvements = [v for v in delta.values() if isinstance(v, (int, float))]
-            if not improvements:
-                continue
-
-            effect_size = sum(improvements) / len(improvements)
-            significant = abs(effect_size) > 0.1
-
             effects.append(InterventionEffect(
-                run_id=str(run.get("run_id")),
-                intervention_key=str(run.get("intervention_key")),
+                run_id=cols["run_ids"][i],
+                intervention_key=cols["keys"][i],
                 pre_wellbeing={},
                 post_wellbeing={},
                 delta=delta,
-                effect_size=effect_size,
-                confidence_interval=(-1, 1),
-                p_value=0.05 if significant else 0.5,
-                significant=significant,
-                attributed_to=str(run.get("intervention_key")),
-                measurement_time=datetime.now(),
+                effect_size=float(effect[i]),
+                confidence_interval=(float(effect[i]), float(effect[i])),
+                p_value=1.0,
+                significant=False,
+                attributed_to=cols["keys"][i],
+                measurement_time=datetime.fromtimestamp(cols["measured_at"][i]),
                 observation_window_seconds=3600,
-                sample_size=len(improvements),
+                sample_size=int(counts[i]),
             ))
 
-        summary = aggregate_effects(effects)
+        summary = _with_group_significance(aggregate_effects(effects), effect_cis)
 
         return {
             "org_id": org_id,
             "intervention_key": intervention_key,
             "days": days,
             "summary": summary,
+            "effect_ci_by_intervention": effect_cis,
         }
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -5502,7 +10224,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "animal_scores": scores,
                 "certainty": 0.5 + random.random() * 0.5,
             }
-            store.upsert_event_classified(classified)
+            _record_classified_event(classified)
             created_events.append(event["event_id"])
 
         # Generate user profiles
@@ -5529,6 +10251,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
                 "event_count": random.randint(10, 100),
             }
             store.upsert_user_profile(profile)
+            profile_index.upsert(org_id, "user", user_id, profile)
 
         # Generate strategic directions
         directions = [
@@ -5537,7 +10260,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             {"id": "dir-3", "title": "Streamline decision process", "score": 0.68, "evidence_count": 6},
         ]
         for d in directions:
-            store.upsert_memcube({
+            _upsert_memcube({
                 "id": d["id"],
                 "org_id": org_id,
                 "context_type": "direction",
@@ -5551,7 +10274,7 @@ def create_app(*, store: Optional[Any] = None) -> Any:
             {"id": "card-3", "title": "Task completion", "summary": "85% completion rate on weekly tasks"},
         ]
         for c in cards:
-            store.upsert_memcube({
+            _upsert_memcube({
                 "id": c["id"],
                 "org_id": org_id,
                 "context_type": "knowledge_card",